@@ -0,0 +1,91 @@
+"""
+Verifica com tracemalloc que a atualização da nave não acumula memória a cada passo.
+
+Depois de alguns passos de aquecimento (que preenchem os buffers dos integradores),
+mede quanta memória continua alocada após muitos passos e o pico temporário por passo.
+A garantia verificada é: nada retido de um passo para o outro e alocações temporárias
+limitadas por passo (PEAK_BUDGETS), não zero alocações. Sem gravidade sobram só objetos
+pequenos do interpretador e do NumPy; com gravidade, a consulta espacial (Space.query_radius)
+cria arrays temporários proporcionais aos objetos próximos a cada avaliação.
+Sai com código 1 se algum cenário reter memória ou passar do orçamento de pico.
+
+    python -m benchmarks.bench_allocations --ticks 2000
+"""
+import argparse
+import sys
+import tracemalloc
+
+from benchmarks.cases import dense_space, ship_near_body
+from simulation.controls import keys_from_string
+from simulation.integrators import INTEGRATORS
+from simulation.spaceship import Spaceship
+
+# Pico de memória temporária (bytes) permitido por cenário, com folga sobre o medido
+# (1264 B sem gravidade e 5170 B ao lado de um corpo, com dense_space(20))
+PEAK_BUDGETS = {
+    'spaceship.update': 2048,
+    'spaceship.update_gravity': 8192,
+}
+
+
+def measure(update, ticks, warmup=200):
+    """
+    Executa update() em duas janelas de ticks seguidas e mede a memória retida e o pico temporário.
+    O aquecimento roda já com o tracemalloc ativo, para que alocações feitas uma única vez
+    (buffers dos integradores, caches internos) não sejam contadas. Objetos que apenas trocam
+    de lugar a cada passo (o último float guardado, por exemplo) retêm o mesmo total nas duas
+    janelas; só um vazamento faz a segunda janela reter mais que a primeira.
+    :return: (bytes retidos por tick no regime permanente, pico de bytes temporários)
+    """
+    tracemalloc.start()
+    try:
+        for _ in range(warmup):
+            update()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(ticks):
+            update()
+        middle, peak = tracemalloc.get_traced_memory()
+        for _ in range(ticks):
+            update()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ((current - middle) - (middle - baseline)) / ticks, peak - baseline
+
+
+def scenarios():
+    """Cenários do caminho de atualização da nave: sem gravidade e ao lado de um corpo massivo."""
+    keys = keys_from_string("wqa")
+    for name in INTEGRATORS:
+        spaceship = Spaceship(name="alocações", integrator=name)
+        yield f"spaceship.update[{name}]", lambda s=spaceship: s.update(1 / 60, keys)
+    space = dense_space(20)
+    for name in INTEGRATORS:
+        spaceship = Spaceship(name="alocações", integrator=name)
+        spaceship.position = ship_near_body(space).position
+        yield f"spaceship.update_gravity[{name}]", lambda s=spaceship: s.update(1 / 60, keys, space)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alocações de memória no regime permanente da nave.")
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'cenário':<45} {'retido/tick (B)':>16} {'pico (B)':>10} {'orçamento (B)':>14}")
+    for name, update in scenarios():
+        retained, peak = measure(update, args.ticks)
+        budget = PEAK_BUDGETS[name.split('[')[0]]
+        over = retained > 0 or peak > budget
+        failed |= over
+        print(f"{name:<45} {retained:>16.3f} {peak:>10} {budget:>14}{'  FALHOU' if over else ''}")
+    if failed:
+        print("FALHOU: memória retida entre passos ou pico temporário acima do orçamento")
+    else:
+        print("OK: nada retido entre passos; alocações temporárias dentro do orçamento por passo (não são zero)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
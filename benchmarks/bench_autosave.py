@@ -0,0 +1,67 @@
+"""
+Mede quanto tempo um salvamento trava a thread que o pede: salvamento síncrono
+(GameLogger.save_progress) contra o automático (AutoSaver), que só copia o estado.
+Aqui os dois rodam na thread principal; no jogo, o automático roda na thread da simulação.
+Os salvamentos seguidos usam block=True, como os pedidos pelo jogador: o pior caso do
+automático inclui a espera pela gravação anterior, também reportada à parte.
+
+    python -m benchmarks.bench_autosave --objects-per-sector 20 200 2000 --saves 20
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.cases import dense_space
+from simulation.spaceship import Spaceship
+from utils.autosave import AutoSaver
+from utils.logger import GameLogger
+
+
+def run(objects_per_sector, saves, directory):
+    results = []
+    for count in objects_per_sector:
+        space = dense_space(count)
+        spaceship = Spaceship(name="benchmark")
+        game_logger = GameLogger(save_file=Path(directory) / f"bench_{count}.ess")
+
+        worst_sync = 0.0
+        for _ in range(saves):
+            start = time.perf_counter()
+            game_logger.save_progress("benchmark", spaceship, 0.0, 0.0, space=space)
+            worst_sync = max(worst_sync, time.perf_counter() - start)
+
+        autosaver = AutoSaver(game_logger, interval=0.0)
+        for index in range(saves):
+            autosaver.save("benchmark", spaceship, 0.0, float(index), space, block=True)
+        autosaver.shutdown()
+        metrics = autosaver.metrics()
+        results.append({
+            "objects": sum(len(sector) for sector in space.sectors.values()),
+            "sync_worst_ms": worst_sync * 1e3,
+            "async_worst_stall_ms": metrics["worst_snapshot_stall_ms"],
+            "async_mean_stall_ms": metrics["mean_snapshot_stall_ms"],
+            "async_worst_wait_ms": metrics["worst_wait_ms"],
+            "async_worst_write_ms": metrics["worst_write_ms"],
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Travamento de quem pede o salvamento.")
+    parser.add_argument("--objects-per-sector", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="ess-autosave-") as directory:
+        results = run(args.objects_per_sector, args.saves, directory)
+    print(f"{'objetos':>8} {'síncrono pior (ms)':>19} {'automático pior (ms)':>21} "
+          f"{'automático médio (ms)':>22} {'espera pior (ms)':>17} {'escrita pior (ms)':>18}")
+    for r in results:
+        print(f"{r['objects']:>8} {r['sync_worst_ms']:>19.2f} {r['async_worst_stall_ms']:>21.2f} "
+              f"{r['async_mean_stall_ms']:>22.2f} {r['async_worst_wait_ms']:>17.2f} {r['async_worst_write_ms']:>18.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
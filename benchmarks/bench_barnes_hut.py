@@ -0,0 +1,85 @@
+"""
+Mede a escalabilidade do Barnes-Hut de centenas a dezenas de milhares de corpos.
+
+Para cada N o cálculo das acelerações é cronometrado e comparado com N log N; ao final
+é ajustado o expoente k de tempo ~ N^k (soma direta daria k ~ 2). Para N pequeno
+também é medido o erro relativo contra a soma direta.
+
+    python -m benchmarks.bench_barnes_hut --sizes 250 1000 4000 16000 32000 --theta 0.5
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from simulation.barnes_hut import BarnesHut
+
+
+def make_bodies(count, seed=0, extent=1e6):
+    """Gera corpos com posições e massas no mesmo intervalo usado pelo Space."""
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-extent, extent, (count, 3))
+    masses = rng.uniform(1e14, 1e19, count)
+    return positions, masses
+
+
+def time_accelerations(solver, positions, masses, repeats):
+    """Retorna o melhor tempo (em segundos) entre as repetições."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        solver.accelerations(positions, masses)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, theta=0.5, repeats=3, accuracy_limit=4000, seed=0):
+    """Executa o benchmark e retorna uma lista de resultados por N."""
+    # direct_threshold=0 força o uso da árvore mesmo para N pequeno
+    solver = BarnesHut(theta=theta, direct_threshold=0)
+    results = []
+    for count in sizes:
+        positions, masses = make_bodies(count, seed)
+        elapsed = time_accelerations(solver, positions, masses, repeats)
+        result = {
+            "bodies": count,
+            "seconds": elapsed,
+            "ns_per_n_log_n": elapsed * 1e9 / (count * math.log2(count)),
+        }
+        if count <= accuracy_limit:
+            approx = solver.accelerations(positions, masses)
+            exact = solver.direct_accelerations(positions, masses)
+            errors = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+            result["median_relative_error"] = float(np.median(errors))
+            result["max_relative_error"] = float(errors.max())
+        results.append(result)
+    return results
+
+
+def fitted_exponent(results):
+    """Ajusta por mínimos quadrados o expoente k em tempo ~ N^k."""
+    x = np.log([r["bodies"] for r in results])
+    y = np.log([r["seconds"] for r in results])
+    return float(np.polyfit(x, y, 1)[0]) if len(results) > 1 else float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de escalabilidade do Barnes-Hut.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 1000, 4000, 16000, 32000])
+    parser.add_argument("--theta", type=float, default=0.5, help="ângulo de abertura")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.theta, args.repeats)
+    print(f"{'corpos':>8} {'tempo (s)':>10} {'ns/(N log N)':>13} {'erro mediano':>13} {'erro máximo':>12}")
+    for r in results:
+        median = f"{r['median_relative_error']:.2e}" if "median_relative_error" in r else "-"
+        worst = f"{r['max_relative_error']:.2e}" if "max_relative_error" in r else "-"
+        print(f"{r['bodies']:>8} {r['seconds']:>10.4f} {r['ns_per_n_log_n']:>13.1f} {median:>13} {worst:>12}")
+    print(f"Expoente ajustado (tempo ~ N^k): k = {fitted_exponent(results):.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
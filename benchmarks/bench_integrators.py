@@ -0,0 +1,129 @@
+"""
+Compara a deriva de energia dos integradores numa órbita kepleriana excêntrica.
+
+Um corpo de teste orbita uma massa fixa por várias órbitas; para cada integrador e
+passo de tempo é medida a maior variação relativa da energia |E - E0| / |E0| e o número
+de avaliações de aceleração (o custo). Euler explícito, o método antigo da nave, entra como
+referência. Com --adaptive também é medido o efeito dos subpassos perto do pericentro.
+
+    python -m benchmarks.bench_integrators --orbits 10 --steps-per-orbit 50 100 400
+
+Na órbita padrão (excentricidade 0.5, passo fixo), o código de saída é 1 se a deriva máxima
+de algum integrador simplético passar do limite de DRIFT_LIMITS.
+"""
+import argparse
+import math
+import sys
+
+import numpy as np
+
+from simulation.integrators import INTEGRATORS, Integrator, adaptive_substeps, get_integrator
+
+# Deriva máxima permitida na órbita padrão: coeficiente / passos_por_órbita ** ordem do integrador.
+# Os coeficientes têm ~50% de folga sobre o medido (a deriva dos simpléticos é limitada e não
+# cresce com o número de órbitas, então o limite vale para qualquer --orbits).
+DEFAULT_ECCENTRICITY = 0.5
+DRIFT_LIMITS = {
+    'semi_implicit_euler': (15.0, 1),
+    'velocity_verlet': (160.0, 2),
+    'leapfrog': (42.0, 2),
+}
+
+
+def drift_limit(name, steps_per_orbit):
+    """Deriva máxima aceita para o integrador, ou None se ele não tem limite (Euler explícito)."""
+    if name not in DRIFT_LIMITS:
+        return None
+    coefficient, order = DRIFT_LIMITS[name]
+    return coefficient / steps_per_orbit ** order
+
+
+class ExplicitEuler(Integrator):
+    """Euler explícito (x += v·dt com a velocidade antiga), usado apenas como referência."""
+    name = 'explicit_euler'
+
+    def step(self, positions, velocities, acceleration, time_step):
+        accelerations = acceleration(positions, velocities, self.buffer('a', positions.shape)).copy()
+        positions += velocities * time_step
+        velocities += accelerations * time_step
+
+
+def kepler_orbit(eccentricity, gravitational_parameter=1.0, semi_major_axis=1.0):
+    """Estado inicial no apocentro de uma órbita com a excentricidade pedida, e o período."""
+    apocenter = semi_major_axis * (1 + eccentricity)
+    speed = math.sqrt(gravitational_parameter * (1 - eccentricity) / apocenter)
+    period = 2 * math.pi * math.sqrt(semi_major_axis ** 3 / gravitational_parameter)
+    return np.array([[apocenter, 0.0, 0.0]]), np.array([[0.0, speed, 0.0]]), period
+
+
+def energy(positions, velocities, gravitational_parameter=1.0):
+    return 0.5 * float(velocities[0] @ velocities[0]) - gravitational_parameter / float(np.linalg.norm(positions[0]))
+
+
+def run(integrator_names, steps_per_orbit, orbits=10, eccentricity=0.5, adaptive=False, gravitational_parameter=1.0):
+    """Integra a órbita com cada combinação e retorna uma lista de resultados."""
+    results = []
+    for name in integrator_names:
+        for per_orbit in steps_per_orbit:
+            integrator = ExplicitEuler() if name == ExplicitEuler.name else get_integrator(name)
+            positions, velocities, period = kepler_orbit(eccentricity, gravitational_parameter)
+            time_step = period / per_orbit
+            evaluations = 0
+
+            def acceleration(positions, velocities, out):
+                nonlocal evaluations
+                evaluations += 1
+                distance = np.linalg.norm(positions[0])
+                out[0] = -gravitational_parameter * positions[0] / distance ** 3
+                return out
+
+            initial = energy(positions, velocities, gravitational_parameter)
+            worst = 0.0
+            for _ in range(orbits * per_orbit):
+                substeps = 1
+                if adaptive:
+                    distance = float(np.linalg.norm(positions[0]))
+                    substeps = adaptive_substeps(time_step, math.sqrt(distance ** 3 / gravitational_parameter))
+                integrator.advance(positions, velocities, acceleration, time_step, substeps)
+                drift = abs(energy(positions, velocities, gravitational_parameter) - initial) / abs(initial)
+                worst = max(worst, drift)
+            results.append({
+                "integrator": name,
+                "steps_per_orbit": per_orbit,
+                "evaluations": evaluations,
+                "max_energy_drift": worst,
+                "final_energy_drift": drift,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deriva de energia dos integradores numa órbita kepleriana.")
+    parser.add_argument("--integrators", nargs="+", default=[ExplicitEuler.name, *INTEGRATORS],
+                        choices=[ExplicitEuler.name, *INTEGRATORS])
+    parser.add_argument("--steps-per-orbit", type=int, nargs="+", default=[50, 100, 400])
+    parser.add_argument("--orbits", type=int, default=10)
+    parser.add_argument("--eccentricity", type=float, default=DEFAULT_ECCENTRICITY)
+    parser.add_argument("--adaptive", action="store_true", help="usa subpassos adaptativos perto do pericentro")
+    args = parser.parse_args(argv)
+
+    results = run(args.integrators, args.steps_per_orbit, args.orbits, args.eccentricity, args.adaptive)
+    print(f"{'integrador':<20} {'passos/órbita':>13} {'avaliações':>11} {'deriva máx.':>12} {'deriva final':>13}")
+    for r in results:
+        print(f"{r['integrator']:<20} {r['steps_per_orbit']:>13} {r['evaluations']:>11} "
+              f"{r['max_energy_drift']:>12.2e} {r['final_energy_drift']:>13.2e}")
+
+    # Os limites só valem para a órbita em que foram calibrados
+    if args.eccentricity == DEFAULT_ECCENTRICITY and not args.adaptive:
+        over = [r for r in results if (limit := drift_limit(r["integrator"], r["steps_per_orbit"])) is not None
+                and r["max_energy_drift"] > limit]
+        for r in over:
+            print(f"REGRESSÃO: {r['integrator']} com {r['steps_per_orbit']} passos/órbita, deriva máxima "
+                  f"{r['max_energy_drift']:.2e} (limite: {drift_limit(r['integrator'], r['steps_per_orbit']):.2e})")
+        if over:
+            sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
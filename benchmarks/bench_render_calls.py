@@ -0,0 +1,92 @@
+"""
+Conta as chamadas OpenGL feitas pelo Python em cada quadro do Renderer.
+
+O Renderer desenha com o RecordingBackend, que só registra as chamadas gl*/glu*, então o
+benchmark roda sem janela nem contexto OpenGL. O que ele mede é o custo do lado do Python
+(quantas chamadas atravessam o backend, quantas desenham, mudam estado ou enviam dados),
+não o da GPU.
+
+    python -m benchmarks.bench_render_calls --objects-per-sector 20 200 --frames 10
+    python -m benchmarks.bench_render_calls --max-draw-calls 20
+
+Cada cenário é medido nos dois caminhos do Renderer: objeto a objeto e instanciado. Com
+--max-draw-calls, o código de saída é 1 se o caminho instanciado passar do limite de chamadas
+de desenho por quadro.
+"""
+import argparse
+import sys
+import time
+
+import pygame
+
+from benchmarks.cases import dense_space, ship_near_body
+from visualization.backend import RecordingBackend
+from visualization.camera import Camera
+from visualization.render_3d import Renderer
+
+
+def run(objects_per_sector, frames, display=(1280, 720), paths=(False, True), star_count=5000):
+    pygame.font.init()
+    results = []
+    for count in objects_per_sector:
+        space = dense_space(count)
+        spaceship = ship_near_body(space)
+        camera = Camera()
+        camera.follow_target(spaceship.position.tolist(), spaceship.direction)
+        for instanced in paths:
+            backend = RecordingBackend()
+            renderer = Renderer(display, instanced=instanced, star_count=star_count, backend=backend)
+            # O primeiro quadro envia os dados das instâncias; entra na conta da inicialização
+            renderer.render(space, spaceship, camera, 12.0, 3456.0)
+            setup = backend.outside['calls'] + backend.last_frame['calls']
+            backend.reset_frames()
+            start = time.perf_counter()
+            for _ in range(frames):
+                camera.position[0] += 1.0  # Câmera em movimento, como no jogo: a seleção é refeita
+                renderer.render(space, spaceship, camera, 12.0, 3456.0)
+            elapsed = time.perf_counter() - start
+            totals = backend.frame_totals
+            result = {
+                "objects": sum(len(sector) for sector in space.sectors.values()),
+                "path": "instanciado" if renderer.instancing is not None else "por objeto",
+                "setup_calls": setup,
+                "python_ms_per_frame": elapsed / backend.frames * 1e3,  # Só o lado do Python: o backend não desenha
+                "top": [(name, n / backend.frames) for name, n in totals['by_name'].most_common(6)],
+                "stats": renderer.stats_line(),
+            }
+            result.update({f"{key}_per_frame": totals[key] / backend.frames for key in RecordingBackend.COUNTERS})
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chamadas OpenGL por quadro do Renderer.")
+    parser.add_argument("--objects-per-sector", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--stars", type=int, default=5000, help="Quantidade de estrelas de fundo")
+    parser.add_argument("--max-draw-calls", type=float,
+                        help="falha (código 1) se o caminho instanciado passar deste número de desenhos por quadro")
+    args = parser.parse_args(argv)
+
+    results = run(args.objects_per_sector, args.frames, star_count=args.stars)
+    for r in results:
+        print(f"{r['objects']} objetos, {r['path']}: {r['calls_per_frame']:.0f} chamadas GL/quadro, "
+              f"{r['draw_calls_per_frame']:.0f} de desenho, {r['state_changes_per_frame']:.0f} de estado, "
+              f"{r['python_ms_per_frame']:.2f} ms de Python (inicialização: {r['setup_calls']})")
+        print(f"    {r['vertices_per_frame']:.0f} vértices, {r['texture_uploads_per_frame']:.0f} texturas e "
+              f"{r['buffer_uploads_per_frame']:.0f} buffers enviados ({r['upload_bytes_per_frame'] / 1024:.1f} KiB)")
+        print("    " + r["stats"])
+        print("    " + ", ".join(f"{name}={n:.0f}" for name, n in r["top"]))
+
+    if args.max_draw_calls is not None:
+        over = [r for r in results if r["path"] == "instanciado" and r["draw_calls_per_frame"] > args.max_draw_calls]
+        for r in over:
+            print(f"REGRESSÃO: {r['objects']} objetos, {r['draw_calls_per_frame']:.0f} chamadas de desenho por quadro "
+                  f"(limite: {args.max_draw_calls:.0f})")
+        if over:
+            sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compara o salvamento binário (.ess) com o JSON para universos com milhares de setores.
+
+O JSON usa o formato antigo que guardava todos os objetos de cada setor (o único em JSON
+capaz de representar o universo inteiro). São medidos o tempo de salvar, o tempo de carregar,
+o tamanho do arquivo e o tempo para ler um único setor do arquivo binário via mmap.
+
+    python -m benchmarks.bench_save_format --sectors 1000 4000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from simulation.space import Space
+from utils import save_format
+
+
+def make_world(sector_count, seed=0):
+    """Universo com sector_count setores gerados em linha e um objeto nomeado a cada dez setores."""
+    space = Space(seed=seed)
+    side = int(np.ceil(sector_count ** (1 / 3)))
+    for index in range(sector_count):
+        x, y, z = index % side, index // side % side, index // (side * side)
+        space.generate_sector(x, y, z)
+        if index % 10 == 0:
+            space.sectors[(x, y, z)][0].name = f"Corpo {index}"
+    return space
+
+
+def json_state(space):
+    """Estado no formato JSON antigo, com todos os objetos de cada setor."""
+    return {
+        "seed": space.seed,
+        "sectors": {str(coords): [obj.to_dict() for obj in sector] for coords, sector in space.sectors.items()},
+    }
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run(sector_counts, directory):
+    results = []
+    progress = {"player_name": "benchmark", "spaceship": {}, "distance_traveled": 0.0, "play_time": 0.0}
+    for count in sector_counts:
+        space = make_world(count)
+        binary_path = Path(directory) / f"world_{count}.ess"
+        json_path = Path(directory) / f"world_{count}.json"
+
+        def save_json():
+            with json_path.open("w") as f:
+                json.dump(json_state(space), f, indent=4)
+
+        def load_json():
+            with json_path.open() as f:
+                Space(seed=0).load_game_state(json.load(f))
+
+        def load_binary():
+            with save_format.SaveReader(binary_path) as reader:
+                Space(seed=0).load_game_state(reader.read_world())
+
+        def read_one_sector():
+            with save_format.SaveReader(binary_path) as reader:
+                return reader.read_sector(reader.sector_coords()[len(reader) // 2])
+
+        json_save, _ = timed(save_json)
+        json_load, _ = timed(load_json)
+        binary_save, _ = timed(lambda: save_format.write_save(binary_path, progress, space.save_world_state()))
+        binary_load, _ = timed(load_binary)
+        single_sector, _ = timed(read_one_sector)
+        results.append({
+            "sectors": count,
+            "objects": sum(len(sector) for sector in space.sectors.values()),
+            "json_save": json_save,
+            "json_load": json_load,
+            "json_bytes": os.path.getsize(json_path),
+            "binary_save": binary_save,
+            "binary_load": binary_load,
+            "binary_bytes": os.path.getsize(binary_path),
+            "binary_single_sector": single_sector,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Salvamento binário x JSON.")
+    parser.add_argument("--sectors", type=int, nargs="+", default=[1000, 4000])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="ess-save-") as directory:
+        results = run(args.sectors, directory)
+    print(f"{'setores':>8} {'objetos':>8} {'formato':>8} {'salvar (s)':>11} {'carregar (s)':>13} {'tamanho (KiB)':>14}")
+    for r in results:
+        print(f"{r['sectors']:>8} {r['objects']:>8} {'json':>8} {r['json_save']:>11.3f} "
+              f"{r['json_load']:>13.3f} {r['json_bytes'] / 1024:>14.0f}")
+        print(f"{'':>8} {'':>8} {'binário':>8} {r['binary_save']:>11.3f} "
+              f"{r['binary_load']:>13.3f} {r['binary_bytes'] / 1024:>14.0f}")
+        print(f"{'':>8} {'':>8} um setor do binário via mmap: {r['binary_single_sector'] * 1e3:.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Tempo de quadro com a simulação no loop de quadros (serial) e numa thread própria.
+
+A nave voa em linha reta, em alta velocidade, por um universo com corpos em movimento
+(Barnes-Hut) e setores gerados na hora, o que produz passos de física lentos de tempos em
+tempos. O Renderer desenha com o RecordingBackend (sem janela), a ~60 quadros por segundo,
+e os tempos de passo (tick) e de quadro são reportados separadamente.
+
+    python -m benchmarks.bench_sim_thread --seconds 5
+"""
+import argparse
+import time
+
+import pygame
+
+from simulation.controls import keys_from_string
+from simulation.sim_thread import SimulationThread
+from simulation.space import Space
+from simulation.spaceship import Spaceship
+from utils.profiler import FrameProfiler
+from visualization.backend import RecordingBackend
+from visualization.camera import Camera
+from visualization.render_3d import Renderer
+
+
+def run(threaded, seconds, frame_interval=0.016, display=(1280, 720), seed=7):
+    pygame.font.init()
+    space = Space(seed=seed, nbody=True)
+    spaceship = Spaceship(name="benchmark", max_speed=400000)
+    simulation = SimulationThread(space, spaceship, profile=True)
+    simulation.set_keys(keys_from_string("w"))
+    renderer = Renderer(display, star_count=500, backend=RecordingBackend())
+    camera = Camera()
+    profiler = FrameProfiler(phases=('simulation', 'render'), capacity=int(seconds / frame_interval) + 60,
+                             enabled=True)
+
+    if threaded:
+        simulation.start()
+    start = last_time = time.perf_counter()
+    frames = 0
+    while time.perf_counter() - start < seconds:
+        profiler.begin_frame()
+        current_time = time.perf_counter()
+        frame_time, last_time = current_time - last_time, current_time
+        if not threaded:
+            simulation.advance(frame_time)
+        snapshot = simulation.latest
+        profiler.mark('simulation')
+        render_position = snapshot.render_position(current_time)
+        camera.follow_target(render_position, snapshot.spaceship.direction)
+        renderer.render(snapshot.space, snapshot.spaceship, camera, snapshot.play_time, snapshot.distance_traveled,
+                        spaceship_position=render_position)
+        profiler.mark('render')
+        profiler.end_frame()
+        frames += 1
+        time.sleep(max(0, frame_interval - (time.perf_counter() - current_time)))
+    simulation.stop()
+    space.close()
+
+    frame_times = sorted(profiler.recorded(profiler.frame_totals))
+    return {
+        "mode": "thread" if threaded else "serial",
+        "frames": frames,
+        "ticks": simulation.ticks,
+        "frame": profiler.stats()['frame'],
+        "frame_max": frame_times[-1] / 1e6 if frame_times else 0.0,
+        "tick": simulation.profiler.stats()['tick'],
+        "tick_max": max(simulation.profiler.recorded(simulation.profiler.frame_totals), default=0) / 1e6,
+        "slow_frames": sum(t > 2 * frame_interval * 1e9 for t in frame_times),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de quadro com a simulação serial e numa thread própria.")
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="duração de cada modo (os passos guardados são os 600 últimos)")
+    args = parser.parse_args(argv)
+
+    results = [run(threaded, args.seconds) for threaded in (False, True)]
+    for r in results:
+        print(f"{r['mode']}: {r['frames']} quadros, {r['ticks']} passos")
+        print("    quadro p50/p95/p99: {:.2f} / {:.2f} / {:.2f} ms".format(*r["frame"]) +
+              f", máximo {r['frame_max']:.2f} ms, {r['slow_frames']} quadros acima de 32 ms")
+        print("    passo  p50/p95/p99: {:.2f} / {:.2f} / {:.2f} ms".format(*r["tick"]) +
+              f", máximo {r['tick_max']:.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
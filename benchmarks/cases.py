@@ -0,0 +1,242 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_barnes_hut import make_bodies
+from simulation.barnes_hut import BarnesHut
+from simulation.controls import keys_from_string
+from simulation.integrators import INTEGRATORS, get_integrator
+from simulation.physics import Physics
+from simulation.replay import replay
+from simulation.run import RandomInput, run_headless
+from simulation.sector import Sector
+from simulation.sector_store import SectorStore
+from simulation.space import Space
+from simulation.spaceship import Spaceship
+from utils.logger import GameLogger
+
+# Cada caso é uma função que prepara o cenário e devolve a função a ser cronometrada.
+# "micro" mede uma operação isolada; "macro" mede um fluxo completo.
+CASES = []
+
+
+def case(name, kind="micro"):
+    """Registra um caso de benchmark com o nome usado nos resultados e nas comparações."""
+    def register(setup):
+        CASES.append((name, kind, setup))
+        return setup
+    return register
+
+
+def dense_space(objects_per_sector, seed=0):
+    """Cria um universo com os 27 setores em volta da origem, cada um com a quantidade pedida de objetos."""
+    space = Space(seed=seed)
+    rng = np.random.default_rng(seed)
+    space.sectors = {}
+    for x in (-1, 0, 1):
+        for y in (-1, 0, 1):
+            for z in (-1, 0, 1):
+                coords = (x, y, z)
+                center = np.array(coords, dtype=np.float64) * Space.SECTOR_SIZE
+                space.sectors[coords] = Sector(
+                    coords,
+                    positions=center + rng.uniform(-Space.SECTOR_SIZE / 4, Space.SECTOR_SIZE / 4,
+                                                   (objects_per_sector, 3)),
+                    masses=rng.uniform(1e14, 1e19, objects_per_sector),
+                    sizes=rng.uniform(4000, 120000, objects_per_sector),
+                    type_codes=rng.integers(0, len(Sector.OBJECT_TYPES), objects_per_sector),
+                    has_water=rng.random(objects_per_sector) < 0.25
+                )
+    space.max_active_sectors = len(space.sectors)  # Evita que o benchmark remova os setores
+    return space
+
+
+@case("physics.calculate_distance")
+def physics_calculate_distance():
+    a, b = [1.0, 2.0, 3.0], [4.0, -5.0, 6.0]
+    return lambda: Physics.calculate_distance(a, b)
+
+
+@case("physics.normalize_vector")
+def physics_normalize_vector():
+    vector = [3.0, -4.0, 12.0]
+    return lambda: Physics.normalize_vector(vector)
+
+
+@case("physics.limit_vector")
+def physics_limit_vector():
+    vector = [30000.0, -40000.0, 120000.0]
+    return lambda: Physics.limit_vector(vector, 120000)
+
+
+@case("space.generate_objects_in_sector")
+def space_generate_objects_in_sector():
+    space = Space(seed=1)
+    coords = iter(range(10 ** 9))
+    return lambda: space.generate_objects_in_sector((next(coords), 0, 0))
+
+
+def ship_near_body(space):
+    """Nave ao lado de um objeto, para que a gravidade seja de fato aplicada."""
+    spaceship = Spaceship(name="benchmark")
+    spaceship.position = (space.sectors[(0, 0, 0)].positions[0] + 1000.0).tolist()
+    return spaceship
+
+
+def space_update(objects_per_sector):
+    def setup():
+        space = dense_space(objects_per_sector)
+        spaceship = ship_near_body(space)
+        return lambda: space.update(spaceship)
+    return setup
+
+
+def space_gravity_acceleration(objects_per_sector):
+    def setup():
+        space = dense_space(objects_per_sector)
+        spaceship = ship_near_body(space)
+        return lambda: space.gravity_acceleration(spaceship.position, spaceship.mass)
+    return setup
+
+
+for _count in (20, 200, 2000):
+    case(f"space.update[{_count}_per_sector]")(space_update(_count))
+    case(f"space.gravity_acceleration[{_count}_per_sector]")(space_gravity_acceleration(_count))
+
+
+@case("spaceship.update")
+def spaceship_update():
+    spaceship = Spaceship(name="benchmark", max_speed=120000)
+    keys = keys_from_string("wq")
+    return lambda: spaceship.update(1 / 60, keys)
+
+
+def spaceship_update_with_gravity(integrator):
+    def setup():
+        space = dense_space(200)
+        spaceship = ship_near_body(space)
+        spaceship.integrator = get_integrator(integrator)
+        keys = keys_from_string("wq")
+        return lambda: spaceship.update(1 / 60, keys, space)
+    return setup
+
+
+for _name in INTEGRATORS:
+    case(f"spaceship.update_gravity[{_name}]")(spaceship_update_with_gravity(_name))
+
+
+@case("sector_store.spill_reload")
+def sector_store_spill_reload():
+    # Memória para um único setor: cada put grava o anterior no SQLite e cada take o recarrega
+    store = SectorStore(max_memory_objects=1)
+    sectors = [Space(seed=0).generate_objects_in_sector((x, 0, 0)) for x in range(2)]
+    store.put((0, 0, 0), sectors[0])
+
+    def spill_reload():
+        store.put((1, 0, 0), store.take((1, 0, 0)) or sectors[1])
+        store.put((0, 0, 0), store.take((0, 0, 0)))
+    return spill_reload
+
+
+def named_space(seed=0):
+    """Universo com alguns setores gerados e objetos nomeados pelo jogador."""
+    space = Space(seed=seed)
+    for x in range(-1, 2):
+        for z in range(-1, 2):
+            space.generate_sector(x, 0, z)
+    for index, sector in enumerate(space.sectors.values()):
+        sector[0].name = f"Corpo {index}"
+    return space
+
+
+@case("space.save_game_state")
+def space_save_game_state():
+    space = named_space()
+    return space.save_game_state
+
+
+@case("space.load_game_state")
+def space_load_game_state():
+    space = named_space()
+    state = space.save_game_state()
+    return lambda: space.load_game_state(state)
+
+
+def game_logger_with_progress():
+    directory = tempfile.mkdtemp(prefix="ess-bench-")
+    game_logger = GameLogger(save_file=str(Path(directory) / "progress.ess"))
+    spaceship = Spaceship(name="benchmark")
+    space = named_space()
+    return game_logger, spaceship, space
+
+
+@case("game_logger.save_progress")
+def game_logger_save_progress():
+    game_logger, spaceship, space = game_logger_with_progress()
+    return lambda: game_logger.save_progress("benchmark", spaceship, 1234.5, 67.8, space=space)
+
+
+@case("game_logger.load_progress")
+def game_logger_load_progress():
+    game_logger, spaceship, space = game_logger_with_progress()
+    game_logger.save_progress("benchmark", spaceship, 1234.5, 67.8, space=space)
+    return game_logger.load_progress
+
+
+@case("headless.run[600_steps]", kind="macro")
+def headless_run():
+    return lambda: run_headless(600, seed=3, input_source=RandomInput(seed=3))
+
+
+@case("headless.run_nbody[600_steps]", kind="macro")
+def headless_run_nbody():
+    return lambda: run_headless(600, seed=3, input_source=RandomInput(seed=3), nbody=True)
+
+
+@case("replay.run[600_steps]", kind="macro")
+def replay_run():
+    # O mesmo voo do headless.run, gravado uma vez e refeito a partir do arquivo
+    path = Path(tempfile.mkdtemp(prefix="ess-bench-")) / "voo.essr"
+    run_headless(600, seed=3, input_source=RandomInput(seed=3), record=str(path))
+    return lambda: replay(path)
+
+
+def barnes_hut(count):
+    def setup():
+        solver = BarnesHut(direct_threshold=0)
+        positions, masses = make_bodies(count)
+        return lambda: solver.accelerations(positions, masses)
+    return setup
+
+
+for _count in (1000, 4000):
+    case(f"barnes_hut.accelerations[{_count}]", kind="macro")(barnes_hut(_count))
+
+
+def renderer_render(objects_per_sector, instanced):
+    def setup():
+        # Importados aqui: só estes casos dependem de pygame (fontes) e do PyOpenGL
+        import pygame
+        from visualization.backend import RecordingBackend
+        from visualization.camera import Camera
+        from visualization.render_3d import Renderer
+
+        pygame.font.init()
+        space = dense_space(objects_per_sector)
+        spaceship = ship_near_body(space)
+        camera = Camera()
+        camera.follow_target(spaceship.position.tolist(), spaceship.direction)
+        # Sem janela: o RecordingBackend só registra as chamadas, então mede o lado do Python
+        renderer = Renderer((1280, 720), instanced=instanced, backend=RecordingBackend())
+
+        def render():
+            camera.position[0] += 1.0  # Câmera em movimento: descarte e LOD são refeitos a cada quadro
+            renderer.render(space, spaceship, camera, 12.0, 3456.0)
+        return render
+    return setup
+
+
+for _count in (20, 200):
+    case(f"renderer.render[{_count}_per_sector]", kind="macro")(renderer_render(_count, instanced=True))
+    case(f"renderer.render_fallback[{_count}_per_sector]", kind="macro")(renderer_render(_count, instanced=False))
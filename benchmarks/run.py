@@ -0,0 +1,135 @@
+"""
+Executa a suíte de benchmarks e grava os resultados em JSON.
+
+    python -m benchmarks.run --output resultados.json
+    python -m benchmarks.run --compare baseline.json --threshold 0.15
+    python -m benchmarks.run --filter space.update --quick
+
+Com --compare, cada caso é comparado com a mediana gravada no baseline; casos que
+ficaram mais lentos que o limite são marcados como regressão e o código de saída é 1.
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.cases import CASES
+
+
+def calibrate(function, min_time):
+    """Descobre quantas chamadas são necessárias para uma amostra durar pelo menos min_time."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10 ** 6:
+            return number
+        number *= 10 if elapsed < min_time / 10 else 2
+
+
+def measure(function, repeats, min_time):
+    """Mede o tempo por chamada em várias amostras e retorna as estatísticas em segundos."""
+    number = calibrate(function, min_time)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "number": number,
+        "repeats": repeats,
+    }
+
+
+def run_suite(name_filter=None, repeats=7, min_time=0.05):
+    """Executa os casos selecionados e retorna o documento de resultados."""
+    results = {}
+    for name, kind, setup in CASES:
+        if name_filter and name_filter not in name:
+            continue
+        function = setup()
+        stats = measure(function, repeats, min_time)
+        stats["kind"] = kind
+        results[name] = stats
+        print(f"{name:<45} {format_seconds(stats['median']):>12}  (±{format_seconds(stats['stdev'])})")
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Compara as medianas com o baseline.
+    :return: Lista de (nome, razão atual/baseline, é_regressão)
+    """
+    rows = []
+    for name, stats in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        ratio = stats["median"] / reference["median"] if reference["median"] > 0 else float("inf")
+        rows.append((name, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_seconds(seconds):
+    """Formata um tempo com a unidade mais legível."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do ESS.")
+    parser.add_argument("--output", help="arquivo JSON onde gravar os resultados")
+    parser.add_argument("--compare", help="arquivo JSON de baseline para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="aumento relativo da mediana considerado regressão (padrão: 0.10 = 10%%)")
+    parser.add_argument("--filter", help="executa apenas os casos cujo nome contém este texto")
+    parser.add_argument("--repeats", type=int, default=7, help="amostras por caso")
+    parser.add_argument("--quick", action="store_true", help="menos amostras e amostras mais curtas")
+    args = parser.parse_args(argv)
+
+    repeats, min_time = (3, 0.02) if args.quick else (args.repeats, 0.05)
+    current = run_suite(args.filter, repeats, min_time)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=4)
+        print(f"Resultados gravados em {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold)
+        print(f"\nComparação com {args.compare} (limite: +{args.threshold:.0%})")
+        for name, ratio, regressed in rows:
+            status = "REGRESSÃO" if regressed else "ok"
+            print(f"{name:<45} {ratio:>7.2f}x  {status}")
+        if any(regressed for _, _, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,23 @@
 import sys
 import os
-import logging
 import time
 import pygame
-import json
-import math
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
-from utils.logger import GameLogger
+from utils.autosave import AutoSaver
+from utils.logger import GameLogger, get_logger, setup_logging
+from utils.profiler import FrameProfiler
 
-# Configura o logging para registrar erros no arquivo errorlog.txt
-logging.basicConfig(filename='errorlog.txt', level=logging.ERROR,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# Configura o logging uma única vez: erros vão para errorlog.txt e o restante para
+# game_logger.log, escritos por uma thread própria. ESS_LOG_LEVEL=DEBUG ativa as
+# mensagens de depuração (limitadas a uma por segundo nos trechos executados a cada quadro).
+setup_logging(level=os.environ.get('ESS_LOG_LEVEL', 'INFO').upper())
+logger = get_logger(__name__)
 
 def log_exception(exc_type, exc_value, exc_traceback):
     """Função para capturar exceções não tratadas e registrar no log."""
-    logging.error("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
+    logger.error("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
 
 # Captura exceções não tratadas no programa
 sys.excepthook = log_exception
@@ -27,6 +28,8 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 # Importações dos módulos
+from simulation.replay import ReplayRecorder
+from simulation.sim_thread import SimulationThread
 from simulation.space import Space
 from simulation.spaceship import Spaceship
 from visualization.render_3d import Renderer
@@ -143,6 +146,12 @@ def display_confirm_exit(screen, font):
                     return False  # Jogador cancelou
     return False  # Caso padrão
 
+def save_profile(profiler, path='frame_profile.csv'):
+    """Grava em CSV as durações por fase dos quadros registrados pelo profiler, se houver."""
+    if profiler.frames:
+        profiler.dump_csv(path)
+        logger.info("Perfil de quadros gravado em %s", path)
+
 def start_simulation():
     try:
         # Inicializa o pygame
@@ -183,7 +192,7 @@ def start_simulation():
                         in_instructions = False
                     elif event.key == pygame.K_n:  # Pressiona N para resetar o progresso
                         game_logger.reset_progress()
-                        print("Progresso resetado. Iniciando um novo jogo.")
+                        logger.info("Progresso resetado. Iniciando um novo jogo.")
                         # Reinicia o jogo após resetar
                         in_menu = False
                     elif event.key == pygame.K_k:  # Pressiona K para ver as instruções
@@ -204,7 +213,7 @@ def start_simulation():
         glViewport(0, 0, display[0], display[1])
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
-        gluPerspective(75, (display[0] / display[1]), 0.1, 600000.0)  # Campo de visão ajustado para 75
+        gluPerspective(Camera.FOV, (display[0] / display[1]), Camera.NEAR, Camera.FAR)  # Mesmo frustum usado no descarte
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
         glClearColor(0.1, 0.1, 0.1, 1.0)
@@ -220,7 +229,8 @@ def start_simulation():
         spaceship = Spaceship(name=player_name, max_speed=120000)
 
         # Inicializa o universo e variáveis de progresso
-        space = Space()
+        # Setores novos são gerados fora do loop de quadros e os corpos se atraem mutuamente
+        space = Space(background_generation=True, nbody=True)
         distance_traveled = 0.0
         play_time = 0.0
 
@@ -230,39 +240,100 @@ def start_simulation():
             player_name = progress.get('player_name', "Player1")
             spaceship.position = progress.get('spaceship', {}).get('position', [0.0, 0.0, 0.0])
             spaceship.velocity = progress.get('spaceship', {}).get('velocity', [0.0, 0.0, 0.0])
+            spaceship.rotation_angle = progress.get('spaceship', {}).get('rotation_angle', 0.0)
             distance_traveled = progress.get('distance_traveled', 0.0)
             play_time = progress.get('play_time', 0.0)
+            if 'world' in progress:
+                space.load_game_state(progress['world'], spaceship.position)  # Mesma semente, mesmo universo
+
+        # ESS_RECORD=<arquivo> grava o voo (teclas e setores instalados a cada passo) para ser refeito
+        # com python -m simulation.replay; um progresso carregado vai junto, já que não sai só da semente
+        record_path = os.environ.get('ESS_RECORD')
+        recorder = ReplayRecorder(record_path, space, spaceship, include_world=progress is not None) if record_path else None
+
+        # Salvamento automático em segundo plano; ESS_AUTOSAVE_INTERVAL define o intervalo em segundos de jogo
+        autosaver = AutoSaver(game_logger, interval=float(os.environ.get('ESS_AUTOSAVE_INTERVAL', 60)))
+        autosaver.last_save_time = play_time
 
         # Inicializa o motor de renderização e a câmera
-        renderer = Renderer(display)  # Passa 'display' para o Renderer
+        # ESS_INSTANCED=0 desenha objeto a objeto (para drivers sem shaders/instâncias funcionando)
+        # ESS_STAR_COUNT define a quantidade de estrelas de fundo
+        renderer = Renderer(display, instanced=os.environ.get('ESS_INSTANCED', '1') != '0',
+                            star_count=int(os.environ.get('ESS_STAR_COUNT', 5000)))
         camera = Camera()
 
-        # Definir o tempo entre atualizações (time_step) para física e renderização
-        time_step = 0.016  # Aproximadamente 60 FPS (1/60)
-        last_time = time.time()
+        # A física avança em passos fixos, independentes da taxa de quadros, numa thread própria
+        # (ESS_SIM_THREAD=0 volta a executá-la no loop de quadros); o renderizador desenha a última
+        # fotografia publicada, então um passo lento não atrasa o quadro
+        def after_step(simulation, keys):
+            if recorder is not None:
+                recorder.step(keys, simulation.step)
+            # Salva periodicamente; aqui, entre dois passos, só o estado é copiado e a gravação acontece em outra thread
+            autosaver.update(simulation.play_time, player_name, spaceship, simulation.distance_traveled, space)
+
+        # Profilers do quadro (thread principal) e dos passos de física, com tempos reportados separadamente:
+        # ESS_PROFILE=1 ativa desde o início, F3 liga/desliga com o overlay
+        profiling = os.environ.get('ESS_PROFILE') == '1'
+        profiler = FrameProfiler(phases=('events', 'simulation', 'render', 'flip'), enabled=profiling)
+        simulation = SimulationThread(space, spaceship, step=1 / 60, max_steps_per_tick=5, play_time=play_time,
+                                      distance_traveled=distance_traveled, on_step=after_step, profile=profiling)
+        threaded = os.environ.get('ESS_SIM_THREAD', '1') != '0'
+        if threaded:
+            simulation.start()
+        frame_interval = 0.016  # Intervalo mínimo entre quadros renderizados (~60 FPS)
+        last_time = time.perf_counter()
+        overlay_lines = None
+        frame_count = 0
+
+        def finish():
+            """Para a simulação e libera gravação, universo e salvamento (a nave e o universo voltam para esta thread)."""
+            simulation.stop()
+            if recorder is not None:
+                recorder.close(spaceship)
+            autosaver.shutdown()  # Antes do space.close: o último salvamento pode estar lendo o armazenamento
+            space.close()
+            save_profile(profiler)
+            save_profile(simulation.profiler, 'tick_profile.csv')
 
         # Loop principal da simulação
         running = True
         while running:
+            profiler.begin_frame()
+            simulation.check()
+
             # Processa os eventos do Pygame
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    game_logger.save_progress(player_name, spaceship, distance_traveled, play_time)
+                    stall_start = time.perf_counter()
+                    with simulation.paused():
+                        autosaver.save(player_name, spaceship, simulation.distance_traveled, simulation.play_time,
+                                       space, block=True)
+                        autosaver.record_main_stall(time.perf_counter() - stall_start)
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        game_logger.save_progress(player_name, spaceship, distance_traveled, play_time)
-                        confirm_exit = display_confirm_exit(screen, font)
+                        # A simulação fica parada enquanto o jogo salva e espera a confirmação
+                        stall_start = time.perf_counter()
+                        with simulation.paused():
+                            autosaver.save(player_name, spaceship, simulation.distance_traveled, simulation.play_time,
+                                           space, block=True)
+                            # Só o salvamento conta como travamento; o diálogo espera o jogador
+                            autosaver.record_main_stall(time.perf_counter() - stall_start)
+                            confirm_exit = display_confirm_exit(screen, font)
                         if confirm_exit:
                             running = False
+                            finish()
                             start_simulation()
                             return  # Encerra o loop atual
+                    elif event.key == pygame.K_F3:
+                        profiler.enabled = simulation.profiler.enabled = not profiler.enabled
+                        overlay_lines = None
 
             # Captura os inputs do teclado
             keys = pygame.key.get_pressed()
 
             # Filtra apenas as teclas relevantes para movimentação e rotação
-            relevant_keys = {
+            simulation.set_keys({
                 pygame.K_w: keys[pygame.K_w],
                 pygame.K_a: keys[pygame.K_a],
                 pygame.K_s: keys[pygame.K_s],
@@ -271,40 +342,50 @@ def start_simulation():
                 pygame.K_e: keys[pygame.K_e],
                 pygame.K_r: keys[pygame.K_r],  # Movimentação para cima
                 pygame.K_f: keys[pygame.K_f],  # Movimentação para baixo
-            }
+            })
+            profiler.mark('events')
 
-            # Calcula o tempo decorrido
-            current_time = time.time()
-            delta_time = current_time - last_time
+            # Calcula o tempo decorrido desde o último quadro
+            current_time = time.perf_counter()
+            frame_time = current_time - last_time
             last_time = current_time
 
-            # Atualiza o tempo de jogo
-            play_time += delta_time
-
-            # Atualiza a física do universo e a posição da nave
-            space.update(spaceship)
-            spaceship.update(delta_time, relevant_keys)  # Passa delta_time e apenas as teclas relevantes
+            # Sem a thread, executa aqui quantos passos fixos de física couberem no tempo acumulado
+            if not threaded:
+                simulation.advance(frame_time)
+            snapshot = simulation.latest  # Fotografia imutável: lida sem trava
+            profiler.mark('simulation')
 
-            # Calcula a distância percorrida
-            velocity_magnitude = math.sqrt(sum([v ** 2 for v in spaceship.velocity]))
-            distance_traveled += velocity_magnitude * delta_time
+            # Renderiza a nave entre os dois últimos passos, conforme o tempo decorrido desde a publicação
+            render_position = snapshot.render_position(current_time)
 
             # A câmera segue a nave com suavidade
-            camera.follow_target(spaceship.position, spaceship.direction)
+            camera.follow_target(render_position, snapshot.spaceship.direction)
+
+            # Atualiza o overlay do profiler duas vezes por segundo (ordenar as amostras não é gratuito)
+            frame_count += 1
+            if profiler.enabled and frame_count % 30 == 0:
+                overlay_lines = (profiler.overlay_lines() + simulation.profiler.overlay_lines()[1:] +
+                                 [renderer.stats_line()])
 
-            # Renderiza o estado atual do universo, da nave e da câmera
-            renderer.render(space, spaceship, camera, play_time, distance_traveled)
+            # Renderiza a fotografia do universo e da nave
+            renderer.render(snapshot.space, snapshot.spaceship, camera, snapshot.play_time, snapshot.distance_traveled,
+                            spaceship_position=render_position, overlay_lines=overlay_lines)
+            profiler.mark('render')
 
             # Atualiza a tela
             pygame.display.flip()
+            profiler.mark('flip')
+            profiler.end_frame()
 
-            # Pausa para manter o tempo constante entre atualizações (time_step)
-            time.sleep(max(0, time_step - delta_time))
+            # Limita a taxa de quadros; a física não depende dela
+            time.sleep(max(0, frame_interval - (time.perf_counter() - current_time)))
 
+        finish()
         pygame.quit()
 
-    except Exception as e:
-        logging.error("Error in start_simulation", exc_info=True)
+    except Exception:
+        logger.error("Error in start_simulation", exc_info=True)
         print(f"Ocorreu um erro durante a execução da simulação. Confira 'errorlog.txt' para mais detalhes.")
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+import numpy as np
+from simulation.physics import Physics
+
+
+class Octree:
+    """
+    Octree com centro de massa e massa total por nó, usado pelo Barnes-Hut.
+    Os nós ficam em listas paralelas (structure-of-arrays) em vez de objetos por nó.
+    """
+    def __init__(self, positions, masses, leaf_size=8):
+        self.positions = positions
+        self.masses = masses
+        self.leaf_size = leaf_size
+        self.centers = []    # Centro geométrico da caixa de cada nó
+        self.halves = []     # Metade do lado da caixa de cada nó
+        self.coms = []       # Centro de massa de cada nó
+        self.node_masses = []
+        self.children = []   # Índices dos nós filhos (vazio para folhas)
+        self.bodies = []     # Índices dos corpos de cada folha (None para nós internos)
+
+        if len(positions):
+            low = positions.min(axis=0)
+            high = positions.max(axis=0)
+            center = (low + high) / 2
+            half = max(float((high - low).max()) / 2, 1.0) * 1.0001  # Margem para corpos na borda
+            self._build(np.arange(len(positions)), center, half)
+
+    def _build(self, indices, center, half):
+        node = len(self.centers)
+        node_masses = self.masses[indices]
+        total_mass = float(node_masses.sum())
+        if total_mass > 0:
+            com = (self.positions[indices] * node_masses[:, None]).sum(axis=0) / total_mass
+        else:
+            com = self.positions[indices].mean(axis=0)
+        self.centers.append(center)
+        self.halves.append(half)
+        self.coms.append(com)
+        self.node_masses.append(total_mass)
+        self.children.append([])
+        self.bodies.append(None)
+
+        # Folha: poucos corpos ou caixa tão pequena que dividir não separa mais nada
+        if len(indices) <= self.leaf_size or half < 1e-6:
+            self.bodies[node] = indices
+            return node
+
+        octants = (self.positions[indices] >= center) @ np.array([1, 2, 4])
+        quarter = half / 2
+        for octant in range(8):
+            child_indices = indices[octants == octant]
+            if len(child_indices) == 0:
+                continue
+            offset = np.array([
+                quarter if octant & 1 else -quarter,
+                quarter if octant & 2 else -quarter,
+                quarter if octant & 4 else -quarter
+            ])
+            self.children[node].append(self._build(child_indices, center + offset, quarter))
+        return node
+
+
+class BarnesHut:
+    """
+    Calcula a gravitação mútua entre N corpos em O(N log N) com o algoritmo de Barnes-Hut.
+    Grupos distantes de corpos são aproximados pelo seu centro de massa quando
+    (tamanho do nó / distância) < theta; theta = 0 equivale à soma direta O(N²).
+    O percurso da árvore é vetorizado: cada nó é visitado uma vez para todos os corpos
+    que chegam até ele, em vez de uma vez por corpo.
+    """
+    def __init__(self, theta=0.5, softening=1000.0, leaf_size=8, direct_threshold=512,
+                 gravity_constant=Physics.GRAVITY_CONSTANT):
+        self.theta = theta              # Ângulo de abertura (precisão x custo)
+        self.softening = softening      # Suavização para evitar forças infinitas em encontros próximos
+        self.leaf_size = leaf_size      # Máximo de corpos por folha da octree
+        # Abaixo deste número de corpos a soma direta vetorizada é mais rápida que montar a árvore
+        self.direct_threshold = direct_threshold
+        self.gravity_constant = gravity_constant
+
+    def accelerations(self, positions, masses):
+        """
+        Retorna a aceleração gravitacional de cada corpo causada por todos os outros.
+        :param positions: Array N×3 de posições
+        :param masses: Array de N massas
+        :return: Array N×3 de acelerações
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        masses = np.asarray(masses, dtype=np.float64)
+        accelerations = np.zeros_like(positions)
+        if len(positions) < 2:
+            return accelerations
+        if len(positions) <= self.direct_threshold:
+            return self.direct_accelerations(positions, masses)
+
+        tree = Octree(positions, masses, self.leaf_size)
+        softening_sq = self.softening ** 2
+        stack = [(0, np.arange(len(positions)))]
+        while stack:
+            node, targets = stack.pop()
+            target_positions = positions[targets]
+            leaf_bodies = tree.bodies[node]
+
+            if leaf_bodies is not None:
+                # Folha: soma direta entre os corpos que chegaram aqui e os corpos da folha
+                offsets = positions[leaf_bodies][None, :, :] - target_positions[:, None, :]
+                dist_sq = np.einsum('ijk,ijk->ij', offsets, offsets) + softening_sq
+                # O próprio corpo tem deslocamento zero e não contribui
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    weights = np.where(dist_sq > 0, masses[leaf_bodies][None, :] / dist_sq ** 1.5, 0.0)
+                accelerations[targets] += np.einsum('ij,ijk->ik', weights, offsets)
+                continue
+
+            offsets = tree.coms[node] - target_positions
+            dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+            size = 2 * tree.halves[node]
+            # Critério de abertura s/d < theta; corpos dentro da caixa do nó nunca o aproximam
+            inside = np.all(np.abs(target_positions - tree.centers[node]) <= tree.halves[node], axis=1)
+            far = (size * size < self.theta * self.theta * dist_sq) & ~inside
+
+            if far.any():
+                far_dist_sq = dist_sq[far] + softening_sq
+                weights = tree.node_masses[node] / far_dist_sq ** 1.5
+                accelerations[targets[far]] += offsets[far] * weights[:, None]
+            near = targets[~far]
+            if len(near):
+                for child in tree.children[node]:
+                    stack.append((child, near))
+
+        return accelerations * self.gravity_constant
+
+    def direct_accelerations(self, positions, masses):
+        """Soma direta O(N²): usada para poucos corpos e como referência de precisão do Barnes-Hut."""
+        return Physics.calculate_gravitational_acceleration_batch(
+            positions, positions, masses, self.softening, self.gravity_constant
+        )
@@ -0,0 +1,33 @@
+# Códigos das teclas que controlam a nave.
+# Os valores são os mesmos das constantes pygame.K_* (o código ASCII da letra), então o
+# dicionário de teclas montado em main.py funciona sem conversão, e a simulação não
+# precisa importar o pygame.
+KEY_W = ord('w')  # Frente
+KEY_S = ord('s')  # Trás
+KEY_A = ord('a')  # Esquerda
+KEY_D = ord('d')  # Direita
+KEY_Q = ord('q')  # Rotaciona para a esquerda
+KEY_E = ord('e')  # Rotaciona para a direita
+KEY_R = ord('r')  # Sobe
+KEY_F = ord('f')  # Desce
+
+MOVEMENT_KEYS = (KEY_W, KEY_A, KEY_S, KEY_D, KEY_Q, KEY_E, KEY_R, KEY_F)
+
+
+def keys_from_string(pressed):
+    """Monta o dicionário de teclas a partir das letras pressionadas (ex.: "wq")."""
+    return {key: chr(key) in pressed for key in MOVEMENT_KEYS}
+
+
+def keys_to_mask(keys):
+    """Compacta as teclas de movimento pressionadas num inteiro de 8 bits (um bit por tecla de MOVEMENT_KEYS)."""
+    mask = 0
+    for bit, key in enumerate(MOVEMENT_KEYS):
+        if keys.get(key):
+            mask |= 1 << bit
+    return mask
+
+
+def keys_from_mask(mask):
+    """Dicionário de teclas equivalente a um valor de keys_to_mask."""
+    return {key: bool(mask >> bit & 1) for bit, key in enumerate(MOVEMENT_KEYS)}
@@ -0,0 +1,109 @@
+import math
+import numpy as np
+
+
+class Integrator:
+    """
+    Integrador numérico para posições e velocidades guardadas em arrays N×3.
+    Os arrays são atualizados no lugar. A aceleração é fornecida por uma função
+    acceleration(positions, velocities, out) que escreve o resultado em out e o retorna.
+    """
+    name = None
+    evaluations_per_step = 1  # Quantas vezes a aceleração é calculada por passo
+
+    def __init__(self):
+        self._buffers = {}  # Arrays temporários reaproveitados entre passos, por formato
+
+    def buffer(self, key, shape):
+        """Retorna um array temporário do formato pedido, alocado apenas na primeira vez."""
+        array = self._buffers.get(key)
+        if array is None or array.shape != shape:
+            array = self._buffers[key] = np.zeros(shape)
+        return array
+
+    def step(self, positions, velocities, acceleration, time_step):
+        raise NotImplementedError
+
+    def advance(self, positions, velocities, acceleration, time_step, substeps=1):
+        """Avança time_step dividido em substeps passos iguais."""
+        sub_step = time_step / substeps
+        for _ in range(substeps):
+            self.step(positions, velocities, acceleration, sub_step)
+
+
+class SemiImplicitEuler(Integrator):
+    """Euler semi-implícito (simplético): v += a·dt e depois x += v·dt com a nova velocidade."""
+    name = 'semi_implicit_euler'
+
+    def step(self, positions, velocities, acceleration, time_step):
+        accelerations = acceleration(positions, velocities, self.buffer('a', positions.shape))
+        accelerations *= time_step
+        velocities += accelerations
+        scratch = self.buffer('dx', positions.shape)
+        np.multiply(velocities, time_step, out=scratch)
+        positions += scratch
+
+
+class VelocityVerlet(Integrator):
+    """
+    Velocity Verlet (simplético, segunda ordem): usa a aceleração no início e no fim do passo.
+    Para acelerações que dependem da velocidade (arrasto), a do fim do passo é avaliada
+    com a velocidade de meio passo.
+    """
+    name = 'velocity_verlet'
+    evaluations_per_step = 2
+
+    def step(self, positions, velocities, acceleration, time_step):
+        half_step = 0.5 * time_step
+        accelerations = acceleration(positions, velocities, self.buffer('a', positions.shape))
+        accelerations *= half_step
+        velocities += accelerations  # Meio chute
+        scratch = self.buffer('dx', positions.shape)
+        np.multiply(velocities, time_step, out=scratch)
+        positions += scratch  # Deslocamento completo (equivale a x + v·dt + a·dt²/2)
+        accelerations = acceleration(positions, velocities, self.buffer('a', positions.shape))
+        accelerations *= half_step
+        velocities += accelerations  # Segundo meio chute
+
+
+class Leapfrog(Integrator):
+    """Leapfrog drift-kick-drift (simplético, segunda ordem) com uma avaliação de aceleração por passo."""
+    name = 'leapfrog'
+
+    def step(self, positions, velocities, acceleration, time_step):
+        half_step = 0.5 * time_step
+        scratch = self.buffer('dx', positions.shape)
+        np.multiply(velocities, half_step, out=scratch)
+        positions += scratch  # Meio deslocamento
+        accelerations = acceleration(positions, velocities, self.buffer('a', positions.shape))
+        accelerations *= time_step
+        velocities += accelerations  # Chute completo
+        np.multiply(velocities, half_step, out=scratch)
+        positions += scratch  # Segundo meio deslocamento
+
+
+INTEGRATORS = {cls.name: cls for cls in (SemiImplicitEuler, VelocityVerlet, Leapfrog)}
+
+
+def get_integrator(name):
+    """Cria um integrador pelo nome ('semi_implicit_euler', 'velocity_verlet' ou 'leapfrog')."""
+    try:
+        return INTEGRATORS[name]()
+    except KeyError:
+        raise ValueError(f"Integrador desconhecido: {name}. Opções: {', '.join(INTEGRATORS)}") from None
+
+
+def adaptive_substeps(time_step, dynamical_time, accuracy=0.02, max_substeps=32):
+    """
+    Escolhe quantos subpassos usar perto de corpos massivos.
+    Cada subpasso fica limitado a uma fração (accuracy) do tempo dinâmico sqrt(r³ / GM)
+    do corpo mais próximo, que encurta rapidamente à medida que a nave se aproxima dele.
+    :param time_step: Passo de tempo completo
+    :param dynamical_time: Tempo dinâmico local (math.inf se não há corpos próximos)
+    :param accuracy: Fração do tempo dinâmico permitida por subpasso
+    :param max_substeps: Limite de subpassos por passo
+    :return: Número de subpassos (pelo menos 1)
+    """
+    if not math.isfinite(dynamical_time) or dynamical_time <= 0:
+        return 1
+    return max(1, min(max_substeps, math.ceil(time_step / (accuracy * dynamical_time))))
@@ -1,6 +1,12 @@
 import math
+import numpy as np
 
 class Physics:
+    """
+    Funções de física. As versões escalares recebem um vetor [x, y, z] por vez; as versões
+    *_batch recebem arrays NumPy (N×3 para vetores, N para escalares) e processam todos os
+    elementos de uma vez, sem laços em Python.
+    """
     GRAVITY_CONSTANT = 6.67430e-14  # Constante gravitacional universal reduzida
 
     @staticmethod
@@ -26,7 +32,6 @@ class Physics:
         :param time_step: Intervalo de tempo (delta_time)
         :return: Novo vetor de velocidade [vx, vy, vz]
         """
-        acceleration = [a * 0.98 for a in acceleration]  # Reduz a aceleração
         return [
             velocity[0] + acceleration[0] * time_step,
             velocity[1] + acceleration[1] * time_step,
@@ -42,7 +47,6 @@ class Physics:
         :param time_step: Intervalo de tempo (delta_time)
         :return: Nova posição [x, y, z]
         """
-        velocity = [v * 0.98 for v in velocity]  # Reduz a influência da velocidade
         return [
             position[0] + velocity[0] * time_step,
             position[1] + velocity[1] * time_step,
@@ -83,8 +87,119 @@ class Physics:
         :param max_value: Valor máximo para o comprimento do vetor
         :return: Vetor limitado [x, y, z]
         """
-        max_value *= 0.98  # Limita ainda mais a velocidade máxim
         magnitude = math.sqrt(sum(comp ** 2 for comp in vector))
         if magnitude > max_value and magnitude != 0:
             return [comp * max_value / magnitude for comp in vector]
         return vector
+
+    @staticmethod
+    def limit_vector_inplace(vector, max_value):
+        """
+        Limita o comprimento de um vetor ao valor máximo, alterando o próprio vetor.
+        :param vector: Vetor mutável a ser limitado (lista, array('d') ou array NumPy)
+        :param max_value: Valor máximo para o comprimento do vetor
+        :return: O mesmo vetor recebido
+        """
+        x, y, z = vector[0], vector[1], vector[2]
+        magnitude = math.sqrt(x * x + y * y + z * z)
+        if magnitude > max_value:
+            scale = max_value / magnitude
+            vector[0] = x * scale
+            vector[1] = y * scale
+            vector[2] = z * scale
+        return vector
+
+    @staticmethod
+    def calculate_gravitational_force_batch(masses1, masses2, distances):
+        """
+        Calcula as forças gravitacionais entre vários pares de corpos.
+        :param masses1: Massas dos primeiros corpos (array N ou escalar)
+        :param masses2: Massas dos segundos corpos (array N ou escalar)
+        :param distances: Distâncias entre os pares (array N)
+        :return: Array N de forças escalares (0 onde a distância é zero)
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            forces = Physics.GRAVITY_CONSTANT * np.multiply(masses1, masses2) / distances ** 2
+        return np.where(distances == 0, 0.0, forces)
+
+    @staticmethod
+    def calculate_velocity_batch(velocities, accelerations, time_step):
+        """
+        Atualiza várias velocidades com base nas acelerações e no tempo.
+        :param velocities: Array N×3 de velocidades
+        :param accelerations: Array N×3 de acelerações
+        :param time_step: Intervalo de tempo (delta_time)
+        :return: Novo array N×3 de velocidades
+        """
+        return np.asarray(velocities, dtype=np.float64) + np.asarray(accelerations) * time_step
+
+    @staticmethod
+    def update_position_batch(positions, velocities, time_step):
+        """
+        Atualiza várias posições com base nas velocidades e no tempo.
+        :param positions: Array N×3 de posições
+        :param velocities: Array N×3 de velocidades
+        :param time_step: Intervalo de tempo (delta_time)
+        :return: Novo array N×3 de posições
+        """
+        return np.asarray(positions, dtype=np.float64) + np.asarray(velocities) * time_step
+
+    @staticmethod
+    def calculate_distance_batch(positions1, positions2):
+        """
+        Calcula as distâncias entre posições no espaço 3D.
+        :param positions1: Array N×3 (ou um único ponto [x, y, z])
+        :param positions2: Array N×3 (ou um único ponto [x, y, z])
+        :return: Array N de distâncias
+        """
+        offsets = np.asarray(positions1, dtype=np.float64) - np.asarray(positions2, dtype=np.float64)
+        return np.sqrt(np.einsum('...i,...i->...', offsets, offsets))
+
+    @staticmethod
+    def normalize_vector_batch(vectors):
+        """
+        Normaliza vários vetores para terem magnitude 1.
+        :param vectors: Array N×3 de vetores
+        :return: Array N×3 de vetores normalizados (vetores nulos continuam nulos)
+        """
+        vectors = np.asarray(vectors, dtype=np.float64)
+        magnitudes = np.sqrt(np.einsum('...i,...i->...', vectors, vectors))[..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(magnitudes == 0, 0.0, vectors / magnitudes)
+
+    @staticmethod
+    def limit_vector_batch(vectors, max_value):
+        """
+        Limita o comprimento de vários vetores ao valor máximo especificado.
+        :param vectors: Array N×3 de vetores
+        :param max_value: Valor máximo para o comprimento (escalar ou array N)
+        :return: Array N×3 de vetores limitados
+        """
+        vectors = np.asarray(vectors, dtype=np.float64)
+        max_value = np.asarray(max_value, dtype=np.float64)
+        magnitudes = np.sqrt(np.einsum('...i,...i->...', vectors, vectors))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.where(magnitudes > max_value, max_value / magnitudes, 1.0)
+        return vectors * scale[..., None]
+
+    @staticmethod
+    def calculate_gravitational_acceleration_batch(positions, source_positions, source_masses, softening=0.0,
+                                                   gravity_constant=GRAVITY_CONSTANT):
+        """
+        Calcula a aceleração gravitacional em cada posição causada por um conjunto de corpos.
+        :param positions: Array N×3 de posições onde a aceleração é medida
+        :param source_positions: Array M×3 de posições dos corpos que atraem
+        :param source_masses: Array M de massas dos corpos que atraem
+        :param softening: Suavização somada à distância ao quadrado (evita forças infinitas)
+        :param gravity_constant: Constante gravitacional (padrão: a do jogo)
+        :return: Array N×3 de acelerações (corpos na mesma posição não contribuem)
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        source_positions = np.asarray(source_positions, dtype=np.float64)
+        offsets = source_positions[None, :, :] - positions[:, None, :]
+        dist_sq = np.einsum('ijk,ijk->ij', offsets, offsets)
+        softened = dist_sq + softening ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(dist_sq > 0, np.asarray(source_masses)[None, :] / softened ** 1.5, 0.0)
+        return np.einsum('ij,ijk->ik', weights, offsets) * gravity_constant
@@ -0,0 +1,279 @@
+"""
+Gravação e reprodução determinística de voos (.essr).
+
+    [cabeçalho][nome do integrador][registros...][fim]
+
+O cabeçalho guarda a semente do universo e o estado inicial da nave. Os registros são, na
+ordem em que aconteceram:
+    S: teclas de movimento (um bit por tecla), duração do passo e quantas vezes o passo se
+       repetiu igual (voos longos com as mesmas teclas viram um único registro);
+    I: setor instalado no universo durante o voo (pré-gerado em segundo plano, trazido do
+       armazenamento ou gerado na hora), que é o que depende do tempo real na gravação;
+    E: total de passos e hash do estado final (nave e setores ativos).
+Se a gravação começou de um salvamento com o universo, ele é gravado ao lado, em <arquivo>.world,
+no formato do salvamento (.ess).
+
+O replay refaz o voo sem janela, o mais rápido possível, instalando cada setor no mesmo passo
+em que ele apareceu na gravação, e confere o hash do estado final.
+
+    python -m simulation.replay voo.essr
+    python -m simulation.run --steps 5000 --record voo.essr
+"""
+import argparse
+import hashlib
+import struct
+import sys
+import time
+from pathlib import Path
+
+from simulation.controls import keys_from_mask, keys_to_mask
+from simulation.space import Space
+from simulation.spaceship import Spaceship
+from utils import save_format
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b'ESSR'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHqd3d3ddB')  # magic, versão, flags, semente, velocidade máxima, posição, velocidade, rotação, tamanho do nome do integrador
+STEPS = struct.Struct('<BdI')            # teclas, duração do passo, repetições
+INSTALL = struct.Struct('<3q')           # coordenadas do setor
+END = struct.Struct('<Q32s')             # passos, hash do estado final
+
+TAG_STEPS = b'S'
+TAG_INSTALL = b'I'
+TAG_END = b'E'
+
+NBODY = 1      # Flag do cabeçalho: os corpos celestes se movem (Barnes-Hut)
+HAS_WORLD = 2  # Flag do cabeçalho: o universo inicial está em <arquivo>.world
+
+
+class ReplayFormatError(ValueError):
+    """Arquivo que não é uma gravação .essr válida ou de uma versão desconhecida."""
+
+
+def world_path(path):
+    """Caminho do universo inicial gravado junto com a gravação."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.world")
+
+
+def state_hash(space, spaceship):
+    """Hash (32 bytes) do estado da simulação: posição, velocidade e rotação da nave e os corpos dos setores ativos."""
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(spaceship.position.tobytes())
+    digest.update(spaceship.velocity.tobytes())
+    digest.update(struct.pack('<d', spaceship.rotation_angle))
+    for coords in sorted(space.sectors):
+        sector = space.sectors[coords]
+        digest.update(INSTALL.pack(*coords))
+        digest.update(sector.positions.tobytes())
+        digest.update(sector.velocities.tobytes())
+    return digest.digest()
+
+
+class ReplayRecorder:
+    """
+    Grava um voo: chame step() depois de cada passo de física (Space.update seguido de
+    Spaceship.update) e close() no fim. Os setores instalados são avisados pelo próprio Space,
+    que recebe o gravador em space.recorder.
+    """
+    def __init__(self, path, space, spaceship, include_world=False):
+        """
+        :param path: Arquivo da gravação
+        :param space: Universo no estado em que o voo começa
+        :param spaceship: Nave no estado em que o voo começa
+        :param include_world: Se True, grava também o universo atual (ex.: carregado de um salvamento),
+                              que não pode ser refeito só com a semente
+        """
+        self.path = Path(path)
+        self.space = space
+        self.steps = 0
+        self.installs = 0
+        self.run = None  # [teclas, duração do passo, repetições] do registro S ainda não gravado
+        flags = (NBODY if space.nbody is not None else 0) | (HAS_WORLD if include_world else 0)
+        if include_world:
+            save_format.write_save(world_path(self.path), {"spaceship": spaceship.to_dict()}, space.save_world_state())
+        integrator = spaceship.integrator.name.encode('ascii')
+        self.file = open(self.path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, flags, space.seed, spaceship.max_speed,
+                                    *spaceship.position, *spaceship.velocity, spaceship.rotation_angle,
+                                    len(integrator)) + integrator)
+        space.recorder = self
+
+    def step(self, keys, time_step):
+        """Registra um passo de física com as teclas usadas nele."""
+        mask = keys_to_mask(keys)
+        run = self.run
+        if run is not None and run[0] == mask and run[1] == time_step and run[2] < 2 ** 32 - 1:
+            run[2] += 1
+        else:
+            self.flush()
+            self.run = [mask, time_step, 1]
+        self.steps += 1
+
+    def sector_installed(self, sector_coords):
+        """Chamado pelo Space (install_sector) durante o passo em andamento."""
+        self.flush()
+        self.file.write(TAG_INSTALL + INSTALL.pack(*sector_coords))
+        self.installs += 1
+
+    def flush(self):
+        """Grava o registro de passos em andamento."""
+        if self.run is not None:
+            self.file.write(TAG_STEPS + STEPS.pack(*self.run))
+            self.run = None
+
+    def close(self, spaceship):
+        """Encerra a gravação com o total de passos e o hash do estado final."""
+        self.flush()
+        self.file.write(TAG_END + END.pack(self.steps, state_hash(self.space, spaceship)))
+        self.file.close()
+        self.space.recorder = None
+        logger.info("Voo gravado em %s: %s passos, %s setores instalados", self.path, self.steps, self.installs)
+
+
+class ReplaySectors:
+    """
+    Faz o papel do SectorPrefetcher no replay: entrega o setor atual somente no passo em que
+    ele foi instalado na gravação, gerado pela semente (setores já visitados voltam do
+    armazenamento pelo próprio Space, como na gravação).
+    """
+    def __init__(self, space):
+        self.space = space
+        self.due = set()  # Setores instalados no passo em andamento, segundo a gravação
+        self.hits = 0     # Mantidos pela interface do SectorPrefetcher (Space.update_prefetch)
+        self.misses = 0
+
+    def update(self, position, velocity):
+        """Nada a agendar: os setores vêm da gravação."""
+
+    def take(self, coords):
+        if coords in self.due:
+            self.due.discard(coords)
+            return self.space.generate_objects_in_sector(coords)
+        return None
+
+    def metrics(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        self.due.clear()
+
+    def shutdown(self):
+        self.clear()
+
+
+def read_recording(path):
+    """
+    Lê uma gravação.
+    :return: (cabeçalho, registros), com o cabeçalho em dict e os registros como tuplas
+             ('steps', teclas, duração, repetições), ('install', coords) ou ('end', passos, hash)
+    """
+    data = Path(path).read_bytes()
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise ReplayFormatError(f"{path} não é uma gravação do ESS")
+    magic, version, flags, seed, max_speed, *state, name_length = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ReplayFormatError(f"Versão de gravação desconhecida: {version}")
+    offset = HEADER.size + name_length
+    header = {
+        "flags": flags,
+        "seed": seed,
+        "max_speed": max_speed,
+        "position": state[0:3],
+        "velocity": state[3:6],
+        "rotation_angle": state[6],
+        "integrator": data[HEADER.size:offset].decode('ascii'),
+    }
+    records = []
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        offset += 1
+        if tag == TAG_STEPS:
+            records.append(('steps', *STEPS.unpack_from(data, offset)))
+            offset += STEPS.size
+        elif tag == TAG_INSTALL:
+            records.append(('install', INSTALL.unpack_from(data, offset)))
+            offset += INSTALL.size
+        elif tag == TAG_END:
+            records.append(('end', *END.unpack_from(data, offset)))
+            offset += END.size
+        else:
+            raise ReplayFormatError(f"Registro desconhecido {tag!r} na posição {offset - 1}")
+    return header, records
+
+
+def replay(path):
+    """
+    Refaz um voo gravado sem janela, o mais rápido possível.
+    :return: Dicionário com os passos, a vazão e o hash do estado final, comparado com o gravado
+             ("match" é None se a gravação foi interrompida antes do registro final)
+    """
+    header, records = read_recording(path)
+    space = Space(seed=header["seed"], nbody=bool(header["flags"] & NBODY))
+    sectors = space.prefetcher = ReplaySectors(space)
+    if header["flags"] & HAS_WORLD:
+        with save_format.SaveReader(world_path(path)) as reader:
+            space.load_world_state(reader.read_world(), header["position"])
+    spaceship = Spaceship(name="replay", max_speed=header["max_speed"], integrator=header["integrator"])
+    spaceship.position = header["position"]
+    spaceship.velocity = header["velocity"]
+    spaceship.rotation_angle = header["rotation_angle"]
+
+    steps = installs = 0
+    expected = None
+    start = time.perf_counter()
+    for record in records:
+        if record[0] == 'steps':
+            _, mask, time_step, count = record
+            keys = keys_from_mask(mask)
+            for _ in range(count):
+                space.update(spaceship, time_step)
+                spaceship.update(time_step, keys, space)
+                sectors.due.clear()  # Setores não pedidos no passo em que foram instalados já vieram do armazenamento
+            steps += count
+        elif record[0] == 'install':
+            sectors.due.add(record[1])
+            installs += 1
+        else:
+            expected = record[2]
+    elapsed = time.perf_counter() - start
+    final_hash = state_hash(space, spaceship)
+    space.close()
+
+    return {
+        "steps": steps,
+        "installs": installs,
+        "elapsed": elapsed,
+        "steps_per_second": steps / elapsed if elapsed > 0 else float("inf"),
+        "hash": final_hash.hex(),
+        "expected_hash": expected.hex() if expected is not None else None,
+        "match": final_hash == expected if expected is not None else None,
+        "final_position": spaceship.position.tolist(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refaz um voo gravado do ESS e confere o estado final.")
+    parser.add_argument("recording", help="arquivo .essr gravado com ESS_RECORD ou simulation.run --record")
+    args = parser.parse_args(argv)
+
+    result = replay(args.recording)
+    print(f"Passos: {result['steps']} ({result['installs']} setores instalados)")
+    print(f"Tempo real: {result['elapsed']:.3f}s")
+    print(f"Passos por segundo: {result['steps_per_second']:.0f}")
+    print(f"Posição final: {result['final_position']}")
+    if result["match"] is None:
+        print("Gravação sem registro final: estado final não conferido")
+    else:
+        print(f"Estado final: {'confere' if result['match'] else 'DIVERGENTE'} ({result['hash'][:16]})")
+        if not result["match"]:
+            sys.exit(1)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Executa a simulação sem janela, sem pygame e sem OpenGL.
+
+A nave e o universo avançam em passos de tempo fixos, o mais rápido possível, com
+entrada aleatória ou roteirizada, e ao final são reportados os passos por segundo.
+
+Exemplos:
+    python -m simulation.run --steps 20000 --input random --seed 42
+    python -m simulation.run --input script --script "w:300,wq:60,:100"
+    python -m simulation.run --steps 5000 --record voo.essr   (refeito com python -m simulation.replay voo.essr)
+"""
+import argparse
+import logging
+import math
+import random
+import time
+
+from simulation.controls import MOVEMENT_KEYS, keys_from_string
+from simulation.integrators import INTEGRATORS
+from simulation.replay import ReplayRecorder
+from simulation.space import Space
+from simulation.spaceship import Spaceship
+from utils.logger import setup_logging
+
+
+class IdleInput:
+    """Nenhuma tecla pressionada: a nave só sofre gravidade e arrasto."""
+    def keys(self, step):
+        return keys_from_string("")
+
+
+class RandomInput:
+    """Troca o conjunto de teclas pressionadas a cada hold_steps passos, de forma reprodutível."""
+    def __init__(self, seed=0, hold_steps=30):
+        self.rng = random.Random(seed)
+        self.hold_steps = hold_steps
+        self.current = keys_from_string("")
+
+    def keys(self, step):
+        if step % self.hold_steps == 0:
+            self.current = {key: self.rng.random() < 0.3 for key in MOVEMENT_KEYS}
+        return self.current
+
+
+class ScriptedInput:
+    """
+    Repete um roteiro de teclas no formato "teclas:passos,teclas:passos".
+    Ex.: "w:300,wq:60,:100" acelera por 300 passos, curva por 60 e plana por 100.
+    """
+    def __init__(self, script):
+        self.segments = []
+        for segment in script.split(","):
+            pressed, _, steps = segment.partition(":")
+            self.segments.append((keys_from_string(pressed.strip()), int(steps)))
+        self.cycle = sum(steps for _, steps in self.segments)
+        if self.cycle <= 0:
+            raise ValueError("O roteiro de entrada precisa ter pelo menos um passo")
+
+    def keys(self, step):
+        position = step % self.cycle
+        for keys, steps in self.segments:
+            if position < steps:
+                return keys
+            position -= steps
+        return self.segments[-1][0]
+
+
+def run_headless(steps, time_step=1 / 60, seed=0, input_source=None, verbose=False, nbody=False,
+                 integrator='semi_implicit_euler', record=None):
+    """
+    Avança a simulação por um número fixo de passos e mede a vazão.
+    :param steps: Quantidade de passos de simulação
+    :param time_step: Duração fixa de cada passo em segundos
+    :param seed: Semente do universo
+    :param input_source: Objeto com keys(step) que devolve as teclas pressionadas
+    :param verbose: Se True, exibe no console as mensagens de depuração da simulação
+    :param nbody: Se True, os corpos celestes também se movem (Barnes-Hut)
+    :param integrator: Nome do integrador usado pela nave (ver simulation.integrators)
+    :param record: Arquivo onde gravar o voo para replay (simulation.replay), ou None
+    :return: Dicionário com os resultados da execução
+    """
+    input_source = input_source or IdleInput()
+    if verbose:
+        setup_logging(log_file=None, error_file=None, console_level=logging.DEBUG)
+    space = Space(seed=seed, nbody=nbody)
+    spaceship = Spaceship(name="headless", max_speed=120000, integrator=integrator)
+    recorder = ReplayRecorder(record, space, spaceship) if record else None
+    distance_traveled = 0.0
+
+    start = time.perf_counter()
+    for step in range(steps):
+        keys = input_source.keys(step)
+        space.update(spaceship, time_step)
+        spaceship.update(time_step, keys, space)
+        if recorder is not None:
+            recorder.step(keys, time_step)
+        distance_traveled += math.sqrt(sum(v ** 2 for v in spaceship.velocity)) * time_step
+    elapsed = time.perf_counter() - start
+    if recorder is not None:
+        recorder.close(spaceship)
+    store_metrics = space.store.metrics()
+    space.close()
+
+    return {
+        "steps": steps,
+        "time_step": time_step,
+        "seed": seed,
+        "elapsed": elapsed,
+        "steps_per_second": steps / elapsed if elapsed > 0 else float("inf"),
+        "simulated_seconds": steps * time_step,
+        "distance_traveled": distance_traveled,
+        "final_position": spaceship.position.tolist(),
+        "final_velocity": spaceship.velocity.tolist(),
+        "loaded_sectors": len(space.sectors),
+        "stored_sectors": store_metrics["memory_sectors"] + store_metrics["disk_sectors"],
+        "sector_store": store_metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa a simulação do ESS sem interface gráfica.")
+    parser.add_argument("--steps", type=int, default=10000, help="quantidade de passos de simulação")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="duração de cada passo em segundos")
+    parser.add_argument("--seed", type=int, default=0, help="semente do universo e da entrada aleatória")
+    parser.add_argument("--input", choices=("idle", "random", "script"), default="random",
+                        help="origem da entrada do teclado")
+    parser.add_argument("--script", default="w:300,wq:60,:100",
+                        help="roteiro usado com --input script (formato teclas:passos,...)")
+    parser.add_argument("--nbody", action="store_true", help="ativa a gravitação mútua entre os corpos")
+    parser.add_argument("--integrator", choices=tuple(INTEGRATORS), default="semi_implicit_euler",
+                        help="integrador usado no movimento da nave")
+    parser.add_argument("--record", help="grava o voo neste arquivo para replay (python -m simulation.replay)")
+    parser.add_argument("--verbose", action="store_true", help="mostra as mensagens de depuração da simulação")
+    args = parser.parse_args(argv)
+
+    if args.input == "random":
+        input_source = RandomInput(seed=args.seed)
+    elif args.input == "script":
+        input_source = ScriptedInput(args.script)
+    else:
+        input_source = IdleInput()
+
+    result = run_headless(args.steps, args.dt, args.seed, input_source, verbose=args.verbose,
+                          nbody=args.nbody, integrator=args.integrator, record=args.record)
+    print(f"Passos: {result['steps']} ({result['simulated_seconds']:.1f}s simulados)")
+    print(f"Tempo real: {result['elapsed']:.3f}s")
+    print(f"Passos por segundo: {result['steps_per_second']:.0f}")
+    print(f"Distância percorrida: {result['distance_traveled']:.0f} unidades")
+    print(f"Posição final: {result['final_position']}")
+    print(f"Setores carregados: {result['loaded_sectors']}")
+    print(f"Setores guardados: {result['stored_sectors']} (taxa de acerto: {result['sector_store']['hit_rate']:.0%})")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import numpy as np
+from simulation.spatial_index import UniformGrid
+
+
+class CelestialObjectView:
+    """
+    Visão de um objeto celeste armazenado dentro de um Sector.
+    Oferece a mesma interface de CelestialObject, mas lê e escreve diretamente
+    nos arrays do setor, sem copiar dados.
+    """
+    __slots__ = ('sector', 'index')
+
+    def __init__(self, sector, index):
+        self.sector = sector
+        self.index = index
+
+    @property
+    def obj_type(self):
+        return Sector.OBJECT_TYPES[self.sector.type_codes[self.index]]
+
+    @property
+    def position(self):
+        return self.sector.positions[self.index]  # Linha do array N×3 (sem cópia)
+
+    @position.setter
+    def position(self, value):
+        self.sector.positions[self.index] = value
+        self.sector.invalidate_index()
+
+    @property
+    def velocity(self):
+        return self.sector.velocities[self.index]
+
+    @velocity.setter
+    def velocity(self, value):
+        self.sector.velocities[self.index] = value
+
+    @property
+    def mass(self):
+        return float(self.sector.masses[self.index])
+
+    @property
+    def size(self):
+        return float(self.sector.sizes[self.index])
+
+    @property
+    def has_water(self):
+        return bool(self.sector.has_water[self.index])
+
+    @property
+    def name(self):
+        return self.sector.names[self.index]
+
+    @name.setter
+    def name(self, value):
+        self.sector.names[self.index] = value
+
+    def to_dict(self):
+        """Converte o objeto em um dicionário para facilitar o salvamento."""
+        return {
+            "obj_type": self.obj_type,
+            "position": self.position.tolist(),
+            "velocity": self.velocity.tolist(),
+            "mass": self.mass,
+            "size": self.size,
+            "has_water": self.has_water,
+            "name": self.name
+        }
+
+    def update(self, acceleration, time_step):
+        """Avança o movimento do objeto dentro do setor (o Space avança todos de uma vez)."""
+        self.velocity = self.velocity + np.asarray(acceleration) * time_step
+        self.position = self.position + self.velocity * time_step
+
+
+class Sector:
+    """
+    Armazena os objetos celestes de um setor em arrays contíguos (structure-of-arrays):
+    posições e velocidades N×3 em float64 e colunas de massa, tamanho, tipo e presença de água.
+    Iterar ou indexar o setor devolve CelestialObjectView para o código que
+    precisa trabalhar com um objeto de cada vez.
+    """
+    OBJECT_TYPES = ('planet', 'star', 'black_hole')  # Índice = código do tipo
+    TYPE_CODES = {obj_type: code for code, obj_type in enumerate(OBJECT_TYPES)}
+
+    def __init__(self, coords, positions, masses, sizes, type_codes, has_water, names=None, velocities=None):
+        self.coords = coords
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64).reshape(-1, 3)
+        if velocities is None:
+            self.velocities = np.zeros_like(self.positions)  # Corpos nascem em repouso
+        else:
+            self.velocities = np.ascontiguousarray(velocities, dtype=np.float64).reshape(-1, 3)
+        self.masses = np.ascontiguousarray(masses, dtype=np.float64)
+        self.sizes = np.ascontiguousarray(sizes, dtype=np.float64)
+        self.type_codes = np.ascontiguousarray(type_codes, dtype=np.int8)
+        self.has_water = np.ascontiguousarray(has_water, dtype=np.bool_)
+        # Nomes são raros e de tamanho variável, por isso ficam numa lista comum
+        self.names = list(names) if names is not None else [None] * len(self.masses)
+        self._index = None  # Índice espacial construído sob demanda
+        self.version = 0    # Incrementado a cada alteração dos objetos (o renderizador reenvia os dados à GPU)
+
+    def __len__(self):
+        return len(self.masses)
+
+    def __iter__(self):
+        for index in range(len(self.masses)):
+            yield CelestialObjectView(self, index)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.masses)
+        if not 0 <= index < len(self.masses):
+            raise IndexError("Índice de objeto fora do setor")
+        return CelestialObjectView(self, index)
+
+    def __setitem__(self, index, obj):
+        """Substitui o objeto na posição indicada pelos dados de outro objeto celeste."""
+        self.type_codes[index] = self.TYPE_CODES[obj.obj_type]
+        self.positions[index] = obj.position
+        self.velocities[index] = getattr(obj, "velocity", (0.0, 0.0, 0.0))
+        self.masses[index] = obj.mass
+        self.sizes[index] = obj.size
+        self.has_water[index] = obj.has_water
+        self.names[index] = obj.name
+        self.invalidate_index()
+
+    def spatial_index(self, cell_size):
+        """Retorna o índice espacial do setor, reconstruindo-o se as posições mudaram."""
+        if self._index is None or self._index.cell_size != cell_size:
+            self._index = UniformGrid(self.positions, cell_size)
+        return self._index
+
+    def invalidate_index(self):
+        """Descarta o índice espacial; deve ser chamado sempre que as posições mudarem."""
+        self._index = None
+        self.version += 1
+
+    def frozen_copy(self):
+        """
+        Cópia somente leitura do setor, com a mesma versão, para ser lida por outra thread
+        (ex.: o renderizador) enquanto a simulação continua alterando o original.
+        """
+        copy = Sector(self.coords, self.positions.copy(), self.masses.copy(), self.sizes.copy(),
+                      self.type_codes.copy(), self.has_water.copy(), names=tuple(self.names),
+                      velocities=self.velocities.copy())
+        for column in (copy.positions, copy.velocities, copy.masses, copy.sizes, copy.type_codes, copy.has_water):
+            column.flags.writeable = False
+        copy.version = self.version
+        return copy
+
+    @classmethod
+    def from_objects(cls, coords, objects):
+        """Cria um setor a partir de uma sequência de objetos celestes individuais."""
+        objects = list(objects)
+        return cls(
+            coords,
+            positions=[obj.position for obj in objects] or np.empty((0, 3)),
+            masses=[obj.mass for obj in objects],
+            sizes=[obj.size for obj in objects],
+            type_codes=[cls.TYPE_CODES[obj.obj_type] for obj in objects],
+            has_water=[obj.has_water for obj in objects],
+            names=[obj.name for obj in objects],
+            velocities=[getattr(obj, "velocity", (0.0, 0.0, 0.0)) for obj in objects] or None
+        )
+
+    def to_columns(self):
+        """Colunas do setor com os mesmos nomes dos argumentos do construtor (usado pelo salvamento binário)."""
+        return {
+            "positions": self.positions,
+            "velocities": self.velocities,
+            "masses": self.masses,
+            "sizes": self.sizes,
+            "type_codes": self.type_codes,
+            "has_water": self.has_water,
+            "names": self.names,
+        }
+
+    def to_dict(self):
+        """Converte o setor inteiro em um dicionário de colunas para facilitar o salvamento."""
+        return {
+            "coords": list(self.coords),
+            "obj_type": [self.OBJECT_TYPES[code] for code in self.type_codes.tolist()],
+            "position": self.positions.tolist(),
+            "velocity": self.velocities.tolist(),
+            "mass": self.masses.tolist(),
+            "size": self.sizes.tolist(),
+            "has_water": self.has_water.tolist(),
+            "name": list(self.names)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria um setor a partir de um dicionário de colunas."""
+        return cls(
+            tuple(data["coords"]),
+            positions=data["position"] or np.empty((0, 3)),
+            masses=data["mass"],
+            sizes=data["size"],
+            type_codes=[cls.TYPE_CODES[obj_type] for obj_type in data["obj_type"]],
+            has_water=data.get("has_water", [False] * len(data["mass"])),
+            names=data.get("name"),
+            velocities=data.get("velocity") or None
+        )
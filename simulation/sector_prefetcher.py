@@ -0,0 +1,117 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SectorPrefetcher:
+    """
+    Gera setores em uma thread de fundo antes que a nave chegue até eles.
+    A trajetória é extrapolada a partir da posição e da velocidade da nave; os setores
+    previstos são construídos fora da thread principal e só são entregues ao Space
+    quando a nave entra neles, sem que o loop de quadros espere pela geração.
+    """
+    def __init__(self, space, horizon=2.0, max_pending=8):
+        self.space = space
+        self.horizon = horizon          # Quantos segundos à frente a trajetória é extrapolada
+        self.max_pending = max_pending  # Máximo de setores sendo gerados ao mesmo tempo
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sector-prefetch")
+        self.pending = {}  # coords -> Future ainda em execução
+        self.ready = {}    # coords -> Sector pronto, aguardando a nave entrar
+        self.lock = threading.Lock()
+        self.generation = 0  # Incrementado em clear() para descartar gerações obsoletas
+        self.hits = 0    # Setores que já estavam prontos quando a nave entrou
+        self.misses = 0  # Setores que a nave alcançou antes de ficarem prontos
+
+    def predict_sectors(self, position, velocity):
+        """Retorna, em ordem de chegada, os setores que a nave deve atravessar no horizonte."""
+        speed = math.sqrt(sum(v ** 2 for v in velocity))
+        # Amostra a trajetória com passos menores que meio setor para não pular nenhum
+        samples = min(16, max(1, math.ceil(speed * self.horizon / (self.space.SECTOR_SIZE / 2))))
+        predicted = []
+        for step in range(samples + 1):
+            t = self.horizon * step / samples
+            future_position = [position[axis] + velocity[axis] * t for axis in range(3)]
+            coords = self.space.get_current_sector(future_position)
+            if coords not in predicted:
+                predicted.append(coords)
+        return predicted
+
+    def update(self, position, velocity):
+        """Agenda a geração dos setores previstos e descarta os que saíram da rota."""
+        predicted = self.predict_sectors(position, velocity)
+        for coords in predicted:
+            self.request(coords)
+        with self.lock:
+            for coords in list(self.ready):
+                if coords not in predicted:
+                    del self.ready[coords]  # Pode ser regenerado pela semente se for preciso
+
+    def request(self, coords):
+        """Agenda a geração de um setor, se ele ainda não existe nem está em andamento."""
+        with self.lock:
+            if coords in self.pending or coords in self.ready or coords in self.space.sectors:
+                return
+            if coords in self.space.store:  # Setor já visitado: volta do armazenamento, não da semente
+                return
+            if len(self.pending) >= self.max_pending:
+                return
+            self.pending[coords] = self.executor.submit(self._build, coords, self.generation)
+
+    def _build(self, coords, generation):
+        """
+        Executado na thread de fundo: gera o setor e já prepara seu índice espacial.
+        Se a geração falhar, o erro é registrado e o setor sai de pending, podendo ser pedido de novo.
+        """
+        sector = None
+        try:
+            sector = self.space.generate_objects_in_sector(coords)
+            sector.spatial_index(self.space.GRAVITY_INFLUENCE_RADIUS)
+        except Exception:
+            logger.error("Falha ao pré-gerar o setor %s", coords, exc_info=True)
+        finally:
+            with self.lock:
+                if generation == self.generation:
+                    self.pending.pop(coords, None)
+                    if sector is not None:
+                        self.ready[coords] = sector
+        return sector
+
+    def take(self, coords):
+        """
+        Retira um setor pronto, sem bloquear. Retorna None se ele ainda não foi gerado,
+        caso em que a geração é agendada.
+        """
+        with self.lock:
+            sector = self.ready.pop(coords, None)
+        if sector is None:
+            self.request(coords)
+        return sector
+
+    def metrics(self):
+        """Retorna as métricas de acerto da pré-geração."""
+        entered = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / entered if entered else 0.0,
+            "pending": len(self.pending),
+            "ready": len(self.ready)
+        }
+
+    def clear(self):
+        """Descarta todos os setores prontos (por exemplo, quando a semente do universo muda)."""
+        with self.lock:
+            self.generation += 1
+            for future in self.pending.values():
+                future.cancel()
+            self.pending.clear()
+            self.ready.clear()
+
+    def shutdown(self):
+        """Encerra a thread de fundo sem esperar gerações em andamento."""
+        self.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,214 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from simulation.sector import Sector
+from utils.save_format import pack_sector, unpack_sector
+
+
+class SectorStore:
+    """
+    Guarda os setores que saíram da área ativa em vez de descartá-los.
+    Primeiro nível: LRU em memória limitado pela quantidade total de objetos.
+    Segundo nível: banco SQLite em disco, para onde vão os setores menos usados quando
+    a memória enche. Setores reabertos voltam com tudo que tinham (nomes, corpos movidos).
+    """
+    def __init__(self, path=None, max_memory_objects=20000):
+        self.max_memory_objects = max_memory_objects  # Limite do LRU em memória (soma dos objetos)
+        self.memory = OrderedDict()  # coords -> Sector, do menos para o mais recentemente usado
+        self.memory_objects = 0
+        self.disk_keys = set()       # Coordenadas dos setores gravados em disco
+        # Sem caminho, o banco é um arquivo temporário criado no primeiro spill e apagado em close()
+        self.path = path
+        self.temporary = path is None
+        self.connection = None
+        if path is not None:
+            self.disk_keys.update(
+                tuple(row) for row in self.database().execute("SELECT x, y, z FROM sectors")
+            )
+        self.lock = threading.Lock()  # Protege as métricas lidas por outras threads
+        self.memory_hits = 0  # Setores devolvidos direto da memória
+        self.disk_hits = 0    # Setores recarregados do disco
+        self.misses = 0       # Setores pedidos que não estavam guardados
+        self.spills = 0       # Setores gravados em disco por falta de memória
+        self.spill_time = 0.0
+        self.reload_time = 0.0
+        self.worst_reload = 0.0
+
+    def database(self):
+        """Abre o banco SQLite na primeira vez que ele é necessário."""
+        if self.connection is None:
+            if self.path is None:
+                handle, self.path = tempfile.mkstemp(prefix="ess-sectors-", suffix=".sqlite")
+                os.close(handle)
+            self.connection = sqlite3.connect(self.path)
+            # É só um cache (o salvamento é que é durável): não espera o disco a cada gravação
+            self.connection.execute("PRAGMA synchronous = OFF")
+            # WAL: a leitura do salvamento automático (DiskSnapshot) não bloqueia nem vê as gravações seguintes
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sectors ("
+                "x INTEGER, y INTEGER, z INTEGER, count INTEGER, data BLOB, PRIMARY KEY (x, y, z))"
+            )
+        return self.connection
+
+    def __contains__(self, coords):
+        return coords in self.memory or coords in self.disk_keys
+
+    def __len__(self):
+        return len(self.memory) + len(self.disk_keys)
+
+    def put(self, coords, sector):
+        """Guarda um setor que saiu da área ativa, gravando em disco os menos usados se a memória encher."""
+        old = self.memory.pop(coords, None)
+        if old is not None:
+            self.memory_objects -= len(old)
+        self.memory[coords] = sector
+        self.memory_objects += len(sector)
+        while self.memory_objects > self.max_memory_objects and len(self.memory) > 1:
+            self.spill(*self.memory.popitem(last=False))
+
+    def spill(self, coords, sector):
+        """Grava um setor no SQLite e o tira da memória."""
+        start = time.perf_counter()
+        self.memory_objects -= len(sector)
+        with self.database() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sectors (x, y, z, count, data) VALUES (?, ?, ?, ?, ?)",
+                (*coords, len(sector), pack_sector(sector.to_columns()))
+            )
+        self.disk_keys.add(coords)
+        with self.lock:
+            self.spills += 1
+            self.spill_time += time.perf_counter() - start
+
+    def take(self, coords):
+        """
+        Retira um setor guardado para que ele volte à área ativa.
+        :return: Sector, ou None se o setor nunca foi guardado (deve ser gerado pela semente)
+        """
+        sector = self.memory.pop(coords, None)
+        if sector is not None:
+            self.memory_objects -= len(sector)
+            with self.lock:
+                self.memory_hits += 1
+            return sector
+        if coords not in self.disk_keys:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        start = time.perf_counter()
+        sector = self.read_disk(coords)
+        with self.database() as connection:
+            connection.execute("DELETE FROM sectors WHERE x = ? AND y = ? AND z = ?", coords)
+        self.disk_keys.discard(coords)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.disk_hits += 1
+            self.reload_time += elapsed
+            self.worst_reload = max(self.worst_reload, elapsed)
+        return sector
+
+    def read_disk(self, coords):
+        """Lê um setor do SQLite sem retirá-lo do disco."""
+        count, data = self.database().execute(
+            "SELECT count, data FROM sectors WHERE x = ? AND y = ? AND z = ?", coords
+        ).fetchone()
+        columns = unpack_sector(data, count)
+        del columns["indices"]  # Setores guardados estão sempre completos
+        return Sector(coords, **columns)
+
+    def items(self):
+        """Percorre todos os setores guardados (memória e disco) sem alterar o LRU."""
+        yield from self.memory_items()
+        for coords in sorted(self.disk_keys):
+            yield coords, self.read_disk(coords)
+
+    def memory_items(self):
+        """Setores guardados em memória, sem alterar o LRU."""
+        return list(self.memory.items())
+
+    def disk_snapshot(self):
+        """
+        Fixa os setores gravados em disco neste instante, para serem lidos depois (por outra thread)
+        sem desempacotá-los, enquanto o jogo continua guardando e retirando setores.
+        :return: DiskSnapshot, ou None se não há setores em disco
+        """
+        if not self.disk_keys:
+            return None
+        return DiskSnapshot(self.path, sorted(self.disk_keys))
+
+    def clear(self):
+        """Descarta todos os setores guardados."""
+        self.memory.clear()
+        self.memory_objects = 0
+        if self.disk_keys:
+            with self.database() as connection:
+                connection.execute("DELETE FROM sectors")
+        self.disk_keys.clear()
+
+    def metrics(self):
+        """Retorna taxa de acerto, quantidade de setores em cada nível e latências (ms)."""
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            requests = hits + self.misses
+            return {
+                "memory_sectors": len(self.memory),
+                "memory_objects": self.memory_objects,
+                "disk_sectors": len(self.disk_keys),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / requests if requests else 0.0,
+                "spills": self.spills,
+                "mean_spill_ms": self.spill_time / self.spills * 1e3 if self.spills else 0.0,
+                "mean_reload_ms": self.reload_time / self.disk_hits * 1e3 if self.disk_hits else 0.0,
+                "worst_reload_ms": self.worst_reload * 1e3,
+            }
+
+    def close(self):
+        """Fecha o banco (e apaga o arquivo temporário, se for o caso)."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self.temporary and self.path is not None:
+            for path in (self.path, f"{self.path}-wal", f"{self.path}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.path = None
+
+
+class DiskSnapshot:
+    """
+    Setores do SQLite num instante, lidos por uma conexão própria dentro de uma transação de
+    leitura aberta na criação (com WAL, ela não vê as gravações feitas depois). Os blocos saem
+    como estão no banco, no mesmo formato dos blocos de setor do salvamento (utils.save_format).
+    """
+    def __init__(self, path, coords):
+        self.coords = coords
+        # Criada na thread do jogo e lida na thread do salvamento
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("BEGIN")
+        self.connection.execute("SELECT 1 FROM sectors LIMIT 1").fetchall()  # Fixa o instante da leitura
+
+    def __len__(self):
+        return len(self.coords)
+
+    def blocks(self):
+        """Percorre (coords, quantidade de objetos, bloco empacotado) de cada setor."""
+        for coords in self.coords:
+            count, data = self.connection.execute(
+                "SELECT count, data FROM sectors WHERE x = ? AND y = ? AND z = ?", coords
+            ).fetchone()
+            yield coords, count, data
+
+    def close(self):
+        """Encerra a transação de leitura (o WAL volta a poder ser consolidado)."""
+        if self.connection is not None:
+            self.connection.rollback()
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,213 @@
+"""
+Simulação numa thread própria, com passo fixo, publicando fotografias imutáveis do estado.
+
+A thread da simulação é a única que mexe no Space e na Spaceship: a cada lote de passos ela
+monta um SimulationSnapshot (cópias somente leitura da nave e dos setores ativos) e o publica
+trocando uma única referência, self.latest. O renderizador lê essa referência sem travas; a
+fotografia anterior continua valendo para quem ainda a estiver desenhando (buffer duplo) e
+os setores que não mudaram são reaproveitados de uma fotografia para a outra.
+
+Foi usada uma thread, e não um processo: as partes pesadas (Barnes-Hut, geração de setores,
+índices espaciais) rodam no NumPy, que libera o GIL, e as fotografias passam de uma thread
+para a outra sem serialização.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from simulation.controls import keys_from_string
+from simulation.space import Space
+from simulation.timestep import FixedTimestep
+from utils.logger import get_logger
+from utils.profiler import FrameProfiler
+
+logger = get_logger(__name__)
+
+
+def frozen_array(values):
+    """Cópia somente leitura de um vetor."""
+    array = np.array(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+class ShipSnapshot:
+    """Estado da nave num instante, com os atributos que o Renderer e a Camera leem da Spaceship."""
+    __slots__ = ('name', 'position', 'velocity', 'direction', 'rotation_angle')
+
+    def __init__(self, spaceship):
+        self.name = spaceship.name
+        self.position = frozen_array(spaceship.position)
+        self.velocity = frozen_array(spaceship.velocity)
+        self.direction = frozen_array(spaceship.direction)
+        self.rotation_angle = spaceship.rotation_angle
+
+
+class SpaceSnapshot:
+    """Setores ativos num instante (cópias somente leitura), com a consulta espacial do Space."""
+    GRAVITY_INFLUENCE_RADIUS = Space.GRAVITY_INFLUENCE_RADIUS
+    query_radius = Space.query_radius  # Só lê self.sectors e o raio de influência
+
+    def __init__(self, sectors):
+        self.sectors = sectors
+
+
+class SimulationSnapshot:
+    """Fotografia publicada pela simulação depois de um lote de passos."""
+    __slots__ = ('tick', 'play_time', 'distance_traveled', 'spaceship', 'previous_position', 'space',
+                 'step', 'alpha', 'published_at')
+
+    def __init__(self, tick, play_time, distance_traveled, spaceship, previous_position, space, step, alpha):
+        self.tick = tick                            # Passos de física executados até aqui
+        self.play_time = play_time
+        self.distance_traveled = distance_traveled
+        self.spaceship = spaceship                  # ShipSnapshot
+        self.previous_position = previous_position  # Posição da nave no passo anterior
+        self.space = space                          # SpaceSnapshot
+        self.step = step
+        self.alpha = alpha                          # Fração do próximo passo já acumulada na publicação
+        self.published_at = time.perf_counter()
+
+    def render_position(self, now=None):
+        """
+        Posição da nave para desenhar agora: interpolada entre os dois últimos passos pelo
+        tempo decorrido desde a publicação (no máximo a posição do último passo).
+        """
+        now = time.perf_counter() if now is None else now
+        alpha = min(1.0, self.alpha + (now - self.published_at) / self.step)
+        return FixedTimestep.interpolate(self.previous_position, self.spaceship.position, alpha)
+
+
+class SimulationThread:
+    """
+    Avança Space.update e Spaceship.update em passos fixos e publica um SimulationSnapshot
+    depois de cada lote de passos. Com start(), os passos rodam numa thread própria, no ritmo
+    do passo fixo; sem ela, advance(frame_time) executa os passos de um quadro na thread que
+    chamar (o loop serial de antes).
+    A thread principal só troca as teclas (set_keys) e lê self.latest; para mexer no estado
+    (salvar, diálogos), suspende a simulação com paused().
+    """
+    def __init__(self, space, spaceship, step=1 / 60, max_steps_per_tick=5, play_time=0.0,
+                 distance_traveled=0.0, on_step=None, profile=False):
+        """
+        :param space: Universo; a partir daqui só a simulação o altera
+        :param spaceship: Nave; a partir daqui só a simulação a altera
+        :param step: Duração fixa de cada passo de física (s)
+        :param max_steps_per_tick: Limite de passos por lote, para não acumular atraso
+        :param on_step: Chamada depois de cada passo, na thread da simulação, como on_step(simulation, keys)
+                        (ex.: gravação do voo e salvamento automático)
+        :param profile: Se True, mede o tempo de cada passo desde o início
+        """
+        self.space = space
+        self.spaceship = spaceship
+        self.timestep = FixedTimestep(step, max_steps_per_tick)
+        self.step = step
+        self.play_time = play_time
+        self.distance_traveled = distance_traveled
+        self.on_step = on_step
+        self.ticks = 0
+        self.keys = keys_from_string("")  # Trocado inteiro por set_keys (troca de referência, sem trava)
+        self.previous_position = frozen_array(spaceship.position)
+        self.frozen = {}                  # Coordenadas -> (setor, versão, cópia somente leitura)
+        self.latest = None                # Último SimulationSnapshot publicado
+        self.published = 0
+        self.error = None                 # Exceção que encerrou a thread, se houver
+        # Tempo de cada passo, separado do tempo de quadro medido na thread principal
+        self.profiler = FrameProfiler(phases=('space_update', 'spaceship_update', 'on_step'), enabled=profile,
+                                      total='tick')
+        self.lock = threading.Lock()      # Segurado durante cada lote de passos e por paused()
+        self.stopping = threading.Event()
+        self.restart_clock = False
+        self.thread = None
+        self.publish()
+
+    def set_keys(self, keys):
+        """Teclas usadas a partir do próximo passo (o dicionário é copiado)."""
+        self.keys = dict(keys)
+
+    def advance(self, frame_time):
+        """Executa os passos que couberem em frame_time e publica o resultado. :return: Passos executados"""
+        steps = self.timestep.advance(frame_time)
+        for _ in range(steps):
+            self.tick()
+        if steps:
+            self.publish()
+        return steps
+
+    def tick(self):
+        """Um passo de física."""
+        keys = self.keys  # Lido uma vez: set_keys troca o dicionário inteiro
+        spaceship, profiler = self.spaceship, self.profiler
+        profiler.begin_frame()
+        self.previous_position = frozen_array(spaceship.position)
+        self.space.update(spaceship, self.step)
+        profiler.mark('space_update')
+        spaceship.update(self.step, keys, self.space)
+        profiler.mark('spaceship_update')
+        self.distance_traveled += float(np.linalg.norm(spaceship.velocity)) * self.step
+        self.play_time += self.step
+        self.ticks += 1
+        if self.on_step is not None:
+            self.on_step(self, keys)
+        profiler.mark('on_step')
+        profiler.end_frame()
+
+    def publish(self):
+        """Monta e publica a fotografia do estado atual, reaproveitando os setores que não mudaram."""
+        frozen = {}
+        for coords, sector in self.space.sectors.items():
+            entry = self.frozen.get(coords)
+            if entry is None or entry[0] is not sector or entry[1] != sector.version:
+                entry = (sector, sector.version, sector.frozen_copy())
+            frozen[coords] = entry
+        self.frozen = frozen
+        space = SpaceSnapshot({coords: entry[2] for coords, entry in frozen.items()})
+        self.latest = SimulationSnapshot(self.ticks, self.play_time, self.distance_traveled,
+                                         ShipSnapshot(self.spaceship), self.previous_position, space,
+                                         self.step, self.timestep.alpha)
+        self.published += 1
+
+    def start(self):
+        """Passa a simulação para uma thread própria."""
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        last = time.perf_counter()
+        try:
+            while not self.stopping.is_set():
+                with self.lock:
+                    now = time.perf_counter()
+                    if self.restart_clock:
+                        # O tempo em que a simulação ficou suspensa não é simulado depois
+                        last, self.restart_clock = now, False
+                    self.advance(now - last)
+                    last = now
+                    wait = self.step - self.timestep.accumulator
+                self.stopping.wait(max(0.0, wait))
+        except Exception as e:
+            self.error = e
+            logger.error("Erro na thread de simulação", exc_info=True)
+
+    @contextmanager
+    def paused(self):
+        """Suspende a simulação enquanto a thread principal usa o Space e a Spaceship."""
+        with self.lock:
+            yield
+            self.restart_clock = True
+
+    def check(self):
+        """Repassa para a thread principal o erro que encerrou a simulação, se houver."""
+        if self.error is not None:
+            raise RuntimeError("A thread de simulação parou") from self.error
+
+    def stop(self):
+        """Encerra a thread da simulação (o estado fica com quem chamou)."""
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.published:
+            logger.info("Simulação: %s passos, %s fotografias publicadas", self.ticks, self.published)
@@ -1,12 +1,34 @@
+import ast
+import hashlib
+import logging
+import math
 import random
+import struct
+import numpy as np
+from simulation.barnes_hut import BarnesHut
+from simulation.integrators import get_integrator
 from simulation.physics import Physics
-from utils.helpers import Helpers
+from simulation.sector import Sector
+from simulation.sector_prefetcher import SectorPrefetcher
+from simulation.sector_store import SectorStore
+from utils.logger import RateLimitedLogger, get_logger
+from utils.save_format import SECTOR_FULL, SECTOR_PARTIAL, WorldState
+
+logger = get_logger(__name__)
+frame_logger = RateLimitedLogger(logger)  # Mensagens emitidas a cada quadro
 
 class CelestialObject:
-    """Classe para representar objetos celestiais como planetas, estrelas, buracos negros."""
-    def __init__(self, obj_type, position, mass, size, has_water=False, name=None):
+    """
+    Classe para representar objetos celestiais como planetas, estrelas, buracos negros.
+    Posição e velocidade ficam em arrays NumPy próprios, atualizados no lugar.
+    """
+    __slots__ = ('obj_type', 'position', 'velocity', 'mass', 'size', 'has_water', 'name')
+
+    def __init__(self, obj_type, position, mass, size, has_water=False, name=None, velocity=None):
         self.obj_type = obj_type  # Tipo do objeto (planeta, estrela, buraco negro, etc.)
-        self.position = position  # Posição 3D do objeto
+        self.position = np.array(position, dtype=np.float64)  # Posição 3D do objeto
+        # Velocidade 3D do objeto
+        self.velocity = np.array(velocity if velocity is not None else (0.0, 0.0, 0.0), dtype=np.float64)
         self.mass = mass          # Massa do objeto (influencia na gravidade)
         self.size = size          # Tamanho físico do objeto
         self.has_water = has_water  # Indica se o planeta tem água
@@ -16,7 +38,8 @@ class CelestialObject:
         """Converte o objeto em um dicionário para facilitar o salvamento."""
         return {
             "obj_type": self.obj_type,
-            "position": self.position,
+            "position": self.position.tolist(),
+            "velocity": self.velocity.tolist(),
             "mass": self.mass,
             "size": self.size,
             "has_water": self.has_water,
@@ -32,61 +55,87 @@ class CelestialObject:
             mass=data["mass"],
             size=data["size"],
             has_water=data.get("has_water", False),
-            name=data.get("name", None)
+            name=data.get("name", None),
+            velocity=data.get("velocity")
         )
 
-    def update(self):
-        pass  # Implementar comportamento específico do objeto, se necessário
+    def update(self, acceleration, time_step):
+        """
+        Avança o movimento do objeto sob a aceleração gravitacional recebida.
+        :param acceleration: Vetor de aceleração [ax, ay, az] (ex.: calculado pelo Barnes-Hut)
+        :param time_step: Intervalo de tempo (delta_time)
+        """
+        for axis in range(3):
+            self.velocity[axis] += acceleration[axis] * time_step
+            self.position[axis] += self.velocity[axis] * time_step
 
 class Space:
     SECTOR_SIZE = 100000  # Tamanho do setor
     OBJECT_TYPES = ['planet', 'star', 'black_hole']  # Tipos de objetos celestiais
     GRAVITY_INFLUENCE_RADIUS = 5000  # Raio de influência gravitacional dos objetos
+    MAX_GRAVITY_FORCE = 1e3  # Força máxima que cada objeto exerce sobre a nave (valor ajustável)
 
-    def __init__(self):
-        self.sectors = {}  # Inicializa o dicionário de setores gerados
+    def __init__(self, seed=None, background_generation=False, nbody=False, nbody_theta=0.5,
+                 nbody_integrator='leapfrog', sector_store=None):
+        # Semente do universo: cada setor é derivado dela, então setores removidos
+        # podem ser regenerados idênticos a qualquer momento
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.sectors = {}  # Cache dos setores gerados (pode ser descartado livremente)
+        self.modified_objects = {}  # Objetos alterados pelo jogador em setores fora do cache (saves antigos)
+        self.stored_modified = {}   # Objetos alterados dos setores no armazenamento (save_game_state não lê o disco)
         self.max_active_sectors = 5  # Quantidade máxima de setores ativos no universo
+        # Setores que saíram da área ativa: LRU em memória com transbordo para SQLite
+        self.store = sector_store if sector_store is not None else SectorStore()
+        # Com geração em segundo plano, setores novos nunca são gerados dentro do quadro
+        self.prefetcher = SectorPrefetcher(self) if background_generation else None
+        self.last_sector = None  # Último setor em que a nave esteve (para as métricas de pré-geração)
+        # Gravitação mútua entre os corpos carregados (Barnes-Hut); None mantém os corpos estáticos
+        self.nbody = BarnesHut(theta=nbody_theta) if nbody else None
+        self.nbody_integrator = get_integrator(nbody_integrator)  # Integrador usado no movimento dos corpos
+        self.recorder = None  # Gravação de replay (simulation.replay): é avisada de cada setor instalado
         self.generate_sector(0, 0, 0)  # Gera o setor inicial onde a nave começa
 
-    def generate_objects_in_sector(self, sector_coords):
-        """Gera objetos celestiais dentro de um setor."""
-        objects = []
-        num_objects = random.randint(13, 27)  # Ajuste o número de objetos por setor
-        print(f"Gerando {num_objects} objetos no setor {sector_coords}")
-        sector_position = (
-            sector_coords[0] * self.SECTOR_SIZE,
-            sector_coords[1] * self.SECTOR_SIZE,
-            sector_coords[2] * self.SECTOR_SIZE
-        )
-        for _ in range(num_objects):
-            obj_type = random.choice(self.OBJECT_TYPES)
-            # Posiciona objetos próximos ao centro do setor
-            local_position = Helpers.random_position(-self.SECTOR_SIZE / 4, self.SECTOR_SIZE / 4)
-            position = (
-                sector_position[0] + local_position[0],
-                sector_position[1] + local_position[1],
-                sector_position[2] + local_position[2]
-            )
-            mass = random.uniform(1e14, 1e19)  # Massa dos objetos
-            size = random.uniform(4000, 120000)  # Tamanho dos objetos
+    def sector_seed(self, sector_coords):
+        """Deriva a semente de um setor combinando a semente do universo com suas coordenadas."""
+        data = struct.pack('<Qqqq', self.seed % 2 ** 64, *sector_coords)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
 
-            # Atribuir aleatoriamente se um planeta tem água ou não
-            has_water = False
-            if obj_type == 'planet':
-                has_water = random.choice([True, False])  # 50% de chance de ter água
+    def generate_objects_in_sector(self, sector_coords):
+        """Gera os objetos celestiais de um setor de forma determinística, direto em arrays."""
+        rng = np.random.default_rng(self.sector_seed(sector_coords))
+        num_objects = int(rng.integers(13, 28))  # Ajuste o número de objetos por setor
+        logger.debug("Gerando %d objetos no setor %s", num_objects, sector_coords)
+        sector_position = np.array(sector_coords, dtype=np.float64) * self.SECTOR_SIZE
 
-            obj = CelestialObject(obj_type, position, mass, size, has_water)
-            print(f"Criado objeto {obj.obj_type} na posição {obj.position}, com água: {obj.has_water}")
-            objects.append(obj)
+        type_codes = rng.integers(0, len(Sector.OBJECT_TYPES), num_objects)
+        # Posiciona objetos próximos ao centro do setor
+        positions = sector_position + rng.uniform(-self.SECTOR_SIZE / 4, self.SECTOR_SIZE / 4, (num_objects, 3))
+        masses = rng.uniform(1e14, 1e19, num_objects)  # Massa dos objetos
+        sizes = rng.uniform(4000, 120000, num_objects)  # Tamanho dos objetos
+        # 50% de chance de um planeta ter água; os demais tipos nunca têm
+        has_water = (type_codes == Sector.TYPE_CODES['planet']) & (rng.random(num_objects) < 0.5)
 
-        return objects
+        return Sector(sector_coords, positions, masses, sizes, type_codes, has_water)
 
     def generate_sector(self, x, y, z):
         """Gera um setor no universo proceduralmente, baseado nas coordenadas do setor."""
         if (x, y, z) not in self.sectors:
-            sector_objects = self.generate_objects_in_sector((x, y, z))
-            self.sectors[(x, y, z)] = sector_objects
-            print(f"Setor gerado em ({x}, {y}, {z}) com {len(sector_objects)} objetos")
+            # Setores já visitados voltam do armazenamento exatamente como foram deixados
+            sector = self.store.take((x, y, z))
+            if sector is None:
+                sector = self.generate_objects_in_sector((x, y, z))
+            self.install_sector((x, y, z), sector)
+
+    def install_sector(self, sector_coords, sector):
+        """Adiciona um setor já gerado ao universo, reaplicando as alterações do jogador."""
+        # Reaplica as alterações feitas pelo jogador antes do setor ser removido
+        for index, obj_data in self.modified_objects.pop(sector_coords, {}).items():
+            sector[index] = CelestialObject.from_dict(obj_data)
+        self.stored_modified.pop(sector_coords, None)
+        self.sectors[sector_coords] = sector
+        if self.recorder is not None:
+            self.recorder.sector_installed(sector_coords)  # O momento da instalação depende do tempo real
+        logger.debug("Setor gerado em %s com %d objetos", sector_coords, len(sector))
 
     def get_current_sector(self, spaceship_position):
         """Calcula em qual setor a nave está com base na sua posição."""
@@ -95,80 +144,270 @@ class Space:
         sector_z = int(spaceship_position[2] // self.SECTOR_SIZE)
         return (sector_x, sector_y, sector_z)
 
-    def update(self, spaceship):
-        """Atualiza os objetos no universo e aplica gravidade na nave."""
+    def update(self, spaceship, delta_time=0.0):
+        """
+        Atualiza os setores ativos e move os corpos celestes. A gravidade na nave é calculada
+        pelo integrador da própria nave, através de gravity_acceleration.
+        :param spaceship: Nave do jogador
+        :param delta_time: Intervalo de tempo usado para mover os corpos celestes (N-body)
+        """
         current_sector = self.get_current_sector(spaceship.position)
-        print(f"Setor atual da nave: {current_sector}")
+        frame_logger.debug("setor_atual", "Setor atual da nave: %s", current_sector)
 
         # Gera o setor atual se ainda não foi gerado
-        if current_sector not in self.sectors:
+        if self.prefetcher is not None:
+            self.update_prefetch(spaceship, current_sector)
+        elif current_sector not in self.sectors:
             self.generate_sector(*current_sector)
 
         # Limitar a quantidade de setores ativos para manter o desempenho
         if len(self.sectors) > self.max_active_sectors:
             self.remove_old_sectors(current_sector)
 
-        # Imprime os setores ativos e quantos objetos há em cada um
-        print(f"Setores ativos: {list(self.sectors.keys())}")
-        for sector_coords, objects in self.sectors.items():
-            print(f"Setor {sector_coords} tem {len(objects)} objetos")
-
-        # Aplica forças gravitacionais na nave somente de objetos próximos
-        for sector_coords, objects in self.sectors.items():
-            for obj in objects:
-                distance = Physics.calculate_distance(spaceship.position, obj.position)
-                if 0 < distance <= self.GRAVITY_INFLUENCE_RADIUS:
-                    force_magnitude = Physics.calculate_gravitational_force(
-                        spaceship.mass, obj.mass, distance
-                    )
-                    # Limita a força gravitacional máxima
-                    max_force = 1e3  # Valor ajustável para controlar a força máxima
-                    force_magnitude = min(force_magnitude, max_force)
-
-                    # Calcula o vetor direção da força (do objeto para a nave)
-                    direction_vector = [
-                        obj.position[0] - spaceship.position[0],
-                        obj.position[1] - spaceship.position[1],
-                        obj.position[2] - spaceship.position[2]
-                    ]
-                    # Normaliza o vetor direção
-                    direction_vector = Physics.normalize_vector(direction_vector)
-                    # Calcula o vetor força
-                    force_vector = [component * force_magnitude for component in direction_vector]
-                    # Aplica a força na nave
-                    spaceship.apply_force(force_vector)
+        # Registra os setores ativos e quantos objetos há em cada um
+        if logger.isEnabledFor(logging.DEBUG):
+            frame_logger.debug("setores_ativos", "Setores ativos: %s",
+                               tuple((coords, len(sector)) for coords, sector in self.sectors.items()))
+
+        # Move os corpos celestes sob a gravitação mútua entre todos os setores ativos
+        if self.nbody is not None and delta_time > 0:
+            self.update_bodies(delta_time)
+
+    def gravity_acceleration(self, position, mass):
+        """
+        Aceleração gravitacional sentida por um corpo em position, somando apenas os objetos próximos.
+        :param position: Posição do corpo [x, y, z]
+        :param mass: Massa do corpo (usada no limite de força por objeto)
+        :return: Array [ax, ay, az]
+        """
+        position = np.asarray(position, dtype=np.float64)
+        total_force = np.zeros(3)
+        for sector, indices, distances in self.query_radius(position, self.GRAVITY_INFLUENCE_RADIUS):
+            valid = distances > 0  # Evita divisão por zero
+            indices, distances = indices[valid], distances[valid]
+            if not len(indices):
+                continue
+            forces = Physics.calculate_gravitational_force_batch(mass, sector.masses[indices], distances)
+            # Limita a força gravitacional máxima
+            forces = np.minimum(forces, self.MAX_GRAVITY_FORCE)
+            # Direção da força (do corpo para o objeto), normalizada pela distância já conhecida
+            directions = (sector.positions[indices] - position) / distances[:, None]
+            total_force += directions.T @ forces
+        return total_force / mass
+
+    def dynamical_time(self, position, mass):
+        """
+        Menor tempo dinâmico sqrt(r / a) entre os objetos próximos de position, onde a é a
+        aceleração (já limitada) que cada objeto causa; sem o limite equivale a sqrt(r³ / GM).
+        Quanto menor, mais rápido a gravidade muda e menores devem ser os passos de integração.
+        :return: Tempo em segundos (math.inf se não há objetos no raio de influência)
+        """
+        position = np.asarray(position, dtype=np.float64)
+        shortest = math.inf
+        for sector, indices, distances in self.query_radius(position, self.GRAVITY_INFLUENCE_RADIUS):
+            valid = distances > 0
+            if not valid.any():
+                continue
+            distances = distances[valid]
+            forces = Physics.calculate_gravitational_force_batch(mass, sector.masses[indices[valid]], distances)
+            accelerations = np.minimum(forces, self.MAX_GRAVITY_FORCE) / mass
+            shortest = min(shortest, float(np.sqrt(distances / accelerations).min()))
+        return shortest
+
+    def update_bodies(self, delta_time):
+        """
+        Avança todos os corpos dos setores ativos com as acelerações do Barnes-Hut.
+        Corpos movidos num setor removido voltam à posição original se ele for regenerado.
+        """
+        sectors = [sector for sector in self.sectors.values() if len(sector)]
+        if not sectors:
+            return
+        positions = np.concatenate([sector.positions for sector in sectors])
+        velocities = np.concatenate([sector.velocities for sector in sectors])
+        masses = np.concatenate([sector.masses for sector in sectors])
+
+        def acceleration(positions, velocities, out):
+            out[:] = self.nbody.accelerations(positions, masses)
+            return out
+
+        self.nbody_integrator.advance(positions, velocities, acceleration, delta_time)
+
+        start = 0
+        for sector in sectors:
+            end = start + len(sector)
+            sector.positions[:] = positions[start:end]
+            sector.velocities[:] = velocities[start:end]
+            sector.invalidate_index()
+            start = end
+
+    def update_prefetch(self, spaceship, current_sector):
+        """
+        Agenda os setores previstos pela trajetória e instala o setor atual se ele já estiver
+        pronto. Nunca bloqueia: se o setor ainda está sendo gerado, ele aparece num quadro seguinte.
+        """
+        entering = current_sector != self.last_sector
+        self.last_sector = current_sector
+        self.prefetcher.update(spaceship.position, spaceship.velocity)
+        if current_sector in self.sectors:
+            return
+        if current_sector in self.store:
+            self.install_sector(current_sector, self.store.take(current_sector))
+            return
+        sector = self.prefetcher.take(current_sector)
+        if sector is not None:
+            if entering:
+                self.prefetcher.hits += 1
+            self.install_sector(current_sector, sector)
+        elif entering:
+            self.prefetcher.misses += 1
+
+    def close(self):
+        """Libera a thread de geração em segundo plano e o armazenamento de setores, registrando suas métricas."""
+        if self.prefetcher is not None:
+            logger.info("Pré-geração de setores: %s", self.prefetcher.metrics())
+            self.prefetcher.shutdown()
+        logger.info("Armazenamento de setores: %s", self.store.metrics())
+        self.store.close()
+
+    def query_radius(self, position, radius):
+        """
+        Busca os objetos carregados a até radius de position usando o índice espacial de cada setor.
+        O índice usa células do tamanho do raio de influência gravitacional, então o custo
+        acompanha a quantidade de objetos próximos e não o total de objetos carregados.
+        :param position: Posição central da consulta [x, y, z]
+        :param radius: Raio da consulta
+        :return: Lista de tuplas (setor, índices, distâncias), apenas para setores com resultados
+        """
+        results = []
+        for sector in self.sectors.values():
+            indices, distances = sector.spatial_index(self.GRAVITY_INFLUENCE_RADIUS).query(position, radius)
+            if len(indices):
+                results.append((sector, indices, distances))
+        return results
+
+    def collect_modified_objects(self, sector):
+        """Retorna os objetos alterados pelo jogador (por enquanto, os que receberam nome)."""
+        return {index: sector[index].to_dict() for index, name in enumerate(sector.names) if name is not None}
 
     def save_game_state(self):
-        """Salva o estado do jogo em formato JSON."""
+        """
+        Salva o estado do jogo em formato JSON.
+        Como os setores são regenerados a partir da semente, apenas a semente e os
+        objetos alterados pelo jogador precisam ser salvos.
+        """
+        modified = {coords: dict(objects) for coords, objects in self.modified_objects.items()}
+        modified.update(self.stored_modified)
+        for sector_coords, sector in self.sectors.items():
+            sector_modified = self.collect_modified_objects(sector)
+            if sector_modified:
+                modified[sector_coords] = sector_modified
         game_state = {
-            "sectors": {
-                str(sector_coords): [obj.to_dict() for obj in objects]
-                for sector_coords, objects in self.sectors.items()
+            "seed": self.seed,
+            "modified_objects": {
+                ",".join(str(c) for c in sector_coords): {str(index): obj for index, obj in objects.items()}
+                for sector_coords, objects in modified.items()
             }
         }
         return game_state
 
-    def load_game_state(self, game_state):
-        """Carrega o estado do jogo a partir de um arquivo JSON."""
-        self.sectors = {
-            eval(sector_coords): [CelestialObject.from_dict(obj_data) for obj_data in objects]
-            for sector_coords, objects in game_state.get("sectors", {}).items()
+    def save_world_state(self, copy=False):
+        """
+        Retorna o universo inteiro para o salvamento binário: os setores ativos e os guardados no
+        armazenamento completos (inclusive corpos já movidos pelo N-body) e, dos setores de saves
+        antigos que ainda não foram visitados, só os objetos alterados.
+        Os setores em disco não são lidos aqui: vão em world.packed e são copiados já empacotados
+        por quem gravar o salvamento, então o custo nesta thread não cresce com o universo explorado.
+        :param copy: Se True, copia os arrays dos setores (para gravar em outra thread enquanto o jogo continua)
+        """
+        world = WorldState(self.seed, packed=self.store.disk_snapshot())
+        for sector_coords, sector in [*self.sectors.items(), *self.store.memory_items()]:
+            columns = sector.to_columns()
+            if copy:
+                columns = {name: list(column) if name == "names" else column.copy() for name, column in columns.items()}
+            world.sectors.append((sector_coords, SECTOR_FULL, columns))
+        for sector_coords, objects in list(self.modified_objects.items()):
+            if sector_coords in self.sectors or sector_coords in self.store:
+                continue
+            columns = Sector.from_objects(
+                sector_coords, [CelestialObject.from_dict(obj_data) for obj_data in objects.values()]
+            ).to_columns()
+            columns["indices"] = np.fromiter(objects, dtype=np.int64, count=len(objects))
+            world.sectors.append((sector_coords, SECTOR_PARTIAL, columns))
+        return world
+
+    def load_world_state(self, world, position=None):
+        """
+        Restaura o universo a partir de um WorldState lido do salvamento binário.
+        :param position: Posição da nave: os setores completos vizinhos ao dela voltam a ser ativos e os
+                         demais vão para o armazenamento, respeitando seu limite de memória
+                         (sem posição, todos vão para o armazenamento e o próximo update traz o da nave)
+        """
+        self.reset(world.seed)
+        current_sector = self.get_current_sector(position) if position is not None else None
+        for sector_coords, flags, columns in world.sectors:
+            indices = columns.pop("indices")
+            sector = Sector(sector_coords, **columns)
+            if flags == SECTOR_FULL:
+                if current_sector is not None and self.is_near(sector_coords, current_sector):
+                    self.sectors[sector_coords] = sector
+                else:
+                    self.store_sector(sector_coords, sector)
+            else:
+                self.modified_objects[sector_coords] = {
+                    int(index): obj.to_dict() for index, obj in zip(indices.tolist(), sector)
+                }
+
+    def reset(self, seed):
+        """Descarta todos os setores e alterações e troca a semente do universo."""
+        self.seed = seed
+        self.sectors = {}
+        self.modified_objects = {}
+        self.stored_modified = {}
+        self.store.clear()
+        self.last_sector = None
+        if self.prefetcher is not None:
+            self.prefetcher.clear()  # Setores prontos foram gerados com a semente anterior
+
+    def load_game_state(self, game_state, position=None):
+        """
+        Carrega o estado do jogo salvo em JSON (ou um WorldState do salvamento binário).
+        :param position: Posição da nave (ver load_world_state)
+        """
+        if isinstance(game_state, WorldState):
+            self.load_world_state(game_state, position)
+            return
+        self.reset(game_state.get("seed", self.seed))
+        self.modified_objects = {
+            tuple(int(c) for c in sector_coords.split(",")): {
+                int(index): obj_data for index, obj_data in objects.items()
+            }
+            for sector_coords, objects in game_state.get("modified_objects", {}).items()
         }
+        # Formato antigo: todos os objetos de cada setor eram salvos
+        for sector_coords, objects in game_state.get("sectors", {}).items():
+            coords = ast.literal_eval(sector_coords)
+            self.sectors[coords] = Sector.from_objects(
+                coords, [CelestialObject.from_dict(obj_data) for obj_data in objects]
+            )
+
+    @staticmethod
+    def is_near(sector_coords, current_sector, max_distance=1):
+        """Indica se o setor está a no máximo max_distance setores do setor atual, em cada eixo."""
+        return all(abs(a - b) <= max_distance for a, b in zip(sector_coords, current_sector))
+
+    def store_sector(self, sector_coords, sector):
+        """Guarda um setor que sai da área ativa, anotando seus objetos alterados para o save_game_state."""
+        sector_modified = self.collect_modified_objects(sector)
+        if sector_modified:
+            self.stored_modified[sector_coords] = sector_modified
+        self.store.put(sector_coords, sector)
 
     def remove_old_sectors(self, current_sector):
         """Remove setores antigos que estão longe da nave para manter o universo sob controle."""
-        sectors_to_remove = []
-        for sector_coords in list(self.sectors.keys()):
-            # Calcula a distância em número de setores
-            distance_sectors = (
-                abs(sector_coords[0] - current_sector[0]),
-                abs(sector_coords[1] - current_sector[1]),
-                abs(sector_coords[2] - current_sector[2])
-            )
-            max_distance = 1  # Remove setores que estão a mais de 1 setor de distância
-            if any(d > max_distance for d in distance_sectors):
-                sectors_to_remove.append(sector_coords)
+        # Remove setores que estão a mais de 1 setor de distância
+        sectors_to_remove = [coords for coords in self.sectors if not self.is_near(coords, current_sector)]
 
         for sector in sectors_to_remove:
-            del self.sectors[sector]
-            print(f"Setor removido em {sector}")
+            # O setor vai inteiro para o armazenamento (nomes e corpos movidos incluídos)
+            self.store_sector(sector, self.sectors.pop(sector))
+            logger.debug("Setor removido em %s", sector)
@@ -1,31 +1,84 @@
-import pygame  # Import necessário para detectar eventos de teclado
+from simulation.controls import KEY_W, KEY_S, KEY_A, KEY_D, KEY_Q, KEY_E, KEY_R, KEY_F
+from simulation.integrators import adaptive_substeps, get_integrator
 from simulation.physics import Physics
+from utils.logger import RateLimitedLogger, get_logger
+import logging
 import math
+import numpy as np
+
+logger = get_logger(__name__)
+frame_logger = RateLimitedLogger(logger)  # Mensagens emitidas a cada quadro
 
 class Spaceship:
-    def __init__(self, name, max_speed=150000, mass=500):
+    """
+    Nave do jogador. Posição, velocidade, aceleração e direção ficam em buffers NumPy
+    alocados uma única vez e atualizados no lugar; atribuir a esses atributos copia os
+    valores para o buffer, então referências antigas continuam vendo o estado atual.
+    """
+    __slots__ = ('name', '_positions', '_velocities', '_position', '_velocity', '_acceleration', '_direction',
+                 'rotation_angle', 'max_speed', 'mass', 'drag_coefficient', 'integrator', 'max_substeps',
+                 '_gravity_field', '_acceleration_function')
+
+    def __init__(self, name, max_speed=150000, mass=500, integrator='semi_implicit_euler', max_substeps=32):
         self.name = name  # Nome do jogador, exibido sobre a nave
-        self.position = [0.0, 0.0, 0.0]       # Posição inicial da nave no espaço 3D
-        self.velocity = [0.0, 0.0, 0.0]       # Velocidade inicial da nave
-        self.acceleration = [0.0, 0.0, 0.0]   # Aceleração inicial da nave
-        self.direction = [0.0, 0.0, -1.0]     # Direção inicial da nave (eixo Z negativo)
+        # Estado em arrays 1×3 no formato esperado pelos integradores; _position e _velocity são a linha 0
+        self._positions = np.zeros((1, 3))
+        self._velocities = np.zeros((1, 3))
+        self._position = self._positions[0]          # Posição inicial da nave no espaço 3D
+        self._velocity = self._velocities[0]         # Velocidade inicial da nave
+        self._acceleration = np.zeros(3)             # Aceleração inicial da nave
+        self._direction = np.array([0.0, 0.0, -1.0])  # Direção inicial da nave (eixo Z negativo)
         self.rotation_angle = 0.0             # Ângulo de rotação da nave em graus
         self.max_speed = max_speed            # Velocidade máxima permitida para a nave
         self.mass = mass                      # Massa da nave, influencia a inércia e gravidade
         self.drag_coefficient = 0.05          # Coeficiente de arrasto
+        self.integrator = get_integrator(integrator)  # Método de integração do movimento
+        self.max_substeps = max_substeps      # Subpassos máximos perto de corpos massivos (1 desativa)
+        self._gravity_field = None            # Campo gravitacional do passo em andamento
+        self._acceleration_function = self.compute_acceleration  # Método ligado criado uma única vez
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position[:] = value
+
+    @property
+    def velocity(self):
+        return self._velocity
+
+    @velocity.setter
+    def velocity(self, value):
+        self._velocity[:] = value
+
+    @property
+    def acceleration(self):
+        return self._acceleration
+
+    @acceleration.setter
+    def acceleration(self, value):
+        self._acceleration[:] = value
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, value):
+        self._direction[:] = value
 
     def apply_force(self, force_vector):
         """
         Aplica uma força à nave, alterando sua aceleração com base na força aplicada.
         :param force_vector: Lista [Fx, Fy, Fz] representando o vetor de força aplicado
         """
-        # Calcula a aceleração resultante da força (F = m * a => a = F / m)
-        acceleration_due_to_force = [component / self.mass for component in force_vector]
-
-        # Atualiza a aceleração atual da nave
-        self.acceleration[0] += acceleration_due_to_force[0]
-        self.acceleration[1] += acceleration_due_to_force[1]
-        self.acceleration[2] += acceleration_due_to_force[2]
+        # Atualiza a aceleração atual da nave com a aceleração resultante (F = m * a => a = F / m)
+        acceleration = self._acceleration
+        acceleration[0] += force_vector[0] / self.mass
+        acceleration[1] += force_vector[1] / self.mass
+        acceleration[2] += force_vector[2] / self.mass
 
     def handle_input(self, keys, delta_time):
         """Lida com a entrada do teclado para controlar a nave."""
@@ -37,9 +90,9 @@ class Spaceship:
         rotation_speed = 100.0 * delta_time  # Ajuste conforme necessário
 
         # Rotaciona a nave para a esquerda e direita usando Q e E
-        if keys[pygame.K_q]:
+        if keys[KEY_Q]:
             self.rotation_angle += rotation_speed  # Rotaciona para a esquerda
-        if keys[pygame.K_e]:
+        if keys[KEY_E]:
             self.rotation_angle -= rotation_speed  # Rotaciona para a direita
 
         # Normaliza o ângulo de rotação para manter entre 0 e 360 graus
@@ -47,85 +100,102 @@ class Spaceship:
 
         # Atualiza a direção da nave com base no ângulo de rotação
         rad_angle = math.radians(self.rotation_angle)  # Converte para radianos
-        self.direction = [
-            math.sin(rad_angle),  # Eixo X
-            0.0,                  # Eixo Y permanece inalterado
-            -math.cos(rad_angle)  # Eixo Z (para frente/trás)
-        ]
+        sin_angle = math.sin(rad_angle)
+        cos_angle = math.cos(rad_angle)
+        direction = self._direction
+        direction[0] = sin_angle   # Eixo X
+        direction[1] = 0.0         # Eixo Y permanece inalterado
+        direction[2] = -cos_angle  # Eixo Z (para frente/trás)
+        acceleration = self._acceleration
 
         # Movimenta a nave para frente e para trás com base na direção (eixo Z)
-        if keys[pygame.K_w]:
+        if keys[KEY_W]:
             # Aplica aceleração na direção da nave
-            self.acceleration[0] += self.direction[0] * acceleration_value
-            self.acceleration[2] += self.direction[2] * acceleration_value
-            print("Movendo para frente")
-        if keys[pygame.K_s]:
+            acceleration[0] += direction[0] * acceleration_value
+            acceleration[2] += direction[2] * acceleration_value
+            frame_logger.debug("movendo_frente", "Movendo para frente")
+        if keys[KEY_S]:
             # Aplica aceleração contrária à direção da nave
-            self.acceleration[0] -= self.direction[0] * acceleration_value
-            self.acceleration[2] -= self.direction[2] * acceleration_value
-            print("Movendo para trás")
+            acceleration[0] -= direction[0] * acceleration_value
+            acceleration[2] -= direction[2] * acceleration_value
+            frame_logger.debug("movendo_tras", "Movendo para trás")
 
         # Movimenta a nave lateralmente sem rotacionar
         lateral_acceleration = 5000.0 * delta_time  # Ajuste fino para movimentos laterais
-        if keys[pygame.K_a]:
+        if keys[KEY_A]:
             # Calcula a aceleração lateral para a esquerda
-            self.acceleration[0] -= math.cos(rad_angle) * lateral_acceleration
-            self.acceleration[2] -= math.sin(rad_angle) * lateral_acceleration
-            print("Movendo para a esquerda")
-        if keys[pygame.K_d]:
+            acceleration[0] -= cos_angle * lateral_acceleration
+            acceleration[2] -= sin_angle * lateral_acceleration
+            frame_logger.debug("movendo_esquerda", "Movendo para a esquerda")
+        if keys[KEY_D]:
             # Calcula a aceleração lateral para a direita
-            self.acceleration[0] += math.cos(rad_angle) * lateral_acceleration
-            self.acceleration[2] += math.sin(rad_angle) * lateral_acceleration
-            print("Movendo para a direita")
+            acceleration[0] += cos_angle * lateral_acceleration
+            acceleration[2] += sin_angle * lateral_acceleration
+            frame_logger.debug("movendo_direita", "Movendo para a direita")
 
         # Movimenta a nave para cima e para baixo (eixo Y) com novas teclas R e F
-        if keys[pygame.K_r]:
-            self.acceleration[1] += acceleration_value  # Sobe a nave
-            print("Movendo para cima")
-        if keys[pygame.K_f]:
-            self.acceleration[1] -= acceleration_value  # Desce a nave
-            print("Movendo para baixo")
+        if keys[KEY_R]:
+            acceleration[1] += acceleration_value  # Sobe a nave
+            frame_logger.debug("movendo_cima", "Movendo para cima")
+        if keys[KEY_F]:
+            acceleration[1] -= acceleration_value  # Desce a nave
+            frame_logger.debug("movendo_baixo", "Movendo para baixo")
 
         # Aplicando resistência (drag) ao movimento para evitar velocidade infinita
         # Removido do handle_input para evitar aplicação dupla
         # self.apply_drag(delta_time)
 
-    def update(self, time_step, keys):
-        """Atualiza a velocidade, posição e direção da nave com base na aceleração e no tempo."""
+    def update(self, time_step, keys, gravity_field=None):
+        """
+        Atualiza a velocidade, posição e direção da nave com base na aceleração e no tempo.
+        :param time_step: Intervalo de tempo (delta_time)
+        :param keys: Estado das teclas
+        :param gravity_field: Objeto com gravity_acceleration(position, mass) e dynamical_time(position, mass),
+                              normalmente o Space; None ignora a gravidade
+        """
 
         # Lida com a entrada do teclado para alterar a aceleração e rotação da nave
         self.handle_input(keys, time_step)
 
-        # Atualiza a velocidade com base na aceleração atual
-        self.velocity = Physics.calculate_velocity(self.velocity, self.acceleration, time_step)
+        # Perto de corpos massivos a gravidade muda rápido: divide o passo em subpassos menores
+        substeps = 1
+        if gravity_field is not None and self.max_substeps > 1:
+            substeps = adaptive_substeps(time_step, gravity_field.dynamical_time(self._position, self.mass),
+                                         max_substeps=self.max_substeps)
 
-        # Aplicando resistência (drag) ao movimento para evitar velocidade infinita
-        self.apply_drag(time_step)
+        # Propulsores e forças aplicadas ficam constantes durante o passo; arrasto e gravidade
+        # são recalculados pelo integrador a cada avaliação
+        self._gravity_field = gravity_field
+        self.integrator.advance(self._positions, self._velocities, self._acceleration_function, time_step, substeps)
+        self._gravity_field = None
 
         # Limita a velocidade máxima da nave para evitar ultrapassar o limite
-        self.velocity = Physics.limit_vector(self.velocity, self.max_speed)
-
-        # Atualiza a posição da nave com base na velocidade atual
-        self.position = Physics.update_position(self.position, self.velocity, time_step)
+        Physics.limit_vector_inplace(self._velocity, self.max_speed)
 
         # Reseta a aceleração após a atualização para evitar acumulação de força
-        self.acceleration = [0.0, 0.0, 0.0]
+        self._acceleration.fill(0.0)
 
-        # Depuração: imprime a aceleração, velocidade e posição
-        print(f"Aceleração: {self.acceleration}")
-        print(f"Velocidade: {self.velocity}")
-        print(f"Posição: {self.position}")
+        # Depuração: registra a velocidade e a posição (no máximo uma vez por segundo)
+        if logger.isEnabledFor(logging.DEBUG):
+            frame_logger.debug("estado", "Velocidade: %s Posição: %s", tuple(self.velocity), tuple(self.position))
+
+    def compute_acceleration(self, positions, velocities, out):
+        """
+        Aceleração total usada pelo integrador: propulsores, arrasto e gravidade do passo atual.
+        :param positions: Array 1×3 com a posição avaliada
+        :param velocities: Array 1×3 com a velocidade avaliada
+        :param out: Array 1×3 onde o resultado é escrito
+        """
+        np.multiply(velocities, -self.drag_coefficient, out=out)  # Arrasto
+        out += self._acceleration
+        if self._gravity_field is not None:
+            out[0] += self._gravity_field.gravity_acceleration(positions[0], self.mass)
+        return out
 
     def apply_drag(self, time_step):
         """Aplica uma força de arrasto (drag) para desacelerar a nave."""
-        drag_force = [-v * self.drag_coefficient for v in self.velocity]
-
-        # Aplica a força de arrasto à velocidade
-        self.velocity = [
-            self.velocity[0] + drag_force[0] * time_step,
-            self.velocity[1] + drag_force[1] * time_step,
-            self.velocity[2] + drag_force[2] * time_step
-        ]
+        # v += -v * c * dt, direto no buffer da velocidade
+        self._velocity *= 1.0 - self.drag_coefficient * time_step
 
     def draw_name(self, renderer, camera):
         """Desenha o nome do jogador acima da nave."""
@@ -137,8 +207,8 @@ class Spaceship:
 
     def to_dict(self):
         return {
-            "position": self.position,
-            "velocity": self.velocity,
-            "acceleration": self.acceleration,
+            "position": self._position.tolist(),
+            "velocity": self._velocity.tolist(),
+            "acceleration": self._acceleration.tolist(),
             "rotation_angle": self.rotation_angle,
         }
@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+
+class UniformGrid:
+    """
+    Índice espacial em grade uniforme para consultas por raio.
+    Os objetos são agrupados em células cúbicas de lado cell_size; uma consulta
+    só examina as células que tocam a esfera pedida, em vez de todos os objetos.
+    Os objetos ficam ordenados por célula em order, e slots leva o identificador linear de
+    cada célula ocupada ao trecho (início, fim) dela em order; tudo é montado com NumPy,
+    sem laço em Python por objeto.
+    """
+    def __init__(self, positions, cell_size):
+        self.positions = positions
+        self.cell_size = float(cell_size)
+        if len(positions):
+            self.bounds_min = positions.min(axis=0)
+            self.bounds_max = positions.max(axis=0)
+        else:
+            self.bounds_min = self.bounds_max = np.zeros(3)
+
+        cell_keys = np.floor(positions / self.cell_size).astype(np.int64).reshape(-1, 3)
+        if len(cell_keys):
+            self.origin = cell_keys.min(axis=0)              # Célula (i, j, k) mínima
+            self.shape = cell_keys.max(axis=0) - self.origin + 1
+        else:
+            self.origin = np.zeros(3, dtype=np.int64)
+            self.shape = np.zeros(3, dtype=np.int64)
+        self.limits = list(zip(self.origin.tolist(), self.shape.tolist()))  # (origem, tamanho) por eixo, em int
+        linear = self.linear_ids(cell_keys - self.origin)
+        # Ordenação estável: dentro de cada célula os objetos ficam em ordem crescente de índice
+        self.order = np.argsort(linear, kind='stable').astype(np.intp)
+        sorted_ids = linear[self.order]
+        starts = np.flatnonzero(np.diff(sorted_ids, prepend=-1)) if len(sorted_ids) else np.empty(0, dtype=np.intp)
+        ends = np.append(starts[1:], len(sorted_ids))
+        # Identificador linear da célula -> (início, fim) dos seus objetos em order
+        self.slots = dict(zip(sorted_ids[starts].tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def linear_ids(self, offsets):
+        """Identificador linear de células dadas pelo deslocamento (i, j, k) em relação a origin."""
+        return (offsets[..., 0] * self.shape[1] + offsets[..., 1]) * self.shape[2] + offsets[..., 2]
+
+    def intersects(self, position, radius):
+        """Verifica se a esfera (position, radius) toca a caixa que envolve os objetos."""
+        if not self.slots:
+            return False
+        closest = np.clip(position, self.bounds_min, self.bounds_max)
+        offset = closest - position
+        return float(offset @ offset) <= radius * radius
+
+    def query(self, position, radius):
+        """
+        Retorna os índices e as distâncias dos objetos a até radius de position.
+        :param position: Posição central da consulta [x, y, z]
+        :param radius: Raio da consulta
+        :return: Tupla (índices, distâncias) como arrays NumPy
+        """
+        position = np.asarray(position, dtype=np.float64)
+        if not self.intersects(position, radius):
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        # Células que tocam a esfera, limitadas às que existem na grade (em int: são só três eixos)
+        ranges = [
+            range(max(math.floor((center - radius) / self.cell_size) - origin, 0),
+                  min(math.floor((center + radius) / self.cell_size) - origin, size - 1) + 1)
+            for center, (origin, size) in zip(position.tolist(), self.limits)
+        ]
+        if len(ranges[0]) * len(ranges[1]) * len(ranges[2]) >= len(self.slots):
+            # Raio grande em relação à grade: testar a distância de todos os objetos de uma vez
+            # (vetorizado) é mais barato que percorrer as células; o filtro abaixo dá o mesmo resultado
+            candidates = np.arange(len(self.positions), dtype=np.intp)
+        else:
+            (_, size_j), (_, size_k) = self.limits[1], self.limits[2]
+            buckets = []
+            for i in ranges[0]:
+                for j in ranges[1]:
+                    row = (i * size_j + j) * size_k
+                    for k in ranges[2]:
+                        slot = self.slots.get(row + k)
+                        if slot is not None:
+                            buckets.append(self.order[slot[0]:slot[1]])
+            if not buckets:
+                return np.empty(0, dtype=np.intp), np.empty(0)
+            candidates = np.concatenate(buckets) if len(buckets) > 1 else buckets[0]
+
+        offsets = self.positions[candidates] - position
+        distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+        inside = distances <= radius
+        return candidates[inside], distances[inside]
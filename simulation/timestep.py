@@ -0,0 +1,38 @@
+class FixedTimestep:
+    """
+    Acumulador para um loop de simulação com passo de tempo fixo.
+    O tempo real de cada quadro é acumulado e consumido em passos de tamanho fixo, então
+    a física não depende da taxa de quadros. O número de passos por quadro é limitado para
+    evitar a "espiral da morte" (quadros lentos gerando cada vez mais passos atrasados).
+    """
+    def __init__(self, step=1 / 60, max_steps_per_frame=5):
+        self.step = step                                # Duração fixa de cada passo de física
+        self.max_steps_per_frame = max_steps_per_frame  # Limite de passos executados por quadro
+        self.accumulator = 0.0                          # Tempo real ainda não simulado
+        self.dropped_time = 0.0                         # Tempo descartado pelo limite de passos
+
+    def advance(self, frame_time):
+        """
+        Acumula o tempo do quadro e retorna quantos passos de física devem ser executados.
+        :param frame_time: Tempo real decorrido desde o último quadro (em segundos)
+        :return: Número de passos fixos a executar neste quadro
+        """
+        self.accumulator += max(0.0, frame_time)
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps_per_frame:
+            # Descarta o atraso excedente em vez de tentar recuperá-lo nos próximos quadros
+            self.dropped_time += (steps - self.max_steps_per_frame) * self.step
+            steps = self.max_steps_per_frame
+            self.accumulator = self.step * steps + (self.accumulator % self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """Fração do próximo passo já decorrida, usada para interpolar a renderização (0 a 1)."""
+        return self.accumulator / self.step
+
+    @staticmethod
+    def interpolate(previous, current, alpha):
+        """Interpola linearmente entre o estado do penúltimo e do último passo."""
+        return [p + (c - p) * alpha for p, c in zip(previous, current)]
@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AutoSaver:
+    """
+    Salva o jogo periodicamente sem travar o loop de quadros.
+    Quem pede o salvamento só faz uma cópia do estado (nave e setores carregados); a
+    serialização e a escrita atômica ficam numa thread de fundo. Os salvamentos automáticos
+    são pedidos pela thread da simulação, entre dois passos de física (na thread principal
+    com ESS_SIM_THREAD=0), e os do jogador pela thread principal, com a simulação suspensa.
+    metrics() separa o tempo da cópia (snapshot_stall, com as threads em que ela rodou) do
+    tempo em que a thread principal ficou parada salvando (main_thread_stall, medido por
+    quem chama com record_main_stall).
+    """
+    def __init__(self, game_logger, interval=60.0):
+        self.game_logger = game_logger
+        self.interval = interval  # Segundos de jogo entre salvamentos automáticos
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self.pending = None         # Future do salvamento em andamento
+        self.last_save_time = 0.0   # Tempo de jogo do último salvamento agendado
+        self.lock = threading.Lock()
+        self.scheduled = 0          # Salvamentos agendados
+        self.saves = 0              # Salvamentos gravados com sucesso
+        self.failures = 0
+        self.skipped = 0            # Pedidos ignorados porque o anterior ainda estava sendo gravado
+        self.worst_stall = 0.0      # Maior tempo gasto por quem pediu o salvamento (cópia e espera, s)
+        self.total_stall = 0.0
+        self.stall_threads = set()  # Threads em que as cópias foram feitas
+        self.worst_main_stall = 0.0  # Maior tempo com a thread principal parada salvando (s)
+        self.total_main_stall = 0.0
+        self.main_stalls = 0
+        self.worst_wait = 0.0       # Maior espera pelo salvamento anterior (block=True), já incluída em worst_stall
+        self.worst_write = 0.0      # Maior tempo de serialização e escrita na thread de fundo (s)
+
+    def update(self, play_time, player_name, spaceship, distance_traveled, space=None):
+        """Agenda um salvamento se já passou o intervalo desde o último. Chamado a cada passo de física."""
+        if play_time - self.last_save_time < self.interval:
+            return False
+        return self.save(player_name, spaceship, distance_traveled, play_time, space)
+
+    def save(self, player_name, spaceship, distance_traveled, play_time, space=None, save_name=None, block=False):
+        """
+        Copia o estado atual e agenda sua gravação na thread de fundo.
+        :param block: Se True, espera o salvamento anterior terminar em vez de ignorar o pedido
+                      (usado nos salvamentos pedidos pelo jogador, que não podem ser perdidos)
+        :return: True se o salvamento foi agendado, False se o anterior ainda não terminou
+        """
+        start = time.perf_counter()  # Antes da espera: ela também trava quem pediu o salvamento
+        if self.pending is not None and not self.pending.done():
+            if not block:
+                self.skipped += 1
+                return False
+            self.wait()
+            self.worst_wait = max(self.worst_wait, time.perf_counter() - start)
+        data, world = self.game_logger.snapshot_progress(player_name, spaceship, distance_traveled, play_time, space)
+        save_path = self.game_logger.save_path(save_name)
+        self.pending = self.executor.submit(self._write, save_path, data, world)
+        stall = time.perf_counter() - start
+        self.last_save_time = play_time
+        self.scheduled += 1
+        self.worst_stall = max(self.worst_stall, stall)
+        self.total_stall += stall
+        self.stall_threads.add(threading.current_thread().name)
+        return True
+
+    def record_main_stall(self, elapsed):
+        """
+        Registra quanto tempo a thread principal ficou parada num salvamento.
+        :param elapsed: Segundos desde antes de suspender a simulação até o salvamento ser agendado
+        """
+        self.worst_main_stall = max(self.worst_main_stall, elapsed)
+        self.total_main_stall += elapsed
+        self.main_stalls += 1
+
+    def _write(self, save_path, data, world):
+        """Executado na thread de fundo: serializa e grava o salvamento."""
+        start = time.perf_counter()
+        saved = self.game_logger.write_progress(save_path, data, world)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            if saved:
+                self.saves += 1
+            else:
+                self.failures += 1
+            self.worst_write = max(self.worst_write, elapsed)
+        return saved
+
+    def wait(self):
+        """Espera o salvamento em andamento terminar."""
+        if self.pending is not None:
+            self.pending.result()
+
+    def metrics(self):
+        """Retorna as métricas de salvamento (tempos em milissegundos)."""
+        with self.lock:
+            saves, failures, worst_write = self.saves, self.failures, self.worst_write
+        return {
+            "saves": saves,
+            "failures": failures,
+            "skipped": self.skipped,
+            "worst_snapshot_stall_ms": self.worst_stall * 1e3,
+            "mean_snapshot_stall_ms": self.total_stall / self.scheduled * 1e3 if self.scheduled else 0.0,
+            "snapshot_threads": sorted(self.stall_threads),
+            "worst_main_thread_stall_ms": self.worst_main_stall * 1e3,
+            "mean_main_thread_stall_ms": self.total_main_stall / self.main_stalls * 1e3 if self.main_stalls else 0.0,
+            "worst_wait_ms": self.worst_wait * 1e3,
+            "worst_write_ms": worst_write * 1e3,
+        }
+
+    def shutdown(self):
+        """Termina o salvamento em andamento, encerra a thread e registra as métricas."""
+        self.wait()
+        self.executor.shutdown(wait=True)
+        logger.info("Salvamento automático: %s", self.metrics())
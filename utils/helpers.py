@@ -1,5 +1,8 @@
 import random
 import math
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class Helpers:
     @staticmethod
@@ -11,7 +14,7 @@ class Helpers:
         x = random.uniform(min_value, max_value)
         y = random.uniform(min_value, max_value)
         z = random.uniform(min_value, max_value)
-        print(f"Gerando posição aleatória: {x}, {y}, {z}")
+        logger.debug("Gerando posição aleatória: %s, %s, %s", x, y, z)
         return [x, y, z]
 
     @staticmethod
@@ -21,7 +24,7 @@ class Helpers:
         Isso é útil para limitar coordenadas ou forças aplicadas a objetos.
         """
         limited_value = max(min(value, max_value), min_value)
-        print(f"Limitando valor {value} para o intervalo [{min_value}, {max_value}]: {limited_value}")
+        logger.debug("Limitando valor %s para o intervalo [%s, %s]: %s", value, min_value, max_value, limited_value)
         return limited_value
 
     @staticmethod
@@ -32,10 +35,10 @@ class Helpers:
         """
         magnitude = math.sqrt(sum(comp ** 2 for comp in vector))
         if magnitude == 0:
-            print(f"Vetor de magnitude zero detectado: {vector}")
+            logger.debug("Vetor de magnitude zero detectado: %s", tuple(vector))
             return vector
         normalized_vector = [comp / magnitude for comp in vector]
-        print(f"Normalizando vetor {vector}: {normalized_vector}")
+        logger.debug("Normalizando vetor %s: %s", tuple(vector), tuple(normalized_vector))
         return normalized_vector
 
     @staticmethod
@@ -45,7 +48,7 @@ class Helpers:
         Útil para evitar erros de ponto flutuante ao trabalhar com grandes coordenadas espaciais.
         """
         rounded = [round(coord, precision) for coord in coordinates]
-        print(f"Coordenadas arredondadas de {coordinates} para {rounded} com precisão {precision}")
+        logger.debug("Coordenadas arredondadas de %s para %s com precisão %s", tuple(coordinates), tuple(rounded), precision)
         return rounded
 
     @staticmethod
@@ -59,7 +62,7 @@ class Helpers:
             (coord1[1] - coord2[1]) ** 2 +
             (coord1[2] - coord2[2]) ** 2
         )
-        print(f"Distância entre {coord1} e {coord2}: {distance}")
+        logger.debug("Distância entre %s e %s: %s", tuple(coord1), tuple(coord2), distance)
         return distance
 
     @staticmethod
@@ -73,5 +76,5 @@ class Helpers:
         x = radius * math.sin(phi) * math.cos(theta)
         y = radius * math.sin(phi) * math.sin(theta)
         z = radius * math.cos(phi)
-        print(f"Gerando posição esférica aleatória com raio {radius}: {x}, {y}, {z}")
+        logger.debug("Gerando posição esférica aleatória com raio %s: %s, %s, %s", radius, x, y, z)
         return [x, y, z]
@@ -1,82 +1,229 @@
+import atexit
 import json
-from pathlib import Path
 import logging
+import logging.handlers
+import queue
+import time
+from pathlib import Path
+
+from utils import save_format
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+_listener = None  # QueueListener ativo (o logging só é configurado uma vez)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que não formata a mensagem na thread que registrou o log.
+    A formatação e a escrita ficam a cargo da thread do QueueListener, então os
+    argumentos passados ao logger devem ser imutáveis (números, strings, tuplas).
+    """
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=logging.INFO, log_file='game_logger.log', error_file='errorlog.txt', console_level=None):
+    """
+    Configura o logging do jogo uma única vez. Os handlers de arquivo (e, opcionalmente, o
+    console) ficam atrás de uma fila atendida por uma thread própria, então o loop de
+    quadros só enfileira o registro, sem formatar nem escrever em disco.
+    :param level: Nível mínimo para o arquivo de log do jogo
+    :param log_file: Arquivo de log geral (None para desativar)
+    :param error_file: Arquivo que recebe apenas erros (None para desativar)
+    :param console_level: Nível mínimo para exibir no console (None para não exibir)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    if log_file is not None:
+        handler = logging.FileHandler(log_file, encoding='utf-8')
+        handler.setLevel(level)
+        handlers.append(handler)
+    if error_file is not None:
+        handler = logging.FileHandler(error_file, encoding='utf-8')
+        handler.setLevel(logging.ERROR)
+        handlers.append(handler)
+    if console_level is not None:
+        handler = logging.StreamHandler()
+        handler.setLevel(console_level)
+        handlers.append(handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    levels = [handler.level for handler in handlers] or [logging.WARNING]
+    root = logging.getLogger()
+    root.setLevel(min(levels))
+    log_queue = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Esvazia a fila de logs e encerra a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name):
+    """Retorna o logger de um módulo (use get_logger(__name__))."""
+    return logging.getLogger(name)
+
+
+class RateLimitedLogger:
+    """
+    Envolve um logger para mensagens emitidas a cada quadro: cada chave passa no máximo
+    uma vez a cada interval segundos, e a próxima mensagem informa quantas foram omitidas.
+    Quando o nível está desativado, o custo é apenas uma verificação de isEnabledFor.
+    """
+    def __init__(self, logger, interval=1.0):
+        self.logger = logger
+        self.interval = interval
+        self.last_emitted = {}  # chave -> instante da última mensagem emitida
+        self.suppressed = {}    # chave -> mensagens omitidas desde então
+
+    def log(self, level, key, msg, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if now - self.last_emitted.get(key, float('-inf')) < self.interval:
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return
+        self.last_emitted[key] = now
+        suppressed = self.suppressed.pop(key, 0)
+        if suppressed:
+            msg = f"{msg} (+{suppressed} omitidas)"
+        self.logger.log(level, msg, *args)
+
+    def debug(self, key, msg, *args):
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def info(self, key, msg, *args):
+        self.log(logging.INFO, key, msg, *args)
+
+
+logger = get_logger(__name__)
+
 
 class GameLogger:
-    def __init__(self, save_file="game_progress.json"):
+    """
+    Salva e carrega o progresso no formato binário (utils.save_format), incluindo o universo.
+    Cada salvamento substitui o arquivo de forma atômica e mantém `backups` cópias anteriores;
+    salvamentos antigos em JSON continuam sendo lidos.
+    """
+    def __init__(self, save_file="game_progress.ess", backups=3):
         self.save_file = Path(save_file)
-        logging.basicConfig(
-            filename='game_logger.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        self.backups = backups  # Cópias anteriores mantidas (game_progress.ess.1, .2, ...)
+
+    def save_path(self, save_name=None):
+        """Caminho do arquivo de salvamento (o padrão ou um salvamento nomeado)."""
+        return self.save_file if save_name is None else Path(f"{save_name}.ess")
+
+    @staticmethod
+    def legacy_path(save_path):
+        """Caminho do salvamento em JSON usado pelas versões anteriores."""
+        return save_path.with_suffix(".json")
 
-    def save_progress(self, player_name, spaceship, distance_traveled, play_time, save_name=None):
+    @staticmethod
+    def snapshot_progress(player_name, spaceship, distance_traveled, play_time, space=None):
         """
-        Salva o progresso do jogo em um arquivo JSON.
-        :param player_name: Nome do jogador
-        :param spaceship: Objeto da nave contendo posição, velocidade, etc.
-        :param distance_traveled: Distância total percorrida
-        :param play_time: Tempo total de jogo
-        :param save_name: Nome do arquivo de salvamento (opcional)
+        Copia o estado a salvar, para que ele possa ser gravado por outra thread enquanto o jogo continua.
+        :return: (progresso, WorldState ou None)
         """
-        if save_name is None:
-            save_path = self.save_file
-        else:
-            save_path = Path(f"{save_name}.json")
-
         data = {
             "player_name": player_name,
             "spaceship": spaceship.to_dict(),
             "distance_traveled": distance_traveled,
             "play_time": play_time
         }
+        world = space.save_world_state(copy=True) if space is not None else None
+        return data, world
 
+    def write_progress(self, save_path, data, world):
+        """Grava um estado já copiado por snapshot_progress. Pode ser chamado de qualquer thread."""
         try:
-            with save_path.open("w") as f:
-                json.dump(data, f, indent=4)
-            logging.info(f"Progresso do jogo salvo com sucesso em {save_path}.")
+            save_format.write_save_atomic(save_path, data, world, self.backups)
+            logger.info(f"Progresso do jogo salvo com sucesso em {save_path}.")
+            return True
         except Exception as e:
-            logging.error(f"Falha ao salvar o progresso do jogo em {save_path}: {e}")
+            logger.error(f"Falha ao salvar o progresso do jogo em {save_path}: {e}")
+            return False
+
+    def save_progress(self, player_name, spaceship, distance_traveled, play_time, save_name=None, space=None):
+        """
+        Salva o progresso do jogo no formato binário.
+        :param player_name: Nome do jogador
+        :param spaceship: Objeto da nave contendo posição, velocidade, etc.
+        :param distance_traveled: Distância total percorrida
+        :param play_time: Tempo total de jogo
+        :param save_name: Nome do arquivo de salvamento (opcional)
+        :param space: Universo a ser salvo junto (setores carregados e objetos alterados) (opcional)
+        """
+        data, world = self.snapshot_progress(player_name, spaceship, distance_traveled, play_time, space)
+        return self.write_progress(self.save_path(save_name), data, world)
+
+    @staticmethod
+    def read_progress(save_path):
+        """Lê um arquivo de salvamento, binário ou JSON antigo."""
+        if save_format.is_save_file(save_path):
+            with save_format.SaveReader(save_path) as reader:
+                data = reader.progress
+                if reader.has_world:
+                    data["world"] = reader.read_world()
+            return data
+        with save_path.open("r") as f:
+            return json.load(f)  # Formato antigo
 
     def load_progress(self, save_name=None):
         """
-        Carrega o progresso do jogo de um arquivo JSON.
+        Carrega o progresso do jogo do arquivo binário; se ele estiver ausente ou corrompido, tenta as
+        cópias anteriores, da mais recente à mais antiga, e só então o JSON antigo (que é anterior a todas).
         :param save_name: Nome do arquivo de salvamento (opcional)
-        :return: Dicionário contendo o progresso do jogo, ou None se o arquivo não existir.
+        :return: Dicionário contendo o progresso do jogo (com o universo em "world", se salvo),
+                 ou None se nenhum arquivo puder ser lido.
         """
-        if save_name is None:
-            save_path = self.save_file
-        else:
-            save_path = Path(f"{save_name}.json")
+        save_path = self.save_path(save_name)
+        candidates = [save_path]
+        candidates += [save_format.backup_path(save_path, number) for number in range(1, self.backups + 1)]
+        candidates.append(self.legacy_path(save_path))
 
-        if save_path.exists():
+        for path in candidates:
+            if not path.exists():
+                continue
             try:
-                with save_path.open("r") as f:
-                    data = json.load(f)
-                logging.info(f"Progresso do jogo carregado com sucesso de {save_path}.")
+                data = self.read_progress(path)
+                logger.info(f"Progresso do jogo carregado com sucesso de {path}.")
                 return data
             except Exception as e:
-                logging.error(f"Falha ao carregar o progresso do jogo de {save_path}: {e}")
-        else:
-            logging.warning(f"Arquivo de progresso {save_path} não encontrado.")
+                logger.error(f"Falha ao carregar o progresso do jogo de {path}: {e}")
+        logger.warning(f"Arquivo de progresso {save_path} não encontrado.")
         return None
 
     def reset_progress(self, save_name=None):
         """
-        Reseta o progresso do jogo apagando o arquivo de salvamento.
+        Reseta o progresso do jogo apagando o arquivo de salvamento, suas cópias e o JSON antigo, se houver.
         :param save_name: Nome do arquivo de salvamento (opcional)
         """
-        if save_name is None:
-            save_path = self.save_file
-        else:
-            save_path = Path(f"{save_name}.json")
+        save_path = self.save_path(save_name)
 
         try:
-            if save_path.exists():
-                save_path.unlink()  # Remove o arquivo
-                logging.info(f"Progresso do jogo resetado com sucesso em {save_path}.")
+            removed = False
+            backups = [save_format.backup_path(save_path, number) for number in range(1, self.backups + 1)]
+            for path in (save_path, self.legacy_path(save_path), *backups):
+                if path.exists():
+                    path.unlink()  # Remove o arquivo
+                    removed = True
+            if removed:
+                logger.info(f"Progresso do jogo resetado com sucesso em {save_path}.")
             else:
-                logging.info(f"Nenhum arquivo de progresso encontrado para resetar em {save_path}.")
+                logger.info(f"Nenhum arquivo de progresso encontrado para resetar em {save_path}.")
         except Exception as e:
-            logging.error(f"Falha ao resetar o progresso do jogo em {save_path}: {e}")
+            logger.error(f"Falha ao resetar o progresso do jogo em {save_path}: {e}")
@@ -0,0 +1,95 @@
+import csv
+import time
+from array import array
+
+
+class FrameProfiler:
+    """
+    Mede quanto tempo cada fase do quadro consome (eventos, física, renderização, flip).
+    As durações, em nanossegundos, ficam num buffer circular de tamanho fixo por fase,
+    sem alocar memória a cada quadro. Desativado, cada chamada só testa self.enabled.
+    """
+    PHASES = ('events', 'space_update', 'spaceship_update', 'render', 'flip')
+
+    def __init__(self, phases=PHASES, capacity=600, enabled=False, total='frame'):
+        """
+        :param phases: Fases medidas, na ordem em que acontecem
+        :param total: Nome do intervalo inteiro entre begin_frame e end_frame (ex.: 'tick' na thread de simulação)
+        """
+        self.phases = tuple(phases)
+        self.total = total
+        self.capacity = capacity  # Quantidade de quadros mantidos no buffer circular
+        self.enabled = enabled
+        self.buffers = {phase: array('q', [0]) * capacity for phase in self.phases}
+        self.frame_totals = array('q', [0]) * capacity
+        self.frame_index = 0    # Posição do quadro atual no buffer
+        self.frames = 0         # Quadros registrados (limitado à capacidade)
+        self.frame_start = 0
+        self.last_mark = 0
+
+    def begin_frame(self):
+        """Marca o início de um quadro."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.frame_start = now
+        self.last_mark = now
+        for buffer in self.buffers.values():
+            buffer[self.frame_index] = 0
+
+    def mark(self, phase):
+        """Atribui à fase o tempo decorrido desde a marca anterior (acumula se a fase se repetir no quadro)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.buffers[phase][self.frame_index] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        """Fecha o quadro atual e avança no buffer circular."""
+        if not self.enabled:
+            return
+        self.frame_totals[self.frame_index] = time.perf_counter_ns() - self.frame_start
+        self.frame_index = (self.frame_index + 1) % self.capacity
+        self.frames = min(self.frames + 1, self.capacity)
+
+    def recorded(self, buffer):
+        """Retorna as amostras válidas de um buffer, do quadro mais antigo ao mais recente."""
+        if self.frames < self.capacity:
+            return buffer[:self.frames]
+        return buffer[self.frame_index:] + buffer[:self.frame_index]
+
+    @staticmethod
+    def percentile(sorted_values, fraction):
+        """Percentil pelo método do vizinho mais próximo sobre valores já ordenados."""
+        if not sorted_values:
+            return 0
+        index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def stats(self):
+        """Retorna {fase: (p50, p95, p99)} em milissegundos, incluindo o quadro inteiro (self.total)."""
+        buffers = dict(self.buffers)
+        buffers[self.total] = self.frame_totals
+        result = {}
+        for phase, buffer in buffers.items():
+            values = sorted(self.recorded(buffer))
+            result[phase] = tuple(self.percentile(values, q) / 1e6 for q in (0.50, 0.95, 0.99))
+        return result
+
+    def overlay_lines(self):
+        """Linhas de texto para o HUD com p50/p95/p99 de cada fase."""
+        lines = ["Fase  p50 / p95 / p99 (ms)"]
+        for phase, (p50, p95, p99) in self.stats().items():
+            lines.append(f"{phase}: {p50:.2f} / {p95:.2f} / {p99:.2f}")
+        return lines
+
+    def dump_csv(self, path):
+        """Grava uma linha por quadro registrado com a duração (ns) de cada fase."""
+        columns = [self.recorded(self.buffers[phase]) for phase in self.phases]
+        totals = self.recorded(self.frame_totals)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([self.total, *self.phases, f"{self.total}_total"])
+            for frame in range(len(totals)):
+                writer.writerow([frame, *(column[frame] for column in columns), totals[frame]])
@@ -0,0 +1,305 @@
+"""
+Formato binário de salvamento do jogo (.ess).
+
+    [cabeçalho][progresso do jogador][bloco do setor 0]...[bloco do setor N-1][índice de setores]
+
+O cabeçalho guarda versão, semente, quantidade de setores e onde começa o índice. Cada bloco
+de setor tem um registro de tamanho fixo por objeto (OBJECT_DTYPE) seguido dos nomes em UTF-8,
+e o índice (TOC_DTYPE) diz onde está o bloco de cada setor. Assim o SaveReader abre o arquivo
+com mmap e lê apenas os setores pedidos, sem interpretar o resto do arquivo.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'ESSW'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHqIIQ')       # magic, versão, flags, semente, setores, tamanho do progresso, início do índice
+PROGRESS = struct.Struct('<3d3ddddI')     # posição, velocidade, rotação, distância, tempo de jogo, tamanho do nome
+
+HAS_WORLD = 1  # Flag do cabeçalho: o arquivo contém o universo, não só o progresso
+
+SECTOR_FULL = 0     # Setor completo: todos os objetos, na ordem do setor
+SECTOR_PARTIAL = 1  # Apenas os objetos alterados pelo jogador; o restante é regenerado pela semente
+
+OBJECT_DTYPE = np.dtype([
+    ('index', '<u4'),           # Posição do objeto dentro do setor
+    ('position', '<f8', (3,)),
+    ('velocity', '<f8', (3,)),
+    ('mass', '<f8'),
+    ('size', '<f8'),
+    ('type_code', 'i1'),
+    ('has_water', '?'),
+    ('name_length', '<i4'),     # Bytes do nome em UTF-8 (-1 para objetos sem nome)
+])
+
+TOC_DTYPE = np.dtype([
+    ('coords', '<i8', (3,)),
+    ('flags', 'u1'),
+    ('count', '<u4'),           # Quantidade de objetos
+    ('offset', '<u8'),          # Início do bloco do setor no arquivo
+    ('length', '<u8'),          # Tamanho do bloco (registros + nomes)
+])
+
+
+class SaveFormatError(ValueError):
+    """Arquivo que não é um salvamento .ess válido ou de uma versão desconhecida."""
+
+
+class WorldState:
+    """
+    Universo salvo: a semente e uma lista de setores em colunas.
+    Cada setor é (coords, flags, colunas); as colunas usam os mesmos nomes dos argumentos de
+    Sector (positions, velocities, masses, sizes, type_codes, has_water, names) mais indices.
+    Os setores completos que já estão empacotados (no armazenamento em disco) podem vir em
+    packed, um objeto com len(), blocks() -> (coords, quantidade, bloco) e close(), gravados como estão.
+    """
+    def __init__(self, seed, sectors=None, packed=None):
+        self.seed = seed
+        self.sectors = sectors if sectors is not None else []
+        self.packed = packed
+
+
+def pack_sector(columns):
+    """Empacota as colunas de um setor em registros de tamanho fixo seguidos dos nomes."""
+    count = len(columns['masses'])
+    records = np.zeros(count, dtype=OBJECT_DTYPE)
+    records['index'] = columns.get('indices', np.arange(count))
+    records['position'] = np.asarray(columns['positions'], dtype=np.float64).reshape(-1, 3)
+    records['velocity'] = np.asarray(columns['velocities'], dtype=np.float64).reshape(-1, 3)
+    records['mass'] = columns['masses']
+    records['size'] = columns['sizes']
+    records['type_code'] = columns['type_codes']
+    records['has_water'] = columns['has_water']
+    encoded = [name.encode('utf-8') if name is not None else None for name in columns['names']]
+    records['name_length'] = [len(name) if name is not None else -1 for name in encoded]
+    return records.tobytes() + b''.join(name for name in encoded if name)
+
+
+def unpack_sector(buffer, count):
+    """Lê um bloco de setor (registros + nomes) e devolve as colunas como arrays próprios."""
+    records = np.frombuffer(buffer, dtype=OBJECT_DTYPE, count=count).copy()
+    names = []
+    position = count * OBJECT_DTYPE.itemsize
+    for length in records['name_length'].tolist():
+        if length < 0:
+            names.append(None)
+        else:
+            names.append(bytes(buffer[position:position + length]).decode('utf-8'))
+            position += length
+    return {
+        'indices': records['index'].astype(np.int64),
+        'positions': records['position'],
+        'velocities': records['velocity'],
+        'masses': records['mass'],
+        'sizes': records['size'],
+        'type_codes': records['type_code'],
+        'has_water': records['has_water'],
+        'names': names,
+    }
+
+
+def write_save(path, progress, world):
+    """
+    Grava o progresso do jogador e o universo no formato binário.
+    :param path: Caminho do arquivo
+    :param progress: Dicionário com player_name, spaceship (position, velocity, rotation_angle),
+                     distance_traveled e play_time
+    :param world: WorldState com a semente e os setores (ou None para salvar só o progresso)
+    """
+    spaceship = progress.get('spaceship', {})
+    name = progress.get('player_name', '').encode('utf-8')
+    progress_bytes = PROGRESS.pack(
+        *spaceship.get('position', (0.0, 0.0, 0.0)),
+        *spaceship.get('velocity', (0.0, 0.0, 0.0)),
+        spaceship.get('rotation_angle', 0.0),
+        progress.get('distance_traveled', 0.0),
+        progress.get('play_time', 0.0),
+        len(name)
+    ) + name
+    sectors = world.sectors if world is not None else []
+    packed = world.packed if world is not None else None
+    seed = world.seed if world is not None else 0
+
+    def blocks():
+        for coords, flags, columns in sectors:
+            yield coords, flags, len(columns['masses']), pack_sector(columns)
+        if packed is not None:
+            for coords, count, block in packed.blocks():
+                yield coords, SECTOR_FULL, count, block
+
+    try:
+        toc = np.zeros(len(sectors) + (len(packed) if packed is not None else 0), dtype=TOC_DTYPE)
+        with open(path, 'wb') as f:
+            f.write(bytes(HEADER.size))  # Reservado; o cabeçalho é escrito no fim, já com o índice
+            f.write(progress_bytes)
+            offset = HEADER.size + len(progress_bytes)
+            for entry, (coords, flags, count, block) in zip(toc, blocks()):
+                entry['coords'] = coords
+                entry['flags'] = flags
+                entry['count'] = count
+                entry['offset'] = offset
+                entry['length'] = len(block)
+                f.write(block)
+                offset += len(block)
+            f.write(toc.tobytes())
+            f.seek(0)
+            flags = HAS_WORLD if world is not None else 0
+            f.write(HEADER.pack(MAGIC, VERSION, flags, seed, len(toc), len(progress_bytes), offset))
+            f.flush()
+            os.fsync(f.fileno())  # Garante que os dados estão no disco antes de o arquivo ser usado
+    finally:
+        if packed is not None:
+            packed.close()
+
+
+def backup_path(path, number):
+    """Caminho da cópia de segurança número `number` (1 é a mais recente)."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.{number}")
+
+
+def write_save_atomic(path, progress, world, backups=0):
+    """
+    Grava o salvamento num arquivo temporário e só então o coloca no lugar com os.replace,
+    então uma falha no meio da escrita nunca deixa um salvamento pela metade. O salvamento
+    anterior vira a cópia .1, a .1 vira .2 e assim por diante, até `backups` cópias.
+    O temporário tem nome único (dois salvamentos ao mesmo tempo não se sobrescrevem) e o
+    diretório é sincronizado depois das trocas de nome, para que elas sobrevivam a uma queda.
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+        temp_path = Path(f.name)
+    try:
+        write_save(temp_path, progress, world)
+        if backups > 0 and path.exists():
+            for number in range(backups - 1, 0, -1):
+                if backup_path(path, number).exists():
+                    os.replace(backup_path(path, number), backup_path(path, number + 1))
+            os.replace(path, backup_path(path, 1))
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    fsync_directory(path.parent)
+
+
+def fsync_directory(directory):
+    """Grava no disco as entradas do diretório (criações e trocas de nome), onde o sistema permitir."""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Ex.: Windows, onde diretórios não podem ser abertos assim
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+class SaveReader:
+    """
+    Lê um salvamento .ess através de mmap. O cabeçalho, o progresso e o índice de setores
+    são lidos ao abrir; os blocos de setor só são lidos quando pedidos.
+
+        with SaveReader(path) as reader:
+            columns = reader.read_sector((0, 0, 0))
+    """
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise SaveFormatError(f"Arquivo de salvamento vazio: {path}") from None
+        try:
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_header(self):
+        if len(self.buffer) < HEADER.size:
+            raise SaveFormatError("Arquivo de salvamento truncado")
+        magic, version, flags, self.seed, sector_count, progress_length, toc_offset = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise SaveFormatError("Arquivo não é um salvamento do ESS")
+        if version > VERSION:
+            raise SaveFormatError(f"Versão de salvamento {version} não suportada (máximo: {VERSION})")
+        self.version = version
+        self.has_world = bool(flags & HAS_WORLD)
+
+        values = PROGRESS.unpack_from(self.buffer, HEADER.size)
+        name_start = HEADER.size + PROGRESS.size
+        self.progress = {
+            'player_name': self.buffer[name_start:name_start + values[9]].decode('utf-8'),
+            'spaceship': {
+                'position': list(values[0:3]),
+                'velocity': list(values[3:6]),
+                'rotation_angle': values[6],
+            },
+            'distance_traveled': values[7],
+            'play_time': values[8],
+        }
+        if toc_offset + sector_count * TOC_DTYPE.itemsize > len(self.buffer):
+            raise SaveFormatError("Índice de setores fora do arquivo")
+        self.toc = np.frombuffer(self.buffer, dtype=TOC_DTYPE, count=sector_count, offset=toc_offset).copy()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.toc)
+
+    def sector_coords(self):
+        """Coordenadas de todos os setores salvos, na ordem do arquivo."""
+        return [tuple(coords) for coords in self.toc['coords'].tolist()]
+
+    def read_sector(self, coords):
+        """
+        Lê um único setor.
+        :return: (flags, colunas), ou None se o setor não está no salvamento
+        """
+        rows = np.flatnonzero((self.toc['coords'] == coords).all(axis=1))
+        if not len(rows):
+            return None
+        return self._read_row(rows[0])
+
+    def _read_row(self, row):
+        entry = self.toc[row]
+        start = int(entry['offset'])
+        block = memoryview(self.buffer)[start:start + int(entry['length'])]
+        try:
+            return int(entry['flags']), unpack_sector(block, int(entry['count']))
+        finally:
+            block.release()  # O mmap só pode ser fechado sem visões abertas
+
+    def read_world(self):
+        """Lê todos os setores como um WorldState."""
+        sectors = []
+        for row, coords in enumerate(self.sector_coords()):
+            flags, columns = self._read_row(row)
+            sectors.append((coords, flags, columns))
+        return WorldState(self.seed, sectors)
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+
+def is_save_file(path):
+    """Indica se o arquivo começa com a assinatura do formato binário."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
@@ -0,0 +1,197 @@
+from collections import Counter
+
+import OpenGL.GL
+import OpenGL.GLU
+from OpenGL.GL import GL_NO_ERROR, GL_TRUE
+
+
+class OpenGLBackend:
+    """
+    Backend de desenho do Renderer: repassa cada chamada gl*/glu* ao PyOpenGL.
+    Os componentes do renderizador (malhas, instâncias, luzes, textos, estrelas) chamam o OpenGL
+    por ele, na forma gl.glEnable(GL_LIGHTING), e não pelas funções importadas; assim o mesmo
+    código desenha num contexto de verdade ou no RecordingBackend, sem janela.
+    Precisa de um contexto OpenGL ativo.
+    """
+    def __getattr__(self, name):
+        # Só é chamado no primeiro acesso a cada função: ela fica guardada na instância
+        if not name.startswith('gl'):
+            raise AttributeError(name)
+        for module in (OpenGL.GL, OpenGL.GLU):
+            function = getattr(module, name, None)
+            if function is not None:
+                setattr(self, name, function)
+                return function
+        raise AttributeError(name)
+
+    def begin_frame(self):
+        """Início de um quadro do Renderer (nada a fazer no OpenGL)."""
+
+    def end_frame(self):
+        """Fim de um quadro do Renderer (nada a fazer no OpenGL)."""
+
+
+class RecordingBackend:
+    """
+    Backend sem OpenGL: cada chamada gl*/glu* só é contada e classificada (desenho, mudança de
+    estado, vértices enviados, envio de texturas e buffers), por quadro. Não precisa de janela
+    nem de contexto, então mede o custo do lado do Python do Renderer.render e serve para
+    detectar regressões no número de chamadas de desenho.
+    As funções que criam objetos devolvem identificadores novos e as consultas de status devolvem
+    sucesso, como um driver que aceita tudo.
+    """
+    # Chamadas que efetivamente enviam geometria para desenho
+    DRAW_CALLS = {
+        'glBegin', 'glCallList', 'glCallLists', 'gluSphere', 'glDrawArrays', 'glDrawElements',
+        'glDrawArraysInstanced', 'glDrawElementsInstanced', 'glMultiDrawArrays',
+    }
+    # Chamadas que mudam o estado do pipeline (ligações, modos, luzes, programas e uniforms)
+    STATE_CALLS = {
+        'glEnable', 'glDisable', 'glEnableClientState', 'glDisableClientState', 'glEnableVertexAttribArray',
+        'glBindBuffer', 'glBindTexture', 'glBindVertexArray', 'glUseProgram', 'glUniform1i', 'glUniform1f',
+        'glBlendFunc', 'glDepthMask', 'glPointSize', 'glLightfv', 'glColorMaterial', 'glClearColor',
+        'glVertexPointer', 'glColorPointer', 'glTexCoordPointer', 'glVertexAttribPointer', 'glTexParameteri',
+    }
+    TEXTURE_UPLOADS = {'glTexImage2D', 'glTexSubImage2D'}
+    # Chamadas cujo valor de retorno é usado (além das glGen*, glCreate* e gluNew*)
+    RESULT_CALLS = {'glNewList', 'glEndList', 'glGetError', 'glGetShaderiv', 'glGetProgramiv', 'glGetUniformLocation'}
+    BUFFER_UPLOADS = {'glBufferData', 'glBufferSubData'}
+    # Totais de cada registro (ver take)
+    COUNTERS = ('calls', 'draw_calls', 'state_changes', 'vertices', 'texture_uploads', 'buffer_uploads',
+                'upload_bytes')
+
+    def __init__(self):
+        self.counts = Counter()      # Totais desde o último take()
+        self.by_name = Counter()     # Chamadas por função desde o último take()
+        self.list_vertices = {}      # Display list -> vértices gravados nela
+        self.compiling = None        # Display list em gravação (glNewList .. glEndList)
+        self.next_id = 0
+        self.frames = 0              # Quadros terminados
+        self.last_frame = self.empty_record()
+        self.frame_totals = self.empty_record()  # Soma de todos os quadros
+        self.outside = self.empty_record()       # Chamadas fora dos quadros (inicialização, liberação)
+
+    def __getattr__(self, name):
+        # Só é chamado no primeiro acesso a cada função: o registrador fica guardado na instância
+        if not name.startswith('gl'):
+            raise AttributeError(name)
+        recorder = self.recorder(name)
+        setattr(self, name, recorder)
+        return recorder
+
+    def recorder(self, name):
+        """Função que registra as chamadas a name e devolve o que o PyOpenGL devolveria."""
+        # Classificação feita uma vez por função, para o registro custar pouco a cada chamada
+        draw, state = name in self.DRAW_CALLS, name in self.STATE_CALLS
+        upload = ('texture_uploads' if name in self.TEXTURE_UPLOADS else
+                  'buffer_uploads' if name in self.BUFFER_UPLOADS else None)
+        sends_vertices = draw or (name.startswith('glVertex') and name[-2:] not in ('iv', 'fv', 'dv', 'sv'))
+        has_result = name in self.RESULT_CALLS or name.startswith(('glGen', 'glCreate', 'gluNew'))
+
+        def call(*args):
+            counts = self.counts  # Lido a cada chamada: take() troca os contadores
+            counts['calls'] += 1
+            self.by_name[name] += 1
+            if sends_vertices:
+                vertices = self.vertex_count(name, args)
+                if self.compiling is not None:
+                    # Dentro de uma display list nada é desenhado: os vértices contam quando ela for chamada
+                    self.list_vertices[self.compiling] += vertices
+                else:
+                    counts['draw_calls'] += draw
+                    counts['vertices'] += vertices
+            if state:
+                counts['state_changes'] += 1
+            if upload:
+                counts[upload] += 1
+                counts['upload_bytes'] += self.upload_size(name, args)
+            return self.result(name, args) if has_result else None
+        return call
+
+    def vertex_count(self, name, args):
+        """Vértices enviados por uma chamada (0 para as que não desenham)."""
+        if name == 'glDrawArrays':
+            return args[2]
+        if name == 'glDrawElements':
+            return args[1]
+        if name == 'glDrawArraysInstanced':
+            return args[2] * args[3]
+        if name == 'glDrawElementsInstanced':
+            return args[1] * args[4]
+        if name == 'gluSphere':
+            slices, stacks = args[2], args[3]
+            return 2 * (slices + 1) * stacks  # Uma faixa de quadriláteros por pilha
+        if name == 'glCallList':
+            return self.list_vertices.get(args[0], 0)
+        return 1 if name.startswith('glVertex') else 0
+
+    @staticmethod
+    def upload_size(name, args):
+        """Bytes enviados por um glBufferData, glBufferSubData ou glTexImage2D/glTexSubImage2D."""
+        if name == 'glBufferData':
+            return int(args[1])
+        if name == 'glBufferSubData':
+            return int(args[2])
+        data = args[8]
+        return len(data) if isinstance(data, (bytes, bytearray)) else getattr(data, 'nbytes', 0)
+
+    def result(self, name, args):
+        """Valor devolvido pela chamada: identificadores novos, sucesso nas consultas, None no resto."""
+        if name == 'glNewList':
+            self.compiling = args[0]
+            self.list_vertices[args[0]] = 0
+        elif name == 'glEndList':
+            self.compiling = None
+        elif name == 'glGetError':
+            return GL_NO_ERROR
+        elif name in ('glGetShaderiv', 'glGetProgramiv'):
+            return GL_TRUE
+        elif name == 'glGenLists':
+            first = self.next_id + 1
+            self.next_id += args[0]
+            return first
+        elif name.startswith(('glGen', 'glCreate', 'gluNew', 'glGetUniformLocation')):
+            count = args[0] if name.startswith('glGen') else 1
+            ids = list(range(self.next_id + 1, self.next_id + count + 1))
+            self.next_id += count
+            return ids if count > 1 else ids[0]
+        return None
+
+    def empty_record(self):
+        record = dict.fromkeys(self.COUNTERS, 0)
+        record['by_name'] = Counter()
+        return record
+
+    def take(self):
+        """
+        Retorna o que foi registrado desde a última chamada e zera os contadores.
+        :return: dict com os totais de COUNTERS e 'by_name' (Counter de chamadas por função)
+        """
+        record = self.empty_record()
+        record.update(self.counts)
+        record['by_name'] = self.by_name
+        self.counts = Counter()
+        self.by_name = Counter()
+        return record
+
+    @staticmethod
+    def add(total, record):
+        """Soma um registro de take() a total."""
+        for key in RecordingBackend.COUNTERS:
+            total[key] += record[key]
+        total['by_name'].update(record['by_name'])
+
+    def begin_frame(self):
+        """Início de um quadro: o que foi chamado desde o último quadro entra em outside."""
+        self.add(self.outside, self.take())
+
+    def end_frame(self):
+        """Fim de um quadro: guarda o registro dele em last_frame e o soma a frame_totals."""
+        self.last_frame = self.take()
+        self.add(self.frame_totals, self.last_frame)
+        self.frames += 1
+
+    def reset_frames(self):
+        """Zera os totais dos quadros (ex.: para descartar os quadros de aquecimento)."""
+        self.frame_totals = self.empty_record()
+        self.frames = 0
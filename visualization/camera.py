@@ -1,6 +1,11 @@
 import math
 
 class Camera:
+    # Projeção em perspectiva (gluPerspective) e frustum usado para descartar objetos fora da tela
+    FOV = 75.0       # Campo de visão vertical, em graus
+    NEAR = 0.1       # Plano de recorte próximo
+    FAR = 600000.0   # Plano de recorte distante
+
     def __init__(self, position=None, look_at=None, up=None):
         """
         Inicializa a câmera com a posição, o vetor que define a direção (look_at) e o vetor 'up'.
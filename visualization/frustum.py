@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+
+# Níveis de detalhe, do mais ao menos detalhado. O nível é escolhido pelo raio aparente na tela
+# (raio / distância, convertido em pixels), ou seja, pela distância relativa ao tamanho do objeto.
+LOD_TIERS = ('high', 'medium', 'low', 'point')
+LOD_MIN_PIXELS = (24.0, 8.0, 1.5)  # Raio aparente mínimo (px) de high, medium e low; abaixo disso, ponto
+
+
+class Frustum:
+    """
+    Os seis planos do volume visível da câmera, extraídos da mesma matriz que o
+    gluLookAt e o gluPerspective montam (projeção × visão), em float64.
+    """
+    def __init__(self, position, look_at, up, fov, aspect, near, far):
+        self.position = np.asarray(position, dtype=np.float64)
+        self.fov = fov
+        matrix = self.perspective_matrix(fov, aspect, near, far) @ self.look_at_matrix(self.position, look_at, up)
+        # Gribb & Hartmann: cada plano é a soma ou diferença da última linha com uma das outras
+        planes = np.array([
+            matrix[3] + matrix[0], matrix[3] - matrix[0],  # Esquerda, direita
+            matrix[3] + matrix[1], matrix[3] - matrix[1],  # Baixo, cima
+            matrix[3] + matrix[2], matrix[3] - matrix[2],  # Perto, longe
+        ])
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        self.normals = planes[:, :3]  # Apontam para dentro do volume
+        self.offsets = planes[:, 3]
+
+    @classmethod
+    def from_camera(cls, camera, aspect):
+        """Frustum da câmera com o campo de visão e os planos de recorte definidos em Camera."""
+        return cls(camera.position, camera.look_at, camera.up, camera.FOV, aspect, camera.NEAR, camera.FAR)
+
+    @staticmethod
+    def look_at_matrix(eye, target, up):
+        """Matriz de visão equivalente ao gluLookAt."""
+        forward = np.asarray(target, dtype=np.float64) - eye
+        forward /= np.linalg.norm(forward)
+        side = np.cross(forward, np.asarray(up, dtype=np.float64))
+        side /= np.linalg.norm(side)
+        true_up = np.cross(side, forward)
+        matrix = np.identity(4)
+        matrix[0, :3], matrix[1, :3], matrix[2, :3] = side, true_up, -forward
+        matrix[:3, 3] = -matrix[:3, :3] @ eye
+        return matrix
+
+    @staticmethod
+    def perspective_matrix(fov, aspect, near, far):
+        """Matriz de projeção equivalente ao gluPerspective."""
+        f = 1.0 / math.tan(math.radians(fov) / 2)
+        matrix = np.zeros((4, 4))
+        matrix[0, 0] = f / aspect
+        matrix[1, 1] = f
+        matrix[2, 2] = (far + near) / (near - far)
+        matrix[2, 3] = 2 * far * near / (near - far)
+        matrix[3, 2] = -1.0
+        return matrix
+
+    def visible(self, centers, radii):
+        """Máscara das esferas (centros N×3, raios N) que tocam o volume visível."""
+        distances = centers @ self.normals.T + self.offsets
+        return (distances >= -np.asarray(radii)[:, None]).all(axis=1)
+
+    def lod_tiers(self, centers, radii, viewport_height):
+        """
+        Nível de detalhe de cada esfera, como índice em LOD_TIERS.
+        :param viewport_height: Altura da tela em pixels (converte o raio aparente em pixels)
+        """
+        distances = np.linalg.norm(centers - self.position, axis=1)
+        pixels_per_unit = viewport_height / 2 / math.tan(math.radians(self.fov) / 2)
+        pixels = np.asarray(radii) / np.maximum(distances, 1e-9) * pixels_per_unit
+        # Conta quantos limiares o raio aparente não alcança: 0 = high ... 3 = point
+        return (pixels[:, None] < np.array(LOD_MIN_PIXELS)).sum(axis=1)
@@ -0,0 +1,269 @@
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+from simulation.sector import Sector
+from visualization.backend import OpenGLBackend
+from visualization.frustum import LOD_TIERS
+from visualization.mesh_cache import MeshCache
+
+# Tesselação (fatias, pilhas) das esferas em cada nível de detalhe com malha (high, medium, low)
+SPHERE_TESSELLATION = ((20, 20), (12, 12), (8, 8))
+CORE_TESSELLATION = ((30, 30), (15, 15), (8, 8))  # Núcleos dos buracos negros
+
+# Perfil de compatibilidade: usa as matrizes e luzes do pipeline fixo (gluLookAt, glLightfv)
+VERTEX_SHADER = """
+#version 330 compatibility
+layout(location = 0) in vec3 vertex;    // Esfera unitária, ou (cos, t, sin) no disco de acreção
+layout(location = 1) in vec4 instance;  // xyz: posição do objeto, w: raio (externo, no disco)
+layout(location = 2) in vec4 material;  // rgb: cor, a: raio interno do disco
+uniform bool ring;
+uniform int light_count;                // Luzes ativas a partir de GL_LIGHT0
+out vec4 frag_color;
+
+void main() {
+    vec3 local;
+    vec3 normal;
+    if (ring) {
+        float radius = mix(material.a, instance.w, vertex.y);
+        local = vec3(vertex.x * radius, 0.0, vertex.z * radius);
+        normal = vec3(0.0, 1.0, 0.0);
+    } else {
+        local = vertex * instance.w;
+        normal = vertex;
+    }
+    vec4 eye = gl_ModelViewMatrix * vec4(instance.xyz + local, 1.0);
+    vec3 n = normalize(gl_NormalMatrix * normal);
+
+    // Mesma conta do pipeline fixo com GL_COLOR_MATERIAL (ambiente e difusa vêm da cor)
+    vec3 light = gl_LightModel.ambient.rgb;
+    for (int i = 0; i < light_count; ++i) {
+        vec4 position = gl_LightSource[i].position;
+        vec3 direction = normalize(position.xyz - eye.xyz * position.w);
+        light += gl_LightSource[i].ambient.rgb + gl_LightSource[i].diffuse.rgb * max(dot(n, direction), 0.0);
+    }
+    frag_color = vec4(clamp(material.rgb * light, 0.0, 1.0), 1.0);
+    gl_Position = gl_ProjectionMatrix * eye;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330 compatibility
+in vec4 frag_color;
+out vec4 color;
+
+void main() {
+    color = frag_color;
+}
+"""
+
+
+class InstanceBatch:
+    """Uma malha e o buffer com os dados de cada cópia (posição, raio, cor), desenhados numa só chamada."""
+    STRIDE = 8 * 4  # Oito floats por instância: x, y, z, raio, r, g, b, raio interno
+
+    def __init__(self, mesh, backend):
+        self.gl = gl = backend
+        vertices, indices = mesh
+        self.index_count = len(indices)
+        self.count = 0  # Instâncias no buffer
+        self.vao = gl.glGenVertexArrays(1)
+        self.mesh_buffer, self.index_buffer, self.instance_buffer = gl.glGenBuffers(3)
+
+        gl.glBindVertexArray(self.vao)
+        gl.glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)  # Fica registrado no VAO
+        gl.glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        gl.glBindBuffer(GL_ARRAY_BUFFER, self.mesh_buffer)
+        gl.glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        gl.glEnableVertexAttribArray(0)
+        gl.glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, None)
+
+        gl.glBindBuffer(GL_ARRAY_BUFFER, self.instance_buffer)
+        for location, offset in ((1, 0), (2, 16)):
+            gl.glEnableVertexAttribArray(location)
+            gl.glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, self.STRIDE, ctypes.c_void_p(offset))
+            gl.glVertexAttribDivisor(location, 1)  # Avança uma vez por instância, não por vértice
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def upload(self, instances):
+        """Substitui os dados das instâncias (array float32 N×8)."""
+        gl = self.gl
+        self.count = len(instances)
+        if self.count:
+            gl.glBindBuffer(GL_ARRAY_BUFFER, self.instance_buffer)
+            gl.glBufferData(GL_ARRAY_BUFFER, instances.nbytes, instances, GL_DYNAMIC_DRAW)
+            gl.glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        gl = self.gl
+        if self.count:
+            gl.glBindVertexArray(self.vao)
+            gl.glDrawElementsInstanced(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, None, self.count)
+
+    def release(self):
+        gl = self.gl
+        gl.glDeleteBuffers(3, [self.mesh_buffer, self.index_buffer, self.instance_buffer])
+        gl.glDeleteVertexArrays(1, [self.vao])
+
+
+class SceneInstances:
+    """
+    Dados de desenho dos objetos dos setores ativos, uma linha float32 por instância
+    (x, y, z, raio, r, g, b, raio interno), para os corpos, os núcleos dos buracos negros e os
+    discos de acreção. Só são refeitos quando os setores ativos mudam (setor instalado ou
+    removido, ou corpos movidos, que incrementam Sector.version); a cada quadro, select()
+    escolhe as linhas visíveis e o nível de detalhe de cada uma.
+    """
+    # Cor de cada tipo, na ordem de Sector.OBJECT_TYPES (o buraco negro fica com a cor do disco)
+    TYPE_COLORS = np.array([(0.6, 0.4, 0.2), (1.0, 1.0, 0.0), (1.0, 0.5, 0.0)], dtype=np.float32)
+    WATER_COLOR = (0.0, 0.5, 1.0)  # Planetas com água
+    RING_COLOR = (1.0, 0.5, 0.0)
+
+    def __init__(self):
+        self.signature = None  # Setores (e versões) usados para montar os dados atuais
+        self.version = 0       # Incrementada a cada reconstrução
+        self.centers = np.empty((0, 3))            # Posições em float64, usadas no descarte
+        self.black_hole_centers = np.empty((0, 3))
+        self.spheres = np.empty((0, 8), dtype=np.float32)
+        self.cores = np.empty((0, 8), dtype=np.float32)
+        self.rings = np.empty((0, 8), dtype=np.float32)
+
+    def update(self, space):
+        """Remonta os dados se os setores ativos mudaram desde o último quadro."""
+        signature = tuple((coords, id(sector), sector.version) for coords, sector in space.sectors.items())
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        self.version += 1
+
+        sectors = [sector for sector in space.sectors.values() if len(sector)]
+        if not sectors:
+            self.centers = self.black_hole_centers = np.empty((0, 3))
+            self.spheres = self.cores = self.rings = np.empty((0, 8), dtype=np.float32)
+            return True
+        positions = np.concatenate([sector.positions for sector in sectors])
+        sizes = np.concatenate([sector.sizes for sector in sectors])
+        type_codes = np.concatenate([sector.type_codes for sector in sectors])
+        has_water = np.concatenate([sector.has_water for sector in sectors])
+
+        spheres = np.empty((len(sizes), 8), dtype=np.float32)
+        spheres[:, :3] = positions
+        spheres[:, 3] = sizes / 100.0
+        spheres[:, 4:7] = self.TYPE_COLORS[type_codes]
+        spheres[has_water & (type_codes == Sector.TYPE_CODES['planet']), 4:7] = self.WATER_COLOR
+        spheres[:, 7] = 0.0
+
+        black_holes = type_codes == Sector.TYPE_CODES['black_hole']
+        cores = np.zeros((int(black_holes.sum()), 8), dtype=np.float32)
+        cores[:, :3] = positions[black_holes]
+        cores[:, 3] = sizes[black_holes] / 500.0  # Núcleo preto
+        rings = cores.copy()
+        rings[:, 3] = sizes[black_holes] + 500.0
+        rings[:, 4:7] = self.RING_COLOR
+        rings[:, 7] = sizes[black_holes]
+
+        self.centers, self.black_hole_centers = positions, positions[black_holes]
+        self.spheres, self.cores, self.rings = spheres, cores, rings
+        return True
+
+    def select(self, frustum, viewport_height):
+        """
+        Descarta o que está fora do frustum e separa o resto por nível de detalhe.
+        :return: (seleção, estatísticas). A seleção tem 'spheres' e 'cores' (uma lista de linhas por
+                 nível de malha, sem o nível de ponto), 'points' (corpos pequenos demais para uma malha)
+                 e 'rings'; as estatísticas contam objetos carregados, descartados e em cada nível.
+        """
+        point = LOD_TIERS.index('point')
+
+        visible = frustum.visible(self.centers, self.spheres[:, 3])
+        spheres = self.spheres[visible]
+        tiers = frustum.lod_tiers(self.centers[visible], spheres[:, 3], viewport_height)
+
+        # Núcleos e discos pequenos demais para uma malha não aparecem (o núcleo fica dentro do corpo)
+        core_visible = frustum.visible(self.black_hole_centers, self.cores[:, 3])
+        cores = self.cores[core_visible]
+        core_tiers = frustum.lod_tiers(self.black_hole_centers[core_visible], cores[:, 3], viewport_height)
+        ring_visible = frustum.visible(self.black_hole_centers, self.rings[:, 3])
+        rings = self.rings[ring_visible]
+        ring_tiers = frustum.lod_tiers(self.black_hole_centers[ring_visible], rings[:, 3], viewport_height)
+
+        selection = {
+            "spheres": [spheres[tiers == tier] for tier in range(point)],
+            "points": spheres[tiers == point],
+            "cores": [cores[core_tiers == tier] for tier in range(point)],
+            "rings": rings[ring_tiers < point],
+        }
+        stats = {"loaded": len(self.spheres), "culled": len(self.spheres) - len(spheres)}
+        stats.update({name: int((tiers == tier).sum()) for tier, name in enumerate(LOD_TIERS)})
+        return selection, stats
+
+
+class InstancedBatches:
+    """
+    Desenha os objetos celestes agrupados por malha, com uma chamada instanciada por grupo:
+    esferas dos corpos e núcleos dos buracos negros (um grupo por nível de detalhe) e discos de acreção.
+    Levanta RuntimeError (ou um erro do PyOpenGL) se o contexto não suporta shaders ou instâncias.
+    """
+    def __init__(self, backend=None):
+        """:param backend: Backend de desenho (padrão: OpenGLBackend)"""
+        self.gl = gl = backend if backend is not None else OpenGLBackend()
+        if not bool(gl.glDrawElementsInstanced) or not bool(gl.glVertexAttribDivisor):
+            raise RuntimeError("Contexto OpenGL sem desenho instanciado")
+        self.program = self.compile_program(VERTEX_SHADER, FRAGMENT_SHADER)
+        self.ring_location = gl.glGetUniformLocation(self.program, "ring")
+        self.light_count_location = gl.glGetUniformLocation(self.program, "light_count")
+        self.spheres = [InstanceBatch(MeshCache.sphere_mesh(*tessellation), gl) for tessellation in SPHERE_TESSELLATION]
+        self.cores = [InstanceBatch(MeshCache.sphere_mesh(*tessellation), gl) for tessellation in CORE_TESSELLATION]
+        self.rings = InstanceBatch(MeshCache.ring_mesh(36), gl)
+        self.uploads = 0
+
+    def compile_program(self, vertex_source, fragment_source):
+        """Compila e liga os shaders, levantando RuntimeError com o log do driver em caso de falha."""
+        gl = self.gl
+        shaders = []
+        for source, shader_type in ((vertex_source, GL_VERTEX_SHADER), (fragment_source, GL_FRAGMENT_SHADER)):
+            shader = gl.glCreateShader(shader_type)
+            gl.glShaderSource(shader, source)
+            gl.glCompileShader(shader)
+            if not gl.glGetShaderiv(shader, GL_COMPILE_STATUS):
+                raise RuntimeError(f"Falha ao compilar shader: {gl.glGetShaderInfoLog(shader)}")
+            shaders.append(shader)
+        program = gl.glCreateProgram()
+        for shader in shaders:
+            gl.glAttachShader(program, shader)
+        gl.glLinkProgram(program)
+        if not gl.glGetProgramiv(program, GL_LINK_STATUS):
+            raise RuntimeError(f"Falha ao ligar shaders: {gl.glGetProgramInfoLog(program)}")
+        for shader in shaders:
+            gl.glDeleteShader(shader)
+        return program
+
+    def upload(self, selection):
+        """Envia as linhas selecionadas (SceneInstances.select) para os buffers de instâncias."""
+        for batch, rows in zip(self.spheres, selection["spheres"]):
+            batch.upload(rows)
+        for batch, rows in zip(self.cores, selection["cores"]):
+            batch.upload(rows)
+        self.rings.upload(selection["rings"])
+        self.uploads += 1
+
+    def draw(self, light_count):
+        """Desenha todos os grupos com as luzes GL_LIGHT0 .. GL_LIGHT<light_count - 1>."""
+        gl = self.gl
+        gl.glUseProgram(self.program)
+        gl.glUniform1i(self.light_count_location, light_count)
+        gl.glUniform1i(self.ring_location, 0)
+        for batch in self.spheres + self.cores:
+            batch.draw()
+        gl.glUniform1i(self.ring_location, 1)
+        self.rings.draw()
+        gl.glBindVertexArray(0)
+        gl.glUseProgram(0)
+
+    def release(self):
+        """Apaga os buffers e o programa (o contexto OpenGL precisa continuar ativo)."""
+        for batch in self.spheres + self.cores + [self.rings]:
+            batch.release()
+        self.gl.glDeleteProgram(self.program)
@@ -0,0 +1,83 @@
+import numpy as np
+from OpenGL.GL import *
+
+from simulation.sector import Sector
+from visualization.backend import OpenGLBackend
+
+# GL_LIGHT0 é a luz da câmera; as estrelas usam as seguintes (o OpenGL garante ao menos oito)
+STAR_LIGHTS = (GL_LIGHT1, GL_LIGHT2, GL_LIGHT3, GL_LIGHT4, GL_LIGHT5, GL_LIGHT6, GL_LIGHT7)
+
+
+class LightManager:
+    """
+    Escolhe, uma vez por quadro, as estrelas que iluminam a cena e as liga a GL_LIGHT1..K.
+    As candidatas vêm da consulta espacial dos setores (Space.query_radius) em torno da câmera,
+    com raio crescente até achar K estrelas; a relevância é o brilho recebido, massa / distância².
+    As mudanças de estado por quadro ficam limitadas a K: a posição de cada luz ativa e as
+    luzes que passaram a sobrar ou faltar.
+    """
+    def __init__(self, max_lights=4, search_radius=100000.0, max_radius=600000.0, backend=None):
+        """
+        :param max_lights: Quantidade máxima de estrelas iluminando ao mesmo tempo (até 7)
+        :param search_radius: Raio inicial da busca; é multiplicado por 4 enquanto faltarem estrelas
+        :param max_radius: Raio máximo da busca (estrelas mais distantes não iluminam)
+        :param backend: Backend de desenho (padrão: OpenGLBackend)
+        """
+        self.gl = gl = backend if backend is not None else OpenGLBackend()
+        self.max_lights = min(max_lights, len(STAR_LIGHTS))
+        self.search_radius = search_radius
+        self.max_radius = max_radius
+        self.active = 0         # Luzes de estrela ligadas no momento
+        self.state_changes = 0  # Chamadas de estado de luz feitas no último quadro
+        for light in STAR_LIGHTS[:self.max_lights]:
+            gl.glLightfv(light, GL_DIFFUSE, [1.0, 1.0, 0.8, 1.0])
+            gl.glLightfv(light, GL_SPECULAR, [1.0, 1.0, 0.8, 1.0])
+
+    def select(self, space, position):
+        """
+        Retorna as posições (n×3, n <= max_lights) das estrelas mais relevantes para position,
+        da mais para a menos brilhante.
+        """
+        star = Sector.TYPE_CODES['star']
+        radius = self.search_radius
+        while True:
+            positions, scores = [], []
+            for sector, indices, distances in space.query_radius(position, radius):
+                stars = sector.type_codes[indices] == star
+                if stars.any():
+                    positions.append(sector.positions[indices[stars]])
+                    scores.append(sector.masses[indices[stars]] / np.maximum(distances[stars], 1.0) ** 2)
+            found = sum(len(score) for score in scores)
+            if found >= self.max_lights or radius >= self.max_radius:
+                break
+            radius = min(radius * 4, self.max_radius)
+        if not found:
+            return np.empty((0, 3))
+
+        positions = np.concatenate(positions)
+        scores = np.concatenate(scores)
+        if found > self.max_lights:
+            best = np.argpartition(-scores, self.max_lights - 1)[:self.max_lights]
+            positions, scores = positions[best], scores[best]
+        return positions[np.argsort(-scores)]
+
+    def update(self, space, position):
+        """
+        Posiciona as luzes das estrelas escolhidas (chamado depois do gluLookAt, uma vez por quadro).
+        :return: Quantidade de luzes ativas a partir de GL_LIGHT0 (usada pelos shaders)
+        """
+        gl = self.gl
+        stars = self.select(space, position) if self.max_lights else np.empty((0, 3))
+        changes = 0
+        for light, star in zip(STAR_LIGHTS, stars.tolist()):
+            gl.glLightfv(light, GL_POSITION, [star[0], star[1], star[2], 1.0])
+            changes += 1
+        for light in STAR_LIGHTS[len(stars):self.active]:
+            gl.glDisable(light)
+            changes += 1
+        for light in STAR_LIGHTS[self.active:len(stars)]:
+            gl.glEnable(light)
+            changes += 1
+        self.active = len(stars)
+        self.state_changes = changes
+        return 1 + self.active
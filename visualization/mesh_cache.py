@@ -0,0 +1,139 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from OpenGL.GL import *
+from OpenGL.GLU import *
+
+from visualization.backend import OpenGLBackend
+
+
+class MeshCache:
+    """
+    Guarda a geometria das esferas e dos discos de acreção em display lists, montadas uma única vez.
+    As malhas são unitárias e posicionadas/escaladas por transformações na hora do desenho, em vez de
+    recalcular vértices (gluSphere, math.cos/math.sin) para cada objeto a cada quadro.
+    Esferas: uma lista por nível de tesselação. Discos: uma lista por largura relativa do anel
+    (quantizada), mantidas num LRU para não acumular listas quando os tamanhos variam.
+    """
+    # Passos por fator e da largura relativa do anel (1 - interno/externo): erro de ~1% na largura,
+    # que é o que aparece na tela, já que os discos são finos perto do raio externo
+    RING_WIDTH_STEPS = 100
+
+    def __init__(self, max_rings=512, backend=None):
+        """
+        :param max_rings: Quantidade máxima de display lists de discos guardadas
+        :param backend: Backend de desenho (padrão: OpenGLBackend)
+        """
+        self.gl = backend if backend is not None else OpenGLBackend()
+        self.spheres = {}             # (slices, stacks) -> display list
+        self.rings = OrderedDict()    # (largura quantizada, segmentos) -> display list, LRU
+        self.max_rings = max_rings
+        self.built = 0                # Listas montadas (cada uma custa uma tesselação completa)
+        self.evicted = 0
+
+    def sphere(self, slices, stacks):
+        """Retorna a display list de uma esfera de raio 1, montando-a na primeira vez."""
+        key = (slices, stacks)
+        display_list = self.spheres.get(key)
+        if display_list is None:
+            gl = self.gl
+            display_list = gl.glGenLists(1)
+            quadric = gl.gluNewQuadric()
+            gl.glNewList(display_list, GL_COMPILE)
+            gl.gluSphere(quadric, 1.0, slices, stacks)
+            gl.glEndList()
+            gl.gluDeleteQuadric(quadric)
+            self.spheres[key] = display_list
+            self.built += 1
+        return display_list
+
+    def ring(self, inner_ratio, segments=36):
+        """
+        Retorna a display list de um disco plano (no plano XZ) com raio externo 1.
+        :param inner_ratio: Raio interno dividido pelo externo, entre 0 e 1
+        """
+        gl = self.gl
+        width = max(1.0 - inner_ratio, 1e-6)
+        key = (round(math.log(width) * self.RING_WIDTH_STEPS), segments)
+        display_list = self.rings.get(key)
+        if display_list is not None:
+            self.rings.move_to_end(key)
+            return display_list
+
+        inner = 1.0 - math.exp(key[0] / self.RING_WIDTH_STEPS)
+        display_list = gl.glGenLists(1)
+        gl.glNewList(display_list, GL_COMPILE)
+        gl.glNormal3f(0.0, 1.0, 0.0)  # Mesma normal do caminho instanciado
+        gl.glBegin(GL_QUADS)
+        for i in range(segments):
+            theta = 2 * math.pi * i / segments
+            next_theta = 2 * math.pi * (i + 1) / segments
+            gl.glVertex3f(math.cos(theta) * inner, 0.0, math.sin(theta) * inner)
+            gl.glVertex3f(math.cos(next_theta) * inner, 0.0, math.sin(next_theta) * inner)
+            gl.glVertex3f(math.cos(next_theta), 0.0, math.sin(next_theta))
+            gl.glVertex3f(math.cos(theta), 0.0, math.sin(theta))
+        gl.glEnd()
+        gl.glEndList()
+        self.rings[key] = display_list
+        self.built += 1
+
+        while len(self.rings) > self.max_rings:
+            _, old_list = self.rings.popitem(last=False)
+            gl.glDeleteLists(old_list, 1)
+            self.evicted += 1
+        return display_list
+
+    @staticmethod
+    def grid_indices(rows, columns):
+        """Índices dos dois triângulos de cada quadrilátero de uma grade (rows + 1)×(columns + 1) de vértices."""
+        corners = np.arange((rows + 1) * (columns + 1), dtype=np.uint32).reshape(rows + 1, columns + 1)
+        a, b = corners[:-1, :-1], corners[1:, :-1]
+        c, d = corners[1:, 1:], corners[:-1, 1:]
+        return np.stack([a, b, c, a, c, d], axis=-1).ravel()
+
+    @classmethod
+    def sphere_mesh(cls, slices, stacks):
+        """
+        Malha indexada de uma esfera de raio 1 (a normal de cada vértice é o próprio vértice).
+        :return: (vértices float32 N×3, índices uint32), para os buffers do desenho instanciado
+        """
+        phi = np.linspace(0.0, np.pi, stacks + 1)[:, None]
+        theta = np.linspace(0.0, 2 * np.pi, slices + 1)[None, :]
+        vertices = np.stack(np.broadcast_arrays(np.sin(phi) * np.cos(theta), np.sin(phi) * np.sin(theta),
+                                                np.cos(phi)), axis=-1)
+        return vertices.reshape(-1, 3).astype(np.float32), cls.grid_indices(stacks, slices)
+
+    @classmethod
+    def ring_mesh(cls, segments=36):
+        """
+        Malha indexada de um disco no plano XZ com o raio codificado no eixo Y:
+        cada vértice é (cos, t, sin), com t = 0 no raio interno e 1 no externo.
+        """
+        theta = np.linspace(0.0, 2 * np.pi, segments + 1)
+        vertices = np.stack(np.broadcast_arrays(np.cos(theta), np.array([[0.0], [1.0]]), np.sin(theta)), axis=-1)
+        return vertices.reshape(-1, 3).astype(np.float32), cls.grid_indices(1, segments)
+
+    def draw_sphere(self, radius, slices, stacks):
+        """Desenha uma esfera escalando a malha unitária."""
+        gl = self.gl
+        gl.glPushMatrix()
+        gl.glScalef(radius, radius, radius)
+        gl.glCallList(self.sphere(slices, stacks))
+        gl.glPopMatrix()
+
+    def draw_ring(self, inner_radius, outer_radius, segments=36):
+        """Desenha um disco de acreção escalando a malha unitária com a mesma razão interno/externo."""
+        gl = self.gl
+        gl.glPushMatrix()
+        gl.glScalef(outer_radius, outer_radius, outer_radius)
+        gl.glCallList(self.ring(inner_radius / outer_radius, segments))
+        gl.glPopMatrix()
+
+    def release(self):
+        """Apaga todas as display lists (o contexto OpenGL precisa continuar ativo)."""
+        for display_list in list(self.spheres.values()) + list(self.rings.values()):
+            self.gl.glDeleteLists(display_list, 1)
+        self.spheres.clear()
+        self.rings.clear()
@@ -0,0 +1,51 @@
+import numpy as np
+from OpenGL.GL import *
+
+from visualization.backend import OpenGLBackend
+
+
+class Starfield:
+    """
+    Estrelas de fundo guardadas num buffer de vértices na GPU, enviado uma única vez.
+    O campo acompanha a câmera (é desenhado transladado para a posição dela), então
+    continua visível em qualquer ponto do universo, e cada quadro custa uma só chamada
+    de desenho, independentemente da quantidade de estrelas.
+    """
+    def __init__(self, count=5000, radius=50000.0, seed=None, backend=None):
+        """
+        :param count: Quantidade de estrelas (milhões cabem sem mudar o custo por quadro no Python)
+        :param radius: Meia aresta do cubo, centrado na câmera, em que as estrelas são espalhadas
+        :param backend: Backend de desenho (padrão: OpenGLBackend)
+        """
+        self.gl = gl = backend if backend is not None else OpenGLBackend()
+        self.count = count
+        self.radius = radius
+        rng = np.random.default_rng(seed)
+        self.positions = rng.uniform(-radius, radius, size=(count, 3)).astype(np.float32)
+        self.buffer = gl.glGenBuffers(1)
+        gl.glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        gl.glBufferData(GL_ARRAY_BUFFER, self.positions.nbytes, self.positions, GL_STATIC_DRAW)
+        gl.glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, camera_position):
+        """Desenha as estrelas em torno da câmera, sem iluminação e sem escrever no depth buffer."""
+        gl = self.gl
+        gl.glDisable(GL_LIGHTING)
+        gl.glDepthMask(GL_FALSE)  # São fundo: nunca escondem os objetos desenhados depois
+        gl.glPointSize(1.0)
+        gl.glColor3f(1.0, 1.0, 1.0)  # Cor branca para as estrelas
+        gl.glPushMatrix()
+        gl.glTranslatef(float(camera_position[0]), float(camera_position[1]), float(camera_position[2]))
+        gl.glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        gl.glEnableClientState(GL_VERTEX_ARRAY)
+        gl.glVertexPointer(3, GL_FLOAT, 0, None)
+        gl.glDrawArrays(GL_POINTS, 0, self.count)
+        gl.glDisableClientState(GL_VERTEX_ARRAY)
+        gl.glBindBuffer(GL_ARRAY_BUFFER, 0)
+        gl.glPopMatrix()
+        gl.glDepthMask(GL_TRUE)
+        gl.glEnable(GL_LIGHTING)
+
+    def release(self):
+        """Apaga o buffer (o contexto OpenGL precisa continuar ativo)."""
+        self.gl.glDeleteBuffers(1, [self.buffer])
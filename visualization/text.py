@@ -0,0 +1,165 @@
+import string
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+from visualization.backend import OpenGLBackend
+
+# Glifos montados na criação do atlas; outros caracteres (ex.: no nome do jogador) entram sob demanda
+DEFAULT_CHARACTERS = string.digits + string.ascii_letters + string.punctuation + " áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ"
+
+
+class GlyphAtlas:
+    """
+    Uma fonte carregada uma única vez e todos os seus glifos numa só textura.
+    A textura só é reenviada quando aparece um caractere novo; os textos são montados
+    como quadriláteros que apontam para as regiões do atlas.
+    """
+    def __init__(self, font_name, size, width=1024, characters=DEFAULT_CHARACTERS, backend=None):
+        self.gl = backend if backend is not None else OpenGLBackend()
+        self.font = pygame.font.SysFont(font_name, size)
+        self.height = self.font.get_height()
+        self.width = width           # Largura da textura em pixels
+        self.glyphs = {}             # caractere -> (largura, u0, v0, u1, v1)
+        self.texture = self.gl.glGenTextures(1)
+        self.version = 0             # Incrementada a cada reconstrução (os rótulos refazem os vértices)
+        self.build(characters)
+
+    def build(self, characters):
+        """Renderiza os glifos num atlas e envia a textura para a GPU."""
+        gl = self.gl
+        surfaces = {character: self.font.render(character, True, (255, 255, 255)) for character in characters}
+        placements = {}
+        x, y = 0, 0
+        for character, surface in surfaces.items():
+            if x + surface.get_width() > self.width:
+                x, y = 0, y + self.height
+            placements[character] = (x, y)
+            x += surface.get_width()
+        atlas_height = y + self.height
+
+        atlas = pygame.Surface((self.width, atlas_height), pygame.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        self.glyphs = {}
+        for character, surface in surfaces.items():
+            x, y = placements[character]
+            atlas.blit(surface, (x, y))
+            width = surface.get_width()
+            # A textura é enviada de baixo para cima (flipped), por isso v é invertido
+            self.glyphs[character] = (width, x / self.width, 1.0 - (y + self.height) / atlas_height,
+                                      (x + width) / self.width, 1.0 - y / atlas_height)
+
+        data = pygame.image.tostring(atlas, "RGBA", True)
+        gl.glBindTexture(GL_TEXTURE_2D, self.texture)
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        gl.glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.width, atlas_height, 0, GL_RGBA, GL_UNSIGNED_BYTE, data)
+        gl.glBindTexture(GL_TEXTURE_2D, 0)
+        self.version += 1
+
+    def layout(self, text):
+        """
+        Monta os quadriláteros do texto em pixels, com a origem no canto inferior esquerdo.
+        :return: (vértices float32 (4n)×2, coordenadas de textura float32 (4n)×2, largura do texto)
+        """
+        missing = set(text) - self.glyphs.keys()
+        if missing:
+            self.build(set(self.glyphs) | missing)
+        vertices = np.empty((len(text) * 4, 2), dtype=np.float32)
+        texcoords = np.empty((len(text) * 4, 2), dtype=np.float32)
+        x = 0.0
+        for i, character in enumerate(text):
+            width, u0, v0, u1, v1 = self.glyphs[character]
+            vertices[i * 4:i * 4 + 4] = ((x, 0.0), (x + width, 0.0), (x + width, self.height), (x, self.height))
+            texcoords[i * 4:i * 4 + 4] = ((u0, v0), (u1, v0), (u1, v1), (u0, v1))
+            x += width
+        return vertices, texcoords, x
+
+    def release(self):
+        self.gl.glDeleteTextures([self.texture])
+
+
+class TextLabel:
+    """Um texto já montado em vértices; só é refeito quando o texto (ou o atlas) muda."""
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self.text = None
+        self.atlas_version = None
+        self.vertices = self.texcoords = None
+        self.width = 0.0
+        self.rebuilds = 0
+
+    def set_text(self, text):
+        if text != self.text or self.atlas_version != self.atlas.version:
+            self.vertices, self.texcoords, self.width = self.atlas.layout(text)
+            self.text = text
+            self.atlas_version = self.atlas.version  # Lido depois do layout, que pode reconstruir o atlas
+            self.rebuilds += 1
+        return self
+
+    @property
+    def height(self):
+        return self.atlas.height
+
+    def draw(self):
+        """Desenha o texto na origem atual (TextRenderer.begin precisa ter sido chamado)."""
+        if not self.text:
+            return
+        gl = self.atlas.gl
+        gl.glBindTexture(GL_TEXTURE_2D, self.atlas.texture)
+        gl.glVertexPointer(2, GL_FLOAT, 0, self.vertices)
+        gl.glTexCoordPointer(2, GL_FLOAT, 0, self.texcoords)
+        gl.glDrawArrays(GL_QUADS, 0, len(self.vertices))
+
+
+class TextRenderer:
+    """
+    Fontes, atlas e rótulos de texto do renderizador.
+    Cada fonte é procurada no sistema uma única vez; cada rótulo é identificado por uma chave
+    (ex.: ('hud', 0)) e só é remontado quando o texto dele muda.
+    """
+    def __init__(self, backend=None):
+        """:param backend: Backend de desenho (padrão: OpenGLBackend)"""
+        self.gl = backend if backend is not None else OpenGLBackend()
+        self.atlases = {}  # (fonte, tamanho) -> GlyphAtlas
+        self.labels = {}   # chave -> TextLabel
+
+    def atlas(self, font_name, size):
+        key = (font_name, size)
+        if key not in self.atlases:
+            self.atlases[key] = GlyphAtlas(font_name, size, backend=self.gl)
+        return self.atlases[key]
+
+    def label(self, key, text, font_name='Arial', size=24):
+        """Retorna o rótulo da chave com o texto atualizado."""
+        label = self.labels.get(key)
+        if label is None:
+            label = self.labels[key] = TextLabel(self.atlas(font_name, size))
+        return label.set_text(text)
+
+    def begin(self):
+        """Ativa textura, transparência e os arrays de vértices usados pelos rótulos."""
+        gl = self.gl
+        gl.glDisable(GL_LIGHTING)
+        gl.glEnable(GL_BLEND)
+        gl.glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        gl.glEnable(GL_TEXTURE_2D)
+        gl.glEnableClientState(GL_VERTEX_ARRAY)
+        gl.glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        gl.glColor3f(1.0, 1.0, 1.0)  # Branco (a cor multiplica a textura)
+
+    def end(self):
+        gl = self.gl
+        gl.glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        gl.glDisableClientState(GL_VERTEX_ARRAY)
+        gl.glBindTexture(GL_TEXTURE_2D, 0)
+        gl.glDisable(GL_TEXTURE_2D)
+        gl.glDisable(GL_BLEND)
+        gl.glEnable(GL_LIGHTING)
+
+    def release(self):
+        for atlas in self.atlases.values():
+            atlas.release()
+        self.atlases.clear()
+        self.labels.clear()